@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# Triplets/second for baseline PO -> ASN -> invoice generation: the
+# per-document OptionBGenerator._make_po / _make_asn_from_po /
+# _make_invoice_from_po_asn path versus make_triplets (one numpy Generator
+# batch into a TripletDataset), with and without dict views. Then memory and
+# time for the consumers on dicts versus columns: oracle flags and X12
+# rendering. Labelled datasets: the per-document _apply_anomaly loop versus
+# make_labeled_triplets (one kernel call per label). Also prints summary
+# statistics from both generation paths so the distributions can be compared
+# side by side.
+#
+#   python backend/ml/benchmarks/bench_triplet_batch.py --triplets 20000 --repeat 3
+import argparse
+import importlib.util
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "data_gen" / "edi_generator_full.py"
+spec = importlib.util.spec_from_file_location("edi_generator_full", MODULE_PATH)
+edi = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+spec.loader.exec_module(edi)
+
+REF = datetime(2026, 6, 1)
+
+
+def make_gen(seed: int) -> Any:
+    dist = edi.Dist()
+    master = edi.build_master(dist, seed=seed, today=REF.date())
+    return edi.OptionBGenerator(dist=dist, master=master, seed=seed, now=REF)
+
+
+def run_before(gen: Any, n: int) -> List[Tuple[Dict, Dict, Dict]]:
+    out = []
+    for i in range(n):
+        po = gen._make_po(i)
+        asn = gen._make_asn_from_po(po)
+        inv = gen._make_invoice_from_po_asn(po, asn)
+        out.append((po, asn, inv))
+    return out
+
+
+def run_labeled_before(gen: Any, quotas: Dict[str, int]) -> int:
+    # main()'s per-document loop, without the duplicate pass
+    i = 0
+    for label, n in quotas.items():
+        for _ in range(n):
+            po = gen._make_po(i)
+            asn = gen._make_asn_from_po(po)
+            inv = gen._make_invoice_from_po_asn(po, asn)
+            gen._apply_anomaly(po=po, asn=asn, inv=inv, label=label)
+            i += 1
+    return i
+
+
+def summarize(triplets: List[Tuple[Dict, Dict, Dict]]) -> Dict[str, np.ndarray]:
+    days = lambda a, b: (datetime.fromisoformat(b) - datetime.fromisoformat(a)).days
+    po_lines = [li for po, _, _ in triplets for li in po["line_items"]]
+    return {
+        "lines/po": np.array([len(po["line_items"]) for po, _, _ in triplets], dtype=float),
+        "quantity": np.array([li["quantity"] for li in po_lines], dtype=float),
+        "unit_price": np.array([li["unit_price"] for li in po_lines], dtype=float),
+        "order age (d)": np.array([days(po["order_date"], REF.isoformat()) for po, _, _ in triplets], dtype=float),
+        "lead (d)": np.array([days(po["order_date"], po["expected_ship_date"]) for po, _, _ in triplets], dtype=float),
+        "ship lag (d)": np.array([days(po["expected_ship_date"], asn["ship_date"]) for po, asn, _ in triplets], dtype=float),
+        "invoice lag (d)": np.array([days(asn["ship_date"], inv["invoice_date"]) for _, asn, inv in triplets], dtype=float),
+        "freight": np.array([po["freight_amount"] for po, _, _ in triplets], dtype=float),
+        "invoice total": np.array([inv["total_amount"] for _, _, inv in triplets], dtype=float),
+    }
+
+
+def traced_mb(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    # peak traced allocation while building (and keeping) fn's result
+    tracemalloc.start()
+    out = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, peak / 1e6
+
+
+def render_dicts(docs: Tuple[List[Dict], List[Dict], List[Dict]]) -> int:
+    w = edi.X12Writer(now=REF, ids=edi.SequentialIds())
+    return sum(len(w.render(tx, d)) for tx, part in zip(("850", "856", "810"), docs) for d in part)
+
+
+def render_columns(ds: Any) -> int:
+    w = edi.X12Writer(now=REF, ids=edi.SequentialIds())
+    return sum(len(x) for tx in ("850", "856", "810") for x in w.render_columns(tx, *ds.x12_columns(tx, 0, len(ds.x12_rows(tx)))))
+
+
+def best_of(fns: List[Callable[[], Any]], repeat: int) -> List[float]:
+    # interleaved so background noise hits every variant alike; min per variant
+    best = [float("inf")] * len(fns)
+    for _ in range(repeat):
+        for i, fn in enumerate(fns):
+            t0 = time.perf_counter()
+            fn()
+            best[i] = min(best[i], time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--triplets", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+    n = int(args.triplets)
+
+    gen = make_gen(int(args.seed))
+    t_before, t_arrays, t_dicts = best_of(
+        [
+            lambda: run_before(gen, n),
+            lambda: gen.make_triplets(n),
+            lambda: list(zip(*(lambda ds: (ds.po_dicts(), ds.asn_dicts(), ds.invoice_dicts()))(gen.make_triplets(n)))),
+        ],
+        int(args.repeat),
+    )
+    print(f"triplets: {n}")
+    print(f"before  (per document):         {n / t_before:,.0f} triplets/s")
+    print(f"after   (make_triplets):        {n / t_arrays:,.0f} triplets/s  ({t_before / t_arrays:.1f}x)")
+    print(f"after + dict views:             {n / t_dicts:,.0f} triplets/s  ({t_before / t_dicts:.1f}x)")
+
+    g = make_gen(int(args.seed))
+    ds, mb_cols = traced_mb(lambda: g.make_triplets(n))
+    docs, mb_dicts = traced_mb(lambda: (list(ds.po_dicts()), list(ds.asn_dicts()), list(ds.invoice_dicts())))
+    print(f"\nmemory: dicts {mb_dicts:,.1f} MB, columns {mb_cols:,.1f} MB ({ds.nbytes / 1e6:,.1f} MB of arrays)")
+    t_od, t_oc, t_rd, t_rc = best_of(
+        [
+            lambda: edi.build_oracle_flags(*docs),
+            lambda: edi.build_oracle_flags_dataset(ds),
+            lambda: render_dicts(docs),
+            lambda: render_columns(ds),
+        ],
+        int(args.repeat),
+    )
+    print(f"oracle flags: dicts {t_od * 1e3:,.0f} ms, columns {t_oc * 1e3:,.0f} ms")
+    print(f"X12 render:   dicts {t_rd * 1e3:,.0f} ms, columns {t_rc * 1e3:,.0f} ms (includes list conversion)")
+
+    # same label mix as the generator's default --quotas, scaled to n
+    mix = {"NORMAL": 8000, "THREE_WAY_QTY_MISMATCH": 1200, "THREE_WAY_PRICE_MISMATCH": 1200, "LATE_SHIPMENT": 900,
+           "SHORT_SHIP": 900, "OVERBILL": 900, "CHARGES_ANOMALY": 800, "MISSING_DOC": 600, "DUPLICATE_DOC": 500}
+    quotas = {k: v * n // 15000 for k, v in mix.items()}
+    n_lab = sum(quotas.values())
+    t_lb, t_la = best_of([lambda: run_labeled_before(gen, quotas), lambda: gen.make_labeled_triplets(quotas)], int(args.repeat))
+    print(f"\nlabelled, per document:  {n_lab / t_lb:,.0f} triplets/s")
+    print(f"labelled, kernels:       {n_lab / t_la:,.0f} triplets/s  ({t_lb / t_la:.1f}x)")
+
+    a = summarize(run_before(make_gen(int(args.seed)), n))
+    b = summarize(list(zip(*docs)))
+    print(f"\n{'':16s} {'per-doc mean':>13s} {'batch mean':>11s} {'per-doc std':>12s} {'batch std':>10s}")
+    for k in a:
+        print(f"{k:16s} {a[k].mean():13.3f} {b[k].mean():11.3f} {a[k].std():12.3f} {b[k].std():10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# Segments/second for X12 extraction: the old tx_type + extract_850/856/810
+# (two walks, if-chains; copied below as the reference) versus the
+# single-pass {tag: handler} table behind X12Parser.extract.
+#
+#   python backend/ml/benchmarks/bench_x12_extract.py --docs 3000 --repeat 7
+import argparse
+import importlib.util
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "data_gen" / "edi_generator_full.py"
+spec = importlib.util.spec_from_file_location("edi_generator_full", MODULE_PATH)
+edi = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+spec.loader.exec_module(edi)
+
+from x12 import EXTRACT_TAGS, ASNLine, InvoiceLine, POLine  # noqa: E402  (path set up by the module above)
+from x12.records import _num  # noqa: E402
+
+
+# -----------------------------
+# Reference: the if-chain extractors as they were before the handler table
+# -----------------------------
+def legacy_850(segs: List[Any]) -> Optional[Dict[str, Any]]:
+    po_number = None
+    line_items: List[POLine] = []
+    for s in segs:
+        els = s.elements
+        if s.tag == "BEG" and len(els) > 3:
+            po_number = els[3].strip()
+        if s.tag == "PO1":
+            sku = None
+            if len(els) > 8 and els[8].strip():
+                sku = els[8].strip()
+            elif len(els) > 7 and els[7].strip():
+                sku = els[7].strip()
+            if sku:
+                line_items.append(POLine(sku, _num(els, 2), _num(els, 4)))
+    if not po_number or not line_items:
+        return None
+    return {"po_number": po_number, "line_items": line_items}
+
+def legacy_856(segs: List[Any]) -> Optional[Dict[str, Any]]:
+    bsn = None
+    ship_date = None
+    items: List[ASNLine] = []
+    current_sku = None
+    for s in segs:
+        els = s.elements
+        if s.tag == "BSN" and len(els) > 2:
+            bsn = els[2].strip()
+        if s.tag == "DTM" and len(els) > 2:
+            if els[1].strip() in ("011", "017"):
+                ship_date = els[2].strip()
+        if s.tag == "LIN":
+            for i in range(1, len(els) - 1):
+                if els[i].strip() in ("BP", "SK", "VP"):
+                    current_sku = els[i + 1].strip()
+                    break
+        if s.tag == "SN1":
+            if current_sku:
+                items.append(ASNLine(current_sku, _num(els, 2), els[3].strip() if len(els) > 3 else None))
+    if not items:
+        return None
+    return {"bsn": bsn, "ship_date": ship_date, "line_items": items}
+
+def legacy_810(segs: List[Any]) -> Optional[Dict[str, Any]]:
+    inv_number = None
+    items: List[InvoiceLine] = []
+    for s in segs:
+        els = s.elements
+        if s.tag == "BIG" and len(els) > 2:
+            inv_number = els[2].strip()
+        if s.tag == "IT1":
+            sku = None
+            for i in range(1, len(els) - 1):
+                if els[i].strip() in ("BP", "SK", "VP"):
+                    sku = els[i + 1].strip()
+                    break
+            if sku:
+                items.append(InvoiceLine(sku, _num(els, 2), _num(els, 4)))
+    if not inv_number or not items:
+        return None
+    return {"invoice_number": inv_number, "line_items": items}
+
+LEGACY = {"850": legacy_850, "856": legacy_856, "810": legacy_810}
+
+REF = datetime(2026, 6, 1)
+
+
+def build_corpus(n_docs: int, seed: int, tags: Any = None) -> List[List[Any]]:
+    dist = edi.Dist()
+    master = edi.build_master(dist, seed=seed)
+    gen = edi.OptionBGenerator(dist=dist, master=master, seed=seed, now=REF)
+    parser = edi.X12Parser()
+    corpus: List[List[Any]] = []
+    for i in range(n_docs):
+        po = gen._make_po(i)
+        asn = gen._make_asn_from_po(po)
+        inv = gen._make_invoice_from_po_asn(po, asn)
+        for text in (gen.render_850(po), gen.render_856(asn), gen.render_810(inv)):
+            corpus.append(parser.parse_text(text, tags=tags))
+    return corpus
+
+
+def run_before(parser: Any, corpus: List[List[Any]]) -> None:
+    for segs in corpus:
+        fn = LEGACY.get(parser.tx_type(segs))
+        if fn is not None:
+            fn(segs)
+
+
+def run_after(parser: Any, corpus: List[List[Any]]) -> None:
+    for segs in corpus:
+        parser.extract(segs)
+
+
+def best_of(fns: List[Callable[[], None]], repeat: int) -> List[float]:
+    # interleaved so background noise hits every variant alike; min per variant
+    best = [float("inf")] * len(fns)
+    for _ in range(repeat):
+        for i, fn in enumerate(fns):
+            t0 = time.perf_counter()
+            fn()
+            best[i] = min(best[i], time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=3000, help="PO/ASN/invoice triplets to render")
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    parser = edi.X12Parser()
+    for name, tags in (("full parse", None), ("EXTRACT_TAGS projection", EXTRACT_TAGS)):
+        corpus = build_corpus(int(args.docs), int(args.seed), tags)
+        n_segs = sum(len(s) for s in corpus)
+
+        # both paths must agree before timing means anything
+        for segs in corpus:
+            tx = parser.tx_type(segs)
+            if parser.extract(segs) != (tx, LEGACY[tx](segs)):
+                raise SystemExit(f"X12Parser.extract disagrees with the reference extract_{tx}")
+
+        t_before, t_after = best_of([lambda: run_before(parser, corpus), lambda: run_after(parser, corpus)], int(args.repeat))
+        print(f"[{name}] documents: {len(corpus)}  segments: {n_segs}")
+        print(f"  before (tx_type + if-chains): {n_segs / t_before:,.0f} seg/s")
+        print(f"  after  (handler table):       {n_segs / t_after:,.0f} seg/s")
+        print(f"  speedup: {t_before / t_after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
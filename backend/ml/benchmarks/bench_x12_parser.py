@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# Throughput of X12Parser.parse_text on synthetic interchanges rendered by
+# OptionBGenerator.render_850/856/810: MB/s, segments/s and peak RSS per case.
+#
+# Cases, per --sizes entry:
+#   single-<size>  one ST..SE (an 850 grown with PO1 lines up to the size)
+#   multi-<size>   one ISA/GS/GE/IEA envelope around many 850/856/810 sets
+# plus a fuzz corpus of mutated / malformed 1 MB inputs (truncated, no ISA,
+# newline terminators, flipped separators, junk lines, CRLF). Those must
+# parse without raising and without falling off a throughput cliff.
+#
+# Inputs are written to --workdir once (reused while present) and each case
+# is timed in a fresh child process so peak RSS is per case.
+#
+#   python backend/ml/benchmarks/bench_x12_parser.py --sizes 1KB,1MB --out x12_bench.json
+#   python backend/ml/benchmarks/bench_x12_parser.py --sizes 1KB,1MB,500MB --compare x12_bench.json
+import argparse
+import importlib.util
+import itertools
+import json
+import multiprocessing as mp
+import platform
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "data_gen" / "edi_generator_full.py"
+spec = importlib.util.spec_from_file_location("edi_generator_full", MODULE_PATH)
+edi = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+spec.loader.exec_module(edi)
+
+# fixed generator clock: the corpus is the same bytes on every run
+REF = datetime(2026, 6, 1)
+FUZZ_SIZE = 1 << 20
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?B)?\s*$", re.I)
+_UNITS = {None: 1, "B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+
+def parse_size(s: str) -> int:
+    m = _SIZE_RE.match(s)
+    if not m:
+        raise ValueError(f"Bad size: {s} (expected e.g. 1KB, 1MB, 500MB)")
+    return int(float(m.group(1)) * _UNITS[(m.group(2) or "B").upper()])
+
+
+# -----------------------------
+# Corpus
+# -----------------------------
+def _envelope(text: str) -> Tuple[str, str, str]:
+    # rendered doc -> (ISA + GS, ST..SE body, GE + IEA), all "~"-terminated
+    st = text.index("~ST*") + 1
+    ge = text.index("~GE*") + 1
+    return text[:st], text[st:ge], text[ge:]
+
+
+def _triplets(seed: int) -> Iterator[Tuple[str, str, str]]:
+    dist = edi.Dist()
+    master = edi.build_master(dist, seed=seed)
+    gen = edi.OptionBGenerator(dist=dist, master=master, seed=seed, now=REF)
+    i = 0
+    while True:
+        po = gen._make_po(i)
+        asn = gen._make_asn_from_po(po)
+        inv = gen._make_invoice_from_po_asn(po, asn)
+        yield gen.render_850(po), gen.render_856(asn), gen.render_810(inv)
+        i += 1
+
+
+def write_multi_st(path: Path, size: int, seed: int) -> None:
+    docs = _triplets(seed)
+    first = next(docs)
+    head, _, _ = _envelope(first[0])
+    isa_ctrl = head.split("*")[13]
+    written = len(head)
+    n_st = 0
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(head)
+        for triplet in itertools.chain([first], docs):
+            for text in triplet:
+                _, body, _ = _envelope(text)
+                fh.write(body)
+                written += len(body)
+                n_st += 1
+            if written >= size:
+                break
+        fh.write(f"GE*{n_st}*1~IEA*1*{isa_ctrl}~")
+
+
+def write_single_st(path: Path, size: int, seed: int) -> None:
+    po_text = next(_triplets(seed))[0]
+    head, body, tail = _envelope(po_text)
+    segs = body.rstrip("~").split("~")
+    st_ctrl = segs[0].split("*")[2]
+    pre = [s for s in segs if not s.startswith(("PO1*", "CTT*", "SE*"))]
+    po1 = [s.split("*", 2)[2] for s in segs if s.startswith("PO1*")]
+    n_lines = 0
+    written = len(head) + len(tail)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(head)
+        chunk = "~".join(pre) + "~"
+        fh.write(chunk)
+        written += len(chunk)
+        while written < size or n_lines == 0:
+            seg = f"PO1*{n_lines + 1}*{po1[n_lines % len(po1)]}~"
+            fh.write(seg)
+            written += len(seg)
+            n_lines += 1
+        fh.write(f"CTT*{n_lines}~SE*{len(pre) + n_lines + 2}*{st_ctrl}~")
+        fh.write(tail)
+
+
+# -----------------------------
+# Fuzz corpus
+# -----------------------------
+def _mut_truncated(text: str, rng: random.Random) -> str:
+    return text[: rng.randrange(len(text) // 2, len(text) - 1)]
+
+def _mut_no_isa(text: str, rng: random.Random) -> str:
+    return text[text.index("~") + 1:]
+
+def _mut_newlines(text: str, rng: random.Random) -> str:
+    return text.replace("~", "\n")
+
+def _mut_crlf(text: str, rng: random.Random) -> str:
+    return text.replace("~", "~\r\n")
+
+def _mut_flip_separators(text: str, rng: random.Random) -> str:
+    # ~1% of element separators become junk / a foreign separator
+    buf = list(text)
+    for i, c in enumerate(buf):
+        if c == "*" and i > 106 and rng.random() < 0.01:
+            buf[i] = rng.choice("|^#\x00")
+    return "".join(buf)
+
+def _mut_junk_lines(text: str, rng: random.Random) -> str:
+    segs = text.split("~")
+    out = []
+    for s in segs:
+        out.append(s)
+        if rng.random() < 0.02:
+            out.append("".join(rng.choice("ABCXYZ0123*:~ \t") for _ in range(rng.randrange(1, 40))).replace("~", ""))
+    return "~".join(out)
+
+def _mut_empty_segments(text: str, rng: random.Random) -> str:
+    return text.replace("~", "~~ ~", len(text) // 200)
+
+FUZZ_MUTATIONS = {
+    "truncated": _mut_truncated,
+    "no_isa": _mut_no_isa,
+    "newline_terminated": _mut_newlines,
+    "crlf": _mut_crlf,
+    "flipped_separators": _mut_flip_separators,
+    "junk_segments": _mut_junk_lines,
+    "empty_segments": _mut_empty_segments,
+}
+
+
+def build_corpus(workdir: Path, sizes: List[int], seed: int, fuzz: bool) -> List[Tuple[str, Path]]:
+    workdir.mkdir(parents=True, exist_ok=True)
+    cases: List[Tuple[str, Path]] = []
+    for size in sizes:
+        label = _fmt_size(size)
+        for kind, writer in (("single", write_single_st), ("multi", write_multi_st)):
+            path = workdir / f"{kind}-{label}-s{seed}.x12"
+            if not path.exists():
+                print(f"[corpus] writing {path.name}", flush=True)
+                tmp = path.with_suffix(".tmp")
+                writer(tmp, size, seed)
+                tmp.replace(path)
+            cases.append((f"{kind}-{label}", path))
+    if fuzz:
+        base = workdir / f"multi-{_fmt_size(FUZZ_SIZE)}-s{seed}.x12"
+        if not base.exists():
+            write_multi_st(base, FUZZ_SIZE, seed)
+        text = base.read_text(encoding="utf-8")
+        cases.append(("fuzz-baseline", base))
+        for name, mut in FUZZ_MUTATIONS.items():
+            path = workdir / f"fuzz-{name}-s{seed}.x12"
+            if not path.exists():
+                path.write_text(mut(text, random.Random(f"{seed}:{name}")), encoding="utf-8")
+            cases.append((f"fuzz-{name}", path))
+    return cases
+
+
+def _fmt_size(n: int) -> str:
+    for unit in ("GB", "MB", "KB"):
+        if n >= _UNITS[unit] and n % _UNITS[unit] == 0:
+            return f"{n // _UNITS[unit]}{unit}"
+    return f"{n}B"
+
+
+# -----------------------------
+# Measurement (child process)
+# -----------------------------
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_case(path: str, repeat: int, min_time: float, conn: Any) -> None:
+    try:
+        content = Path(path).read_text(encoding="utf-8", errors="ignore")
+        n_bytes = len(content.encode("utf-8"))
+        rss_loaded = _peak_rss_bytes()
+        parser = edi.X12Parser()
+        best = float("inf")
+        n_segs = 0
+        runs = 0
+        t_total = 0.0
+        # at least `repeat` runs, more for tiny inputs until min_time is spent
+        while runs < repeat or t_total < min_time:
+            t0 = time.perf_counter()
+            segs = parser.parse_text(content)
+            dt = time.perf_counter() - t0
+            n_segs = len(segs)
+            del segs
+            best = min(best, dt)
+            t_total += dt
+            runs += 1
+        peak = _peak_rss_bytes()
+        conn.send({
+            "bytes": n_bytes,
+            "segments": n_segs,
+            "runs": runs,
+            "best_s": best,
+            "mb_per_s": n_bytes / best / 1e6,
+            "seg_per_s": n_segs / best,
+            "peak_rss_mb": peak / 1e6,
+            "parse_rss_mb": max(0, peak - rss_loaded) / 1e6,
+            "error": None,
+        })
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def measure(path: Path, repeat: int, min_time: float) -> Dict[str, Any]:
+    ctx = mp.get_context("fork" if sys.platform != "win32" else "spawn")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_run_case, args=(str(path), repeat, min_time, send))
+    proc.start()
+    send.close()
+    try:
+        res = recv.recv()
+    except EOFError:
+        res = {"error": f"child exited with code {proc.exitcode}"}
+    proc.join()
+    return res
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(MODULE_PATH.parent), capture_output=True, text=True, timeout=10,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(cur: Dict[str, Any], prev_path: Path) -> None:
+    prev = json.loads(prev_path.read_text(encoding="utf-8"))
+    prev_cases = {c["case"]: c for c in prev.get("cases", [])}
+    print(f"\nvs {prev_path} (commit {prev.get('commit')}):")
+    for c in cur["cases"]:
+        p = prev_cases.get(c["case"])
+        if not p or c.get("error") or p.get("error"):
+            continue
+        print(
+            f"  {c['case']:<28} MB/s {p['mb_per_s']:8.1f} -> {c['mb_per_s']:8.1f} ({c['mb_per_s'] / p['mb_per_s']:.2f}x)"
+            f"   peak RSS {p['peak_rss_mb']:8.1f} -> {c['peak_rss_mb']:8.1f} MB"
+        )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=str, default="1KB,1MB,500MB")
+    ap.add_argument("--repeat", type=int, default=5, help="minimum timed runs per case")
+    ap.add_argument("--min-time", type=float, default=0.5, help="keep repeating small cases until this many seconds")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--no-fuzz", action="store_true")
+    ap.add_argument("--workdir", type=str, default=str(Path(tempfile.gettempdir()) / "x12_bench_corpus"))
+    ap.add_argument("--out", type=str, default="x12_parser_bench.json")
+    ap.add_argument("--compare", type=str, default=None, help="earlier --out file to diff against")
+    args = ap.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    cases = build_corpus(Path(args.workdir), sizes, int(args.seed), fuzz=not args.no_fuzz)
+
+    results: List[Dict[str, Any]] = []
+    for name, path in cases:
+        # big inputs: one run is plenty and repeats only multiply peak memory churn
+        size = path.stat().st_size
+        repeat = 1 if size >= (64 << 20) else int(args.repeat)
+        min_time = 0.0 if size >= (64 << 20) else float(args.min_time)
+        res = measure(path, repeat, min_time)
+        res = {"case": name, "file": path.name, **res}
+        results.append(res)
+        if res.get("error"):
+            print(f"{name:<28} ERROR {res['error']}", flush=True)
+        else:
+            print(
+                f"{name:<28} {res['bytes'] / 1e6:9.2f} MB  {res['segments']:>10,} seg"
+                f"  {res['mb_per_s']:8.1f} MB/s  {res['seg_per_s']:>12,.0f} seg/s"
+                f"  peak RSS {res['peak_rss_mb']:8.1f} MB",
+                flush=True,
+            )
+
+    out = {
+        "benchmark": "x12_parser.parse_text",
+        "commit": _git_rev(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": int(args.seed),
+        "cases": results,
+    }
+    Path(args.out).write_text(json.dumps(out, indent=2), encoding="utf-8")
+    print(f"\nwrote {args.out}")
+    if args.compare:
+        compare(out, Path(args.compare))
+    if any(r.get("error") for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# Documents/second for X12 rendering: the old per-document render_850/856/810
+# (envelope rebuilt per document, list + f-string appends; copied below as
+# the reference, with the clock passed in) versus X12Writer (envelope built
+# once, precompiled templates, one shared StringIO), for single-document
+# interchanges and for batched interchanges.
+#
+#   python backend/ml/benchmarks/bench_x12_render.py --docs 3000 --repeat 7
+import argparse
+import importlib.util
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "data_gen" / "edi_generator_full.py"
+spec = importlib.util.spec_from_file_location("edi_generator_full", MODULE_PATH)
+edi = importlib.util.module_from_spec(spec)
+assert spec and spec.loader
+spec.loader.exec_module(edi)
+
+# loading the generator put backend/ml on sys.path
+from x12.render import fmt_yyyymmdd_from_iso, stable_seed_from_str, yyyymmdd  # noqa: E402
+
+REF = datetime(2026, 6, 1, 9, 30)
+
+
+# -----------------------------
+# Reference: the line-based renderers as they were before X12Writer
+# -----------------------------
+def _envelope(functional_id: str, tx: List[str], isa_ctrl: str, gs_ctrl: str, now: datetime) -> str:
+    lines = [
+        f"ISA*00*          *00*          *ZZ*SENDER_ID       *ZZ*RECEIVER_ID     *{now.strftime('%y%m%d')}*{now.strftime('%H%M')}*U*00400*{isa_ctrl}*0*P*:",
+        f"GS*{functional_id}*SENDER*RECEIVER*{now.strftime('%Y%m%d')}*{now.strftime('%H%M')}*{gs_ctrl}*X*004010",
+    ]
+    lines.extend(tx)
+    lines.extend([f"GE*1*{gs_ctrl}", f"IEA*1*{isa_ctrl}"])
+    return "~".join(lines) + "~"
+
+def _charges(doc: Dict[str, Any], tx: List[str]) -> None:
+    if doc.get("freight_amount") is not None:
+        tx.append(f"SAC*C*FREIGHT***{float(doc['freight_amount']):.2f}")
+    if doc.get("discount_amount") is not None and float(doc["discount_amount"]) > 0:
+        tx.append(f"SAC*A*DISCOUNT***{float(doc['discount_amount']):.2f}")
+    if doc.get("tax_amount") is not None and float(doc["tax_amount"]) > 0:
+        tx.append(f"SAC*C*TAX***{float(doc['tax_amount']):.2f}")
+
+def legacy_850(po: Dict[str, Any], now: datetime, ids: Callable[..., Tuple[str, str, str]]) -> str:
+    isa_ctrl, gs_ctrl, st_ctrl = ids(seed=stable_seed_from_str(str(po.get("po_number") or "")))
+    items = po.get("line_items", [])
+    tx = [f"ST*850*{st_ctrl}", f"BEG*00*SA*{po['po_number']}*{fmt_yyyymmdd_from_iso(po.get('order_date', ''))}",
+          f"N1*BY*{po['buyer_code']}", f"N1*SU*{po['supplier_code']}"]
+    terms = po.get("payment_terms", "NET30")
+    if terms:
+        tx.append(f"ITD*01******{terms}")
+    _charges(po, tx)
+    for i, li in enumerate(items, 1):
+        tx.append(f"PO1*{i}*{li['quantity']}*{li['unit_of_measure']}*{li['unit_price']}****{li['sku']}")
+    tx.append(f"CTT*{len(items)}")
+    tx.append(f"SE*{len(tx) + 1}*{st_ctrl}")
+    return _envelope("PO", tx, isa_ctrl, gs_ctrl, now)
+
+def legacy_856(asn: Dict[str, Any], now: datetime, ids: Callable[..., Tuple[str, str, str]]) -> str:
+    isa_ctrl, gs_ctrl, st_ctrl = ids(seed=stable_seed_from_str(str(asn["asn_number"])))
+    ship_date = yyyymmdd(datetime.fromisoformat(asn["ship_date"]))
+    tx = [f"ST*856*{st_ctrl}", f"BSN*00*{asn['asn_number']}*{ship_date}*{now.strftime('%H%M')}",
+          f"DTM*011*{ship_date}", f"TD5*****{asn.get('carrier_code','UPS')}"]
+    for i, li in enumerate(asn["line_items"], 1):
+        tx.append(f"HL*{i}**I")
+        tx.append(f"LIN**BP*{li['sku']}")
+        tx.append(f"SN1**{li['ship_qty']}*{li.get('unit_of_measure','EA')}")
+    tx.append(f"CTT*{len(asn['line_items'])}")
+    tx.append(f"SE*{len(tx) + 1}*{st_ctrl}")
+    return _envelope("SH", tx, isa_ctrl, gs_ctrl, now)
+
+def legacy_810(inv: Dict[str, Any], now: datetime, ids: Callable[..., Tuple[str, str, str]]) -> str:
+    isa_ctrl, gs_ctrl, st_ctrl = ids(seed=stable_seed_from_str(str(inv["invoice_number"])))
+    tx = [f"ST*810*{st_ctrl}", f"BIG*{yyyymmdd(datetime.fromisoformat(inv['invoice_date']))}*{inv['invoice_number']}",
+          f"N1*BY*{inv['buyer_code']}", f"N1*SU*{inv['supplier_code']}"]
+    _charges(inv, tx)
+    for i, li in enumerate(inv["line_items"], 1):
+        tx.append(f"IT1*{i}*{li['quantity']}*{li['unit_of_measure']}*{li['unit_price']}**BP*{li['sku']}")
+    tx.append(f"TDS*{int(round(float(inv.get('total_amount') or 0.0) * 100))}")
+    tx.append(f"SE*{len(tx) + 1}*{st_ctrl}")
+    return _envelope("IN", tx, isa_ctrl, gs_ctrl, now)
+
+RENDERERS = {"850": legacy_850, "856": legacy_856, "810": legacy_810}
+
+
+def build_docs(n_docs: int, seed: int) -> List[Tuple[str, Dict[str, Any]]]:
+    dist = edi.Dist()
+    master = edi.build_master(dist, seed=seed)
+    gen = edi.OptionBGenerator(dist=dist, master=master, seed=seed, now=REF)
+    docs: List[Tuple[str, Dict[str, Any]]] = []
+    for i in range(n_docs):
+        po = gen._make_po(i)
+        asn = gen._make_asn_from_po(po)
+        inv = gen._make_invoice_from_po_asn(po, asn)
+        docs += [("850", po), ("856", asn), ("810", inv)]
+    return docs
+
+
+def run_before(docs: List[Tuple[str, Dict[str, Any]]]) -> int:
+    ids = edi.SequentialIds()
+    n = 0
+    for tx, doc in docs:
+        n += len(RENDERERS[tx](doc, REF, ids))
+    return n
+
+
+def run_after(docs: List[Tuple[str, Dict[str, Any]]]) -> int:
+    w = edi.X12Writer(now=REF)
+    for tx, doc in docs:
+        w.write(tx, doc)
+    return len(w.getvalue())
+
+
+def run_batched(by_type: Dict[str, List[Dict[str, Any]]], batch: int) -> int:
+    w = edi.X12Writer(now=REF)
+    for tx, docs in by_type.items():
+        for k in range(0, len(docs), batch):
+            w.write_interchange(tx, docs[k:k + batch])
+    return len(w.getvalue())
+
+
+def check_identical(docs: List[Tuple[str, Dict[str, Any]]]) -> None:
+    # same clock and control numbers on both sides, then compare byte for byte
+    ids = edi.SequentialIds()
+    ref = [RENDERERS[tx](doc, REF, ids) for tx, doc in docs]
+    w = edi.X12Writer(now=REF)
+    got = [w.render(tx, doc) for tx, doc in docs]
+    for (tx, _), a, b in zip(docs, ref, got):
+        if a != b:
+            raise SystemExit(f"X12Writer disagrees with render_{tx}:\n{a[:300]}\n{b[:300]}")
+
+
+def best_of(fns: List[Callable[[], Any]], repeat: int) -> List[float]:
+    # interleaved so background noise hits every variant alike; min per variant
+    best = [float("inf")] * len(fns)
+    for _ in range(repeat):
+        for i, fn in enumerate(fns):
+            t0 = time.perf_counter()
+            fn()
+            best[i] = min(best[i], time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=3000, help="PO/ASN/invoice triplets to render")
+    ap.add_argument("--batch", type=int, default=500, help="transaction sets per interchange for the batched variant")
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    docs = build_docs(int(args.docs), int(args.seed))
+    by_type: Dict[str, List[Dict[str, Any]]] = {"850": [], "856": [], "810": []}
+    for tx, doc in docs:
+        by_type[tx].append(doc)
+
+    check_identical(docs)
+
+    t_before, t_after, t_batched = best_of(
+        [lambda: run_before(docs), lambda: run_after(docs), lambda: run_batched(by_type, int(args.batch))],
+        int(args.repeat),
+    )
+    n = len(docs)
+    print(f"documents: {n}")
+    print(f"before  (render_850/856/810):        {n / t_before:,.0f} docs/s")
+    print(f"after   (X12Writer, one per doc):    {n / t_after:,.0f} docs/s  ({t_before / t_after:.2f}x)")
+    print(f"batched (X12Writer, {int(args.batch)} per ISA): {n / t_batched:,.0f} docs/s  ({t_before / t_batched:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# Bronze X12 (.850/.856/.810 from edi_generator_full.py --write-bronze) -> silver Parquet.
+#
+# Tables (one directory each, rolled into part-NNNNN.parquet files):
+#   po_headers, po_lines, asn_lines, invoice_headers, invoice_lines
+# each hive-partitioned by doc_month=YYYY-MM of the document date (PO
+# order date, ASN ship date, invoice date); read one back with
+# gold.open_gold_table(silver_dir, table, partition_cols=SILVER_PARTITION_COLUMNS).
+#
+# Files are streamed one segment at a time and rows are flushed through
+# gold.TableSink every --batch-rows, so memory stays bounded regardless of
+# corpus size. Interchanges with several ST..SE sets are handled. Rows reach
+# the tables one complete ST..SE set at a time: a file that fails partway
+# keeps the sets before the failure and drops the one it was in.
+#
+#   python backend/ml/data_gen/bronze_to_silver_full.py --bronze-dir data_full/bronze --silver-dir data_full/silver
+import argparse
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# backend/ml on the path for the shared x12 and gold packages
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from gold import TableSink
+from x12 import X12Parser, safe_float
+
+
+BRONZE_SUFFIXES = (".850", ".856", ".810", ".x12", ".edi", ".txt")
+
+# ASN-<po>, INV-<po>, plus the -D<n> suffix duplicate docs get
+_DOC_PO_RE = re.compile(r"^(?:ASN|INV)-(.+?)(?:-D\d+)?$")
+_YYYYMMDD_RE = re.compile(r"^(\d{4})(\d{2})\d{2}$")
+
+SILVER_PARTITION_COLUMNS = ("doc_month",)
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def _p(msg: str) -> None:
+    print(msg, flush=True)
+
+# -----------------------------
+# Schemas
+# -----------------------------
+# column -> arrow type name; kept as plain strings so pyarrow is only
+# imported when something is actually written
+TABLE_COLUMNS: Dict[str, Dict[str, str]] = {
+    "po_headers": {
+        "po_number": "string",
+        "order_date": "string",
+        "buyer_code": "string",
+        "supplier_code": "string",
+        "payment_terms": "string",
+        "freight_amount": "float64",
+        "discount_amount": "float64",
+        "tax_amount": "float64",
+        "line_count": "int32",
+        "st_control": "string",
+        "source_file": "string",
+    },
+    "po_lines": {
+        "po_number": "string",
+        "line_number": "int32",
+        "sku": "string",
+        "quantity": "float64",
+        "uom": "string",
+        "unit_price": "float64",
+    },
+    "asn_lines": {
+        "asn_number": "string",
+        "po_number": "string",
+        "ship_date": "string",
+        "carrier_code": "string",
+        "line_number": "int32",
+        "sku": "string",
+        "ship_qty": "float64",
+        "uom": "string",
+    },
+    "invoice_headers": {
+        "invoice_number": "string",
+        "po_number": "string",
+        "invoice_date": "string",
+        "buyer_code": "string",
+        "supplier_code": "string",
+        "freight_amount": "float64",
+        "discount_amount": "float64",
+        "tax_amount": "float64",
+        "total_amount": "float64",
+        "line_count": "int32",
+        "st_control": "string",
+        "source_file": "string",
+    },
+    "invoice_lines": {
+        "invoice_number": "string",
+        "po_number": "string",
+        "line_number": "int32",
+        "sku": "string",
+        "quantity": "float64",
+        "uom": "string",
+        "unit_price": "float64",
+    },
+}
+
+
+def po_number_from_doc(doc_number: Optional[str]) -> Optional[str]:
+    if not doc_number:
+        return None
+    m = _DOC_PO_RE.match(doc_number)
+    return m.group(1) if m else None
+
+
+def doc_month(yyyymmdd: Optional[str]) -> Optional[str]:
+    # X12 CCYYMMDD -> "YYYY-MM" partition value; None when it does not parse
+    m = _YYYYMMDD_RE.match(yyyymmdd or "")
+    return f"{m.group(1)}-{m.group(2)}" if m else None
+
+
+def _el(els: List[str], i: int) -> Optional[str]:
+    if len(els) > i:
+        v = els[i].strip()
+        return v or None
+    return None
+
+
+def _int(v: Optional[str]) -> Optional[int]:
+    try:
+        return int(v) if v else None
+    except Exception:
+        return None
+
+
+def _sku_after_qualifier(els: List[str]) -> Optional[str]:
+    for i in range(1, len(els) - 1):
+        if els[i].strip() in ("BP", "SK", "VP"):
+            return els[i + 1].strip() or None
+    return None
+
+
+# -----------------------------
+# Transaction -> rows
+# -----------------------------
+class _TxRows:
+    # accumulates one ST..SE transaction and turns it into table rows
+    __slots__ = ("tx", "st_control", "source_file", "header", "lines", "asn_sku", "sac")
+
+    def __init__(self, tx: Optional[str], st_control: Optional[str], source_file: str):
+        self.tx = tx
+        self.st_control = st_control
+        self.source_file = source_file
+        self.header: Dict[str, Any] = {}
+        self.lines: List[Dict[str, Any]] = []
+        self.asn_sku: Optional[str] = None
+        self.sac: Dict[str, float] = {}
+
+    def feed(self, tag: str, els: List[str]) -> None:
+        h = self.header
+        if tag == "N1":
+            role, code = _el(els, 1), _el(els, 2)
+            if role == "BY":
+                h["buyer_code"] = code
+            elif role == "SU":
+                h["supplier_code"] = code
+        elif tag == "SAC":
+            # SAC*C*FREIGHT***202.24
+            kind = (_el(els, 2) or "").lower()
+            if kind in ("freight", "discount", "tax"):
+                self.sac[f"{kind}_amount"] = safe_float(_el(els, 5), None)
+        elif self.tx == "850":
+            if tag == "BEG":
+                h["po_number"] = _el(els, 3)
+                h["order_date"] = _el(els, 4)
+            elif tag == "ITD":
+                h["payment_terms"] = _el(els, 7)
+            elif tag == "PO1":
+                self.lines.append({
+                    "line_number": _int(_el(els, 1)),
+                    "sku": _el(els, 8) or _el(els, 7),
+                    "quantity": safe_float(_el(els, 2), None),
+                    "uom": _el(els, 3),
+                    "unit_price": safe_float(_el(els, 4), None),
+                })
+        elif self.tx == "856":
+            if tag == "BSN":
+                h["asn_number"] = _el(els, 2)
+                h.setdefault("ship_date", _el(els, 3))
+            elif tag == "DTM" and _el(els, 1) in ("011", "017"):
+                h["ship_date"] = _el(els, 2)
+            elif tag == "TD5":
+                h["carrier_code"] = _el(els, 5)
+            elif tag == "LIN":
+                self.asn_sku = _sku_after_qualifier(els)
+            elif tag == "SN1" and self.asn_sku:
+                self.lines.append({
+                    "line_number": len(self.lines) + 1,
+                    "sku": self.asn_sku,
+                    "ship_qty": safe_float(_el(els, 2), None),
+                    "uom": _el(els, 3),
+                })
+        elif self.tx == "810":
+            if tag == "BIG":
+                h["invoice_date"] = _el(els, 1)
+                h["invoice_number"] = _el(els, 2)
+            elif tag == "IT1":
+                self.lines.append({
+                    "line_number": _int(_el(els, 1)),
+                    "sku": _sku_after_qualifier(els),
+                    "quantity": safe_float(_el(els, 2), None),
+                    "uom": _el(els, 3),
+                    "unit_price": safe_float(_el(els, 4), None),
+                })
+            elif tag == "TDS":
+                # TDS is in cents
+                cents = safe_float(_el(els, 1), None)
+                h["total_amount"] = round(cents / 100.0, 2) if cents is not None else None
+
+    def rows(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        # (table, row) pairs, each tagged with the document's partition month
+        h = self.header
+        if self.tx == "850" and h.get("po_number"):
+            pn = h["po_number"]
+            month = doc_month(h.get("order_date"))
+            yield "po_headers", {
+                **h, **self.sac,
+                "line_count": len(self.lines),
+                "st_control": self.st_control,
+                "source_file": self.source_file,
+                "doc_month": month,
+            }
+            for li in self.lines:
+                yield "po_lines", {"po_number": pn, **li, "doc_month": month}
+        elif self.tx == "856" and h.get("asn_number"):
+            an = h["asn_number"]
+            pn = po_number_from_doc(an)
+            month = doc_month(h.get("ship_date"))
+            for li in self.lines:
+                yield "asn_lines", {
+                    "asn_number": an,
+                    "po_number": pn,
+                    "ship_date": h.get("ship_date"),
+                    "carrier_code": h.get("carrier_code"),
+                    **li,
+                    "doc_month": month,
+                }
+        elif self.tx == "810" and h.get("invoice_number"):
+            inv = h["invoice_number"]
+            pn = po_number_from_doc(inv)
+            month = doc_month(h.get("invoice_date"))
+            yield "invoice_headers", {
+                **h, **self.sac,
+                "po_number": pn,
+                "line_count": len(self.lines),
+                "st_control": self.st_control,
+                "source_file": self.source_file,
+                "doc_month": month,
+            }
+            for li in self.lines:
+                yield "invoice_lines", {"invoice_number": inv, "po_number": pn, **li, "doc_month": month}
+
+
+def iter_transactions(segs: Iterable[Any], source_file: str) -> Iterable[_TxRows]:
+    cur: Optional[_TxRows] = None
+    for seg in segs:
+        tag = seg.tag
+        els = seg.elements
+        if tag == "ST":
+            cur = _TxRows(_el(els, 1), _el(els, 2), source_file)
+        elif tag == "SE":
+            if cur is not None:
+                yield cur
+            cur = None
+        elif cur is not None:
+            cur.feed(tag, els)
+    if cur is not None:
+        # truncated set without SE: keep what was read
+        yield cur
+
+
+# -----------------------------
+# Main
+# -----------------------------
+def convert(
+    bronze_dir: Path,
+    silver_dir: Path,
+    *,
+    batch_rows: int = 50000,
+    rows_per_file: int = 1000000,
+    compression: str = "snappy",
+) -> Dict[str, int]:
+    files = sorted((p for p in bronze_dir.rglob("*") if p.is_file() and p.suffix.lower() in BRONZE_SUFFIXES), key=str)
+    sinks = {
+        name: TableSink(
+            silver_dir,
+            name,
+            cols,
+            partition_cols=SILVER_PARTITION_COLUMNS,
+            batch_rows=batch_rows,
+            rows_per_file=rows_per_file,
+            compression=compression,
+        )
+        for name, cols in TABLE_COLUMNS.items()
+    }
+    parser = X12Parser()
+    n_tx = 0
+    n_bad = 0
+    try:
+        for f in files:
+            # buffered per transaction set, so memory does not grow with file size
+            try:
+                for txr in iter_transactions(parser.iter_file(f), f.name):
+                    for name, row in list(txr.rows()):
+                        sinks[name].add(row)
+                    n_tx += 1
+            except Exception as e:
+                n_bad += 1
+                _p(f"[WARN] Failed converting {f.name}: {e}")
+    finally:
+        for s in sinks.values():
+            s.close()
+    counts = {name: s.total_rows for name, s in sinks.items()}
+    counts["files"] = len(files)
+    counts["transactions"] = n_tx
+    counts["failed_files"] = n_bad
+    return counts
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bronze-dir", type=str, default="data_full/bronze")
+    ap.add_argument("--silver-dir", type=str, default="data_full/silver")
+    ap.add_argument("--batch-rows", type=int, default=50000, help="rows buffered per table before a write")
+    ap.add_argument("--rows-per-file", type=int, default=1000000, help="rows per part file before rolling")
+    ap.add_argument("--compression", type=str, default="snappy")
+    ap.add_argument("--overwrite", action="store_true", help="remove existing table directories first")
+    args = ap.parse_args()
+
+    bronze_dir = Path(args.bronze_dir)
+    silver_dir = Path(args.silver_dir)
+    if not bronze_dir.exists():
+        raise SystemExit(f"Bronze dir not found: {bronze_dir}")
+    if args.overwrite:
+        for name in TABLE_COLUMNS:
+            shutil.rmtree(silver_dir / name, ignore_errors=True)
+    elif any((silver_dir / name).exists() for name in TABLE_COLUMNS):
+        raise SystemExit(f"Silver tables already exist under {silver_dir} (use --overwrite)")
+
+    t0 = time.perf_counter()
+    counts = convert(
+        bronze_dir,
+        silver_dir,
+        batch_rows=int(args.batch_rows),
+        rows_per_file=int(args.rows_per_file),
+        compression=str(args.compression),
+    )
+    dt = time.perf_counter() - t0
+
+    _p(f"[SILVER] {counts['files']} files, {counts['transactions']} transactions in {dt:.1f}s -> {silver_dir}")
+    for name in TABLE_COLUMNS:
+        _p(f"  - {name}: {counts[name]} rows")
+    if counts["failed_files"]:
+        _p(f"[WARN] {counts['failed_files']} files failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,22 @@
 #!/usr/bin/env python3
 import argparse
 import copy
+import csv
 import hashlib
+import heapq
+import io
+import itertools
 import json
-import os
 import random
-import re
+import shutil
+import sys
 import time
 import uuid
-import zlib
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 # project_root = .../neurobiz-proj
 PROJECT_ROOT = Path(__file__).resolve().parents[5]
@@ -20,142 +24,42 @@ GOLDEN_SCHEMAS_DIR = PROJECT_ROOT / "backend" / "golden_schemas"
 
 import numpy as np
 
-# -----------------------------
-# X12 Defaults
-# -----------------------------
-DEFAULT_SEGMENT_TERMINATOR = "~"
-DEFAULT_ELEMENT_SEPARATOR = "*"
-COMPOSITE_SEPARATOR = ":"
-
-# -----------------------------
-# Masters (you can swap with your real masters later)
-# -----------------------------
-SUPPLIERS = [
-    "SUPPLIER001",
-    "SUPP_ACE_MFG",
-    "WIDGET_CO",
-    "ACME_PARTS",
-    "INDUSTRIAL_GOODS_LTD",
-    "TECH_SUPPLY_INT",
-    "LOGISTICS_PLUS",
-    "PREMIUM_GOODS",
-]
-
-BUYERS = [
-    "BUYER_RETAIL_A",
-    "BUYER_DISTRIB_B",
-    "BUYER_WAREHOUSE_C",
-    "BUYER_CHAIN_D",
-    "BUYER_ECOMM_E",
-]
-
-SKUS = [
-    "SKU-10001",
-    "SKU-10002",
-    "SKU-10003",
-    "SKU-20001",
-    "SKU-20002",
-    "SKU-30001",
-    "PART-XYZ-100",
-    "PART-ABC-200",
-    "WIDGET-BLUE-SM",
-    "WIDGET-RED-LG",
-]
-
-UNITS_OF_MEASURE = ["EA", "CS", "DZ", "BOX", "PLT", "CT"]
-PAYMENT_TERMS = ["NET30", "NET45", "NET60", "2%10NET30"]
-CARRIERS = ["UPS", "FEDEX", "DHL", "XPO", "OLD_DOMINION", "JB_HUNT"]
-
-LOCATIONS = [
-    {"location_code": "WH-NE-01", "name": "Northeast DC", "city": "Newark", "state": "NJ", "timezone": "America/New_York"},
-    {"location_code": "WH-SE-01", "name": "Southeast DC", "city": "Atlanta", "state": "GA", "timezone": "America/New_York"},
-    {"location_code": "WH-MW-01", "name": "Midwest DC", "city": "Chicago", "state": "IL", "timezone": "America/Chicago"},
-    {"location_code": "WH-W-01", "name": "West DC", "city": "Reno", "state": "NV", "timezone": "America/Los_Angeles"},
-]
-
-CURRENCY_CODES = ["USD"]
-
-# ------------------------------------------------------------
-# OPTION B Label Set (business oriented + demo-friendly)
-# ------------------------------------------------------------
-LABELS_OPTION_B = [
-    "NORMAL",
-    "MISSING_DOC",                 # missing ASN or Invoice
-    "THREE_WAY_QTY_MISMATCH",       # PO vs ASN vs INV qty mismatch
-    "THREE_WAY_PRICE_MISMATCH",     # PO vs INV unit price mismatch (or INV ext mismatch)
-    "LATE_SHIPMENT",               # ASN ship date late vs PO expected
-    "SHORT_SHIP",                  # ASN qty < PO qty beyond tolerance
-    "OVERBILL",                    # INV qty/price causes overbill beyond tolerance
-    "CHARGES_ANOMALY",             # freight/discount/tax ratios weird
-    "DUPLICATE_DOC",               # duplicate ASN/INV patterns
-]
-
-# ------------------------------------------------------------
-# Realism configuration (tune as needed)
-# ------------------------------------------------------------
-CFG = {
-    # volume / drift
-    "history_days": 120,
-    "recent_days": 21,
-    "recent_qty_mult": 1.10,
-
-    # base distributions (fallback if no golden parsed)
-    "avg_line_items": 6,
-    "line_items_max": 14,
-
-    "qty_mean": 120.0,
-    "qty_std": 70.0,
-    "qty_max": 6000,
-
-    "price_mean": 50.0,
-    "price_std": 18.0,
-    "price_max": 2500.0,
-
-    # lead time + shipping behavior
-    "supplier_lead_days_min": 2,
-    "supplier_lead_days_max": 14,
-    "ship_jitter_mean": 0.0,
-    "ship_jitter_std": 1.2,
-    "ship_jitter_min": -2,
-    "ship_jitter_max": 4,
-
-    # invoice timing
-    "invoice_after_ship_days_min": 0,
-    "invoice_after_ship_days_max": 10,
-
-    # charges (percent of subtotal)
-    "freight_pct_mean": 0.028,
-    "freight_pct_std": 0.012,
-    "discount_pct_mean": 0.015,
-    "discount_pct_std": 0.010,
-    "tax_pct_mean": 0.020,
-    "tax_pct_std": 0.008,
-
-    # missing docs / dup docs
-    "p_missing_asn": 0.03,
-    "p_missing_invoice": 0.02,
-    "p_duplicate_doc": 0.03,
-
-    # tolerance profiles (context-aware tolerance)
-    # These are not hard rules; you use them as *context* for features/labels.
-    "tol_profiles": [
-        {"id": "STRICT", "qty_pct": 0.01, "price_pct": 0.005, "charge_pct": 0.01},
-        {"id": "STANDARD", "qty_pct": 0.02, "price_pct": 0.01, "charge_pct": 0.02},
-        {"id": "LOOSE", "qty_pct": 0.05, "price_pct": 0.02, "charge_pct": 0.04},
-    ],
-
-    # anomaly magnitudes (beyond tolerance)
-    "anom_qty_mult_min": 1.05,
-    "anom_qty_mult_max": 1.40,
-    "anom_price_mult_min": 1.02,
-    "anom_price_mult_max": 1.25,
-    "anom_charge_mult_min": 1.6,
-    "anom_charge_mult_max": 4.0,
-
-    # severity mapping knobs
-    "sev_low_risk_max": 0.35,
-    "sev_med_risk_max": 0.70,
-}
+# backend/ml on the path for the shared x12, gold and triplets packages
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from x12 import (
+    ARCHIVE_INDEX,
+    ArchiveWriter,
+    PARSE_CACHE_MAX_BYTES,
+    ParseCache,
+    RunningStat,
+    X12Parser,
+    extract_file_cached,
+    golden_scan_paths,
+    pack_shard,
+    scan_batches,
+    SequentialIds,
+    X12Writer,
+)
+from gold import PARTITION_COLUMNS, TableSink, order_month
+from triplets import (
+    BUYERS,
+    CARRIERS,
+    CFG,
+    CURRENCY_CODES,
+    LABELS_OPTION_B,
+    LOCATIONS,
+    PAYMENT_TERMS,
+    SKUS,
+    SUPPLIERS,
+    UNITS_OF_MEASURE,
+    BatchTriplets,
+    DocTable,
+    TripletDataset,
+    X12Rows,
+    generate_labeled_dataset,
+    iter_labeled_shards,
+    vocab_names,
+)
 
 # -----------------------------
 # Helpers
@@ -163,180 +67,30 @@ CFG = {
 def _p(msg: str) -> None:
     print(msg, flush=True)
 
-def _stable_seed_from_str(s: str) -> int:
-    b = (s or "").encode("utf-8", errors="ignore")
-    return int(zlib.crc32(b) & 0xFFFFFFFF)
-
-def _ctrl9(n: int) -> str:
-    return str(int(n) % 1000000000).zfill(9)
-
-def _ctrl_st(n: int) -> str:
-    return str(int(n) % 10000).zfill(4)
-
-_INTERCHANGE_COUNTER = 0
-
-def _make_interchange_ids(seed: Optional[int] = None) -> Tuple[str, str, str]:
-    global _INTERCHANGE_COUNTER
-    _INTERCHANGE_COUNTER += 1
-    base = int(time.time() * 1000)
-    if seed is not None:
-        base += int(seed)
-    base += (_INTERCHANGE_COUNTER % 1000000)
-    isa_ctrl = _ctrl9(base)
-    gs_ctrl = str((base // 10) % 100000)
-    st_ctrl = _ctrl_st(base // 100)
-    return isa_ctrl, gs_ctrl, st_ctrl
-
-def _now_isa_date_time() -> Tuple[str, str]:
-    now = datetime.now()
-    return now.strftime("%y%m%d"), now.strftime("%H%M")
-
-def _yyyymmdd(dt: datetime) -> str:
-    return dt.strftime("%Y%m%d")
-
-def _safe_float(x: Any, default: float = 0.0) -> float:
-    try:
-        if x is None:
-            return default
-        return float(x)
-    except Exception:
-        return default
-
 def _sha1(s: str) -> str:
     try:
         return hashlib.sha1(s.encode("utf-8", errors="ignore")).hexdigest()
     except Exception:
         return ""
 
-def detect_terminator_and_separator(content: str) -> Tuple[str, str]:
-    content = content.strip()
-    elem_sep = DEFAULT_ELEMENT_SEPARATOR
-    if content.startswith("ISA") and len(content) >= 4:
-        elem_sep = content[3]
-    candidates = ["~", "\n"]
-    best = DEFAULT_SEGMENT_TERMINATOR
-    best_score = -1
-    for cand in candidates:
-        segs = content.split(cand)
-        joined = " ".join(segs[:50])
-        score = 0
-        if "GS" in joined: score += 2
-        if "ST" in joined: score += 2
-        if len(segs) > 10: score += 1
-        if score > best_score:
-            best_score = score
-            best = cand
-    return best, elem_sep
-
-def split_segments(content: str) -> List[str]:
-    content = content.strip()
-    if "~" in content:
-        segs = content.split("~")
-    else:
-        segs = re.split(r"[\r\n]+", content)
-    return [s.strip() for s in segs if s.strip()]
-
-# -----------------------------
-# Simple X12 Parsers for golden dist extraction
-# (We only need a few segments to estimate distributions)
-# -----------------------------
-class X12Parser:
-    def __init__(self):
-        self.segment_terminator = DEFAULT_SEGMENT_TERMINATOR
-        self.element_separator = DEFAULT_ELEMENT_SEPARATOR
-
-    def parse_text(self, content: str) -> List[Dict]:
-        seg_term, elem_sep = detect_terminator_and_separator(content)
-        self.segment_terminator = seg_term
-        self.element_separator = elem_sep
-        out: List[Dict] = []
-        for raw_seg in split_segments(content):
-            els = raw_seg.split(self.element_separator)
-            tag = els[0].strip() if els else ""
-            if tag:
-                out.append({"tag": tag, "elements": els, "raw": raw_seg})
-        return out
-
-    def parse_file(self, path: Path) -> List[Dict]:
-        content = path.read_text(encoding="utf-8", errors="ignore")
-        return self.parse_text(content)
-
-    def tx_type(self, segs: List[Dict]) -> Optional[str]:
-        for s in segs:
-            if s["tag"] == "ST" and len(s["elements"]) > 1:
-                return s["elements"][1].strip()
-        return None
-
-    def extract_850(self, segs: List[Dict]) -> Optional[Dict[str, Any]]:
-        po_number = None
-        line_items = []
-        for s in segs:
-            if s["tag"] == "BEG" and len(s["elements"]) > 3:
-                po_number = s["elements"][3].strip()
-            if s["tag"] == "PO1":
-                # PO1*1*QTY*UOM*PRICE****SKU
-                qty = s["elements"][2].strip() if len(s["elements"]) > 2 else None
-                price = s["elements"][4].strip() if len(s["elements"]) > 4 else None
-                sku = None
-                if len(s["elements"]) > 8 and s["elements"][8].strip():
-                    sku = s["elements"][8].strip()
-                elif len(s["elements"]) > 7 and s["elements"][7].strip():
-                    sku = s["elements"][7].strip()
-                if sku:
-                    line_items.append({"sku": sku, "quantity": qty, "unit_price": price})
-        if not po_number or not line_items:
-            return None
-        return {"po_number": po_number, "line_items": line_items}
-
-    def extract_856(self, segs: List[Dict]) -> Optional[Dict[str, Any]]:
-        # We'll look for BSN and SN1 quantities, LIN sku
-        bsn = None
-        ship_date = None
-        items = []
-        current_sku = None
-        for s in segs:
-            if s["tag"] == "BSN" and len(s["elements"]) > 2:
-                bsn = s["elements"][2].strip()
-            if s["tag"] == "DTM" and len(s["elements"]) > 2:
-                # DTM*011*YYYYMMDD (ship date commonly 011)
-                if s["elements"][1].strip() in ("011", "017"):
-                    ship_date = s["elements"][2].strip()
-            if s["tag"] == "LIN":
-                # LIN**BP*SKU
-                for i in range(1, len(s["elements"]) - 1):
-                    if s["elements"][i].strip() in ("BP", "SK", "VP"):
-                        current_sku = s["elements"][i + 1].strip()
-                        break
-            if s["tag"] == "SN1":
-                # SN1**QTY*UOM
-                q = s["elements"][2].strip() if len(s["elements"]) > 2 else None
-                u = s["elements"][3].strip() if len(s["elements"]) > 3 else None
-                if current_sku:
-                    items.append({"sku": current_sku, "ship_qty": q, "uom": u})
-        if not items:
-            return None
-        return {"bsn": bsn, "ship_date": ship_date, "line_items": items}
-
-    def extract_810(self, segs: List[Dict]) -> Optional[Dict[str, Any]]:
-        inv_number = None
-        items = []
-        for s in segs:
-            if s["tag"] == "BIG" and len(s["elements"]) > 2:
-                inv_number = s["elements"][2].strip()
-            if s["tag"] == "IT1":
-                # IT1*1*QTY*UOM*UNITPRICE**BP*SKU
-                qty = s["elements"][2].strip() if len(s["elements"]) > 2 else None
-                price = s["elements"][4].strip() if len(s["elements"]) > 4 else None
-                sku = None
-                for i in range(1, len(s["elements"]) - 1):
-                    if s["elements"][i].strip() in ("BP", "SK", "VP"):
-                        sku = s["elements"][i + 1].strip()
-                        break
-                if sku:
-                    items.append({"sku": sku, "quantity": qty, "unit_price": price})
-        if not inv_number or not items:
-            return None
-        return {"invoice_number": inv_number, "line_items": items}
+def _peak_rss_mb() -> Tuple[Optional[float], Optional[float]]:
+    # (this process, largest finished child) high-water RSS; None off Unix
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    scale = 1 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1e6
+    child = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 1e6
+    return own, child
+
+# parse cache location; see x12.cache.ParseCache
+PARSE_CACHE_PATH = "data_full/parse_cache.sqlite"
+
+# documents per bronze worker task; fixed so file names and control numbers
+# come out the same whatever --workers is
+BRONZE_CHUNK_DOCS = 2048
+BRONZE_MANIFEST = "manifest.json"
 
 # -----------------------------
 # Distribution extraction
@@ -349,62 +103,133 @@ class Dist:
     price_mean: float = CFG["price_mean"]
     price_std: float = CFG["price_std"]
 
-def extract_distributions_from_golden(golden_dir: Path) -> Dist:
-    parser = X12Parser()
-    if not golden_dir.exists():
-        _p(f"[WARN] Golden dir not found: {golden_dir}. Using defaults.")
-        return Dist()
 
-    qtys = []
-    prices = []
-    line_counts = []
+# only 850s feed the distributions, and only these segments of them
+GOLDEN_850_TAGS = frozenset({"ST", "BEG", "PO1"})
 
-    files = [p for p in golden_dir.rglob("*") if p.is_file()]
-    if not files:
-        _p(f"[WARN] No golden files under: {golden_dir}. Using defaults.")
-        return Dist()
 
-    for f in files:
-        if f.suffix.lower() in (".pdf", ".png", ".jpg", ".jpeg"):
-            continue
+class DistBuilder:
+    # constant-memory accumulator behind extract_distributions_from_golden
+    __slots__ = ("lines", "qty", "price")
+
+    def __init__(self):
+        self.lines = RunningStat()
+        self.qty = RunningStat()
+        self.price = RunningStat()
+
+    def add_po(self, po: Dict[str, Any]) -> None:
+        items = po.get("line_items") or []
+        self.lines.add(len(items))
+        for it in items:
+            q = it.quantity
+            p = it.unit_price
+            if q and q > 0: self.qty.add(q)
+            if p and p > 0: self.price.add(p)
+
+    def merge(self, other: "DistBuilder") -> "DistBuilder":
+        self.lines.merge(other.lines)
+        self.qty.merge(other.qty)
+        self.price.merge(other.price)
+        return self
+
+    def build(self) -> Dist:
+        if not self.lines.n:
+            return Dist()
+        qty_mean, qty_std = (self.qty.mean, self.qty.std) if self.qty.n else (CFG["qty_mean"], CFG["qty_std"])
+        price_mean, price_std = (self.price.mean, self.price.std) if self.price.n else (CFG["price_mean"], CFG["price_std"])
+        return Dist(
+            avg_lines=int(np.clip(self.lines.mean, 1, CFG["line_items_max"])),
+            qty_mean=float(np.clip(qty_mean, 1, CFG["qty_max"])),
+            qty_std=float(max(1.0, min(qty_std, CFG["qty_max"]))),
+            price_mean=float(np.clip(price_mean, 1, CFG["price_max"])),
+            price_std=float(max(0.5, min(price_std, CFG["price_max"]))),
+        )
+
+
+def scan_golden_batch(
+    paths: List[str],
+    cache_path: Optional[str] = None,
+) -> Tuple[DistBuilder, int, Optional[Dict[str, List[Tuple]]], List[Tuple[str, str]]]:
+    # Partial statistics for one batch of golden files; runs in a worker process.
+    # Also returns how many files were actually parsed, the batch's pending
+    # cache writes for the parent to apply and the (name, error) of files that
+    # failed to parse, which the parent reports.
+    parser = X12Parser()
+    cache = ParseCache(Path(cache_path), readonly=True) if cache_path else None
+    if cache is not None:
+        cache.prefetch(paths)
+    acc = DistBuilder()
+    failed: List[Tuple[str, str]] = []
+    for path in paths:
         try:
-            segs = parser.parse_file(f)
-            tx = parser.tx_type(segs)
+            if cache is not None:
+                tx, po = extract_file_cached(Path(path), parser, cache)
+            else:
+                tx, po = parser.extract(parser.parse_file(Path(path), tags=GOLDEN_850_TAGS))
             if tx == "850":
-                po = parser.extract_850(segs)
                 if not po:
                     continue
-                items = po.get("line_items") or []
-                line_counts.append(len(items))
-                for it in items:
-                    q = _safe_float(it.get("quantity"), None)
-                    p = _safe_float(it.get("unit_price"), None)
-                    if q and q > 0: qtys.append(q)
-                    if p and p > 0: prices.append(p)
-        except Exception:
-            continue
+                acc.add_po(po)
+        except Exception as e:
+            failed.append((Path(path).name, str(e)))
+    if cache is None:
+        return acc, len(paths), None, failed
+    cache.close()
+    return acc, cache.misses, cache.pending, failed
+
+
+def scan_golden_stats(
+    files: List[Path],
+    workers: int = 1,
+    cache: Optional[ParseCache] = None,
+) -> DistBuilder:
+    # fixed-size batches merged in order, so the Dist is the same whatever --workers is
+    paths = golden_scan_paths(files)
+    cache_path = None
+    if cache is not None:
+        cache._conn()  # create the file up front so workers can open it read-only
+        cache_path = str(cache.path)
+    results = scan_batches(scan_golden_batch, paths, workers=workers, args=(cache_path,))
+    acc = DistBuilder()
+    parsed = 0
+    failed = 0
+    for part, n_parsed, pending, errors in results:
+        acc.merge(part)
+        parsed += n_parsed
+        failed += len(errors)
+        for name, err in errors:
+            _p(f"[WARN] Failed parsing {name}: {err}")
+        if cache is not None:
+            cache.absorb(pending)
+    if failed:
+        _p(f"[WARN] golden scan: {failed} of {len(paths)} files failed to parse and were skipped")
+    if cache is not None:
+        cache.flush()
+        pruned = cache.prune()
+        _p(f"[INFO] golden scan: {len(paths)} files, {parsed} parsed, {len(paths) - parsed} from cache, {pruned} pruned")
+    return acc
+
+
+def extract_distributions_from_golden(
+    golden_dir: Path,
+    workers: int = 1,
+    cache: Optional[ParseCache] = None,
+) -> Dist:
+    if not golden_dir.exists():
+        _p(f"[WARN] Golden dir not found: {golden_dir}. Using defaults.")
+        return Dist()
 
-    if not line_counts:
+    files = sorted((p for p in golden_dir.rglob("*") if p.is_file()), key=str)
+    if not files:
+        _p(f"[WARN] No golden files under: {golden_dir}. Using defaults.")
         return Dist()
 
-    avg_lines = int(np.clip(np.mean(line_counts), 1, CFG["line_items_max"]))
-    qty_mean = float(np.mean(qtys)) if qtys else CFG["qty_mean"]
-    qty_std = float(np.std(qtys)) if qtys else CFG["qty_std"]
-    price_mean = float(np.mean(prices)) if prices else CFG["price_mean"]
-    price_std = float(np.std(prices)) if prices else CFG["price_std"]
-
-    return Dist(
-        avg_lines=avg_lines,
-        qty_mean=float(np.clip(qty_mean, 1, CFG["qty_max"])),
-        qty_std=float(max(1.0, min(qty_std, CFG["qty_max"]))),
-        price_mean=float(np.clip(price_mean, 1, CFG["price_max"])),
-        price_std=float(max(0.5, min(price_std, CFG["price_max"]))),
-    )
+    return scan_golden_stats(files, workers=workers, cache=cache).build()
 
 # -----------------------------
 # Master data
 # -----------------------------
-def build_master(dist: Dist, seed: int) -> Dict[str, Any]:
+def build_master(dist: Dist, seed: int, today: Optional[date] = None) -> Dict[str, Any]:
     random.seed(seed)
     np.random.seed(seed)
 
@@ -432,7 +257,7 @@ def build_master(dist: Dist, seed: int) -> Dict[str, Any]:
 
     # simple “pricing contracts”
     pricing = []
-    today = datetime.now().date()
+    today = today or datetime.now().date()
     for s in SUPPLIERS:
         for sku in SKUS:
             base_price = float(np.clip(np.random.normal(dist.price_mean, max(1.0, dist.price_mean * 0.20)), 1, CFG["price_max"]))
@@ -459,18 +284,30 @@ def build_master(dist: Dist, seed: int) -> Dict[str, Any]:
 # -----------------------------
 # Core generator: PO -> ASN -> Invoice
 # -----------------------------
-class OptionBGenerator:
-    def __init__(self, *, dist: Dist, master: Dict[str, Any], seed: int):
+class OptionBGenerator(BatchTriplets):
+    def __init__(self, *, dist: Dist, master: Dict[str, Any], seed: int, now: Optional[datetime] = None):
         self.dist = dist
         self.master = master
         self.seed = seed
+        # reference clock for order dates; pass one in for reproducible output
+        self.now = now or datetime.now()
         random.seed(seed)
         np.random.seed(seed)
+        # ids and po_number prefix come from their own stream, so they are
+        # reproducible without shifting the draws that shape the documents
+        self._id_rng = random.Random(f"ids:{seed}")
+        self.run_tag = self._id_rng.randrange(1000000)
+        # envelope clock and control numbers fixed by now / seed as well
+        self._x12 = X12Writer(now=self.now, ids=SequentialIds.from_seed(seed))
 
         self._supplier_lookup = {s["supplier_code"]: s for s in self.master["supplier_master"]}
         self._buyer_lookup = {b["buyer_code"]: b for b in self.master["buyer_master"]}
         self._price_lookup = {(p["supplier_code"], p["sku"]): p for p in self.master["pricing_contracts"]}
         self._tol_lookup = {t["id"]: t for t in self.master["tol_profiles"]}
+        self._init_batch(seed)
+
+    def new_id(self) -> str:
+        return str(uuid.UUID(int=self._id_rng.getrandbits(128), version=4))
 
     def _choose_tol_profile(self, supplier_code: str) -> str:
         s = self._supplier_lookup.get(supplier_code, {})
@@ -494,8 +331,8 @@ class OptionBGenerator:
         supplier_code = random.choice(SUPPLIERS)
 
         # spread across history window
-        order_dt = datetime.now() - timedelta(days=random.randint(0, CFG["history_days"]))
-        is_recent = order_dt > (datetime.now() - timedelta(days=CFG["recent_days"]))
+        order_dt = self.now - timedelta(days=random.randint(0, CFG["history_days"]))
+        is_recent = order_dt > (self.now - timedelta(days=CFG["recent_days"]))
         qty_mult = CFG["recent_qty_mult"] if is_recent else 1.0
 
         supplier = self._supplier_lookup.get(supplier_code, {})
@@ -508,7 +345,7 @@ class OptionBGenerator:
         ))
         expected_ship_dt = order_dt + timedelta(days=max(1, lead + jitter))
 
-        po_number = f"PO-{int(time.time() * 1000) % 1000000}-{i}"
+        po_number = f"PO-{self.run_tag}-{i}"
 
         ship_to = buyer.get("default_ship_to") or random.choice(LOCATIONS)["location_code"]
         bill_to = buyer.get("default_bill_to") or random.choice(LOCATIONS)["location_code"]
@@ -544,7 +381,7 @@ class OptionBGenerator:
         tol_profile_id = self._choose_tol_profile(supplier_code)
 
         po = {
-            "po_id": str(uuid.uuid4()),
+            "po_id": self.new_id(),
             "po_number": po_number,
             "buyer_code": buyer_code,
             "supplier_code": supplier_code,
@@ -567,7 +404,7 @@ class OptionBGenerator:
         ship_dt = expected + timedelta(days=random.randint(-1, 2))
 
         asn = {
-            "asn_id": str(uuid.uuid4()),
+            "asn_id": self.new_id(),
             "asn_number": f"ASN-{po['po_number']}",
             "po_number": po["po_number"],
             "buyer_code": po["buyer_code"],
@@ -595,7 +432,7 @@ class OptionBGenerator:
         inv_dt = ship_dt + timedelta(days=random.randint(CFG["invoice_after_ship_days_min"], CFG["invoice_after_ship_days_max"]))
 
         inv = {
-            "invoice_id": str(uuid.uuid4()),
+            "invoice_id": self.new_id(),
             "invoice_number": f"INV-{po['po_number']}",
             "po_number": po["po_number"],
             "buyer_code": po["buyer_code"],
@@ -830,100 +667,165 @@ class OptionBGenerator:
         }
 
     # ------------------------------------------------------------
-    # Document writers (minimal, valid-enough X12 for demos)
+    # Document writers: x12.X12Writer
     # ------------------------------------------------------------
     def render_850(self, po: Dict[str, Any]) -> str:
-        isa_date, isa_time = _now_isa_date_time()
-        isa_ctrl, gs_ctrl, st_ctrl = _make_interchange_ids(seed=_stable_seed_from_str(str(po["po_number"])))
-        beg_date = _yyyymmdd(datetime.fromisoformat(po["order_date"]))
-
-        tx = []
-        tx.append(f"ST*850*{st_ctrl}")
-        tx.append(f"BEG*00*SA*{po['po_number']}*{beg_date}")
-        tx.append(f"N1*BY*{po['buyer_code']}")
-        tx.append(f"N1*SU*{po['supplier_code']}")
-        tx.append(f"ITD*01******{po.get('payment_terms','NET30')}")
-
-        # charges on PO (optional)
-        if po.get("freight_amount") is not None:
-            tx.append(f"SAC*C*FREIGHT***{float(po['freight_amount']):.2f}")
-        if po.get("discount_amount") is not None and float(po["discount_amount"]) > 0:
-            tx.append(f"SAC*A*DISCOUNT***{float(po['discount_amount']):.2f}")
-        if po.get("tax_amount") is not None and float(po["tax_amount"]) > 0:
-            tx.append(f"SAC*C*TAX***{float(po['tax_amount']):.2f}")
-
-        for i, li in enumerate(po["line_items"], 1):
-            tx.append(f"PO1*{i}*{li['quantity']}*{li['unit_of_measure']}*{li['unit_price']}****{li['sku']}")
-
-        tx.append(f"CTT*{len(po['line_items'])}")
-        se_count = len(tx) + 1
-        tx.append(f"SE*{se_count}*{st_ctrl}")
-
-        hdr = []
-        hdr.append(f"ISA*00*          *00*          *ZZ*SENDER_ID       *ZZ*RECEIVER_ID     *{isa_date}*{isa_time}*U*00400*{isa_ctrl}*0*P*:")
-        hdr.append(f"GS*PO*SENDER*RECEIVER*{datetime.now().strftime('%Y%m%d')}*{datetime.now().strftime('%H%M')}*{gs_ctrl}*X*004010")
-        lines = hdr + tx + [f"GE*1*{gs_ctrl}", f"IEA*1*{isa_ctrl}"]
-        return "~".join(lines) + "~"
+        return self._x12.render("850", po)
 
     def render_856(self, asn: Dict[str, Any]) -> str:
-        isa_date, isa_time = _now_isa_date_time()
-        isa_ctrl, gs_ctrl, st_ctrl = _make_interchange_ids(seed=_stable_seed_from_str(str(asn["asn_number"])))
-        ship_date = _yyyymmdd(datetime.fromisoformat(asn["ship_date"]))
-
-        tx = []
-        tx.append(f"ST*856*{st_ctrl}")
-        tx.append(f"BSN*00*{asn['asn_number']}*{ship_date}*{datetime.now().strftime('%H%M')}")
-        tx.append(f"DTM*011*{ship_date}")
-        tx.append(f"TD5*****{asn.get('carrier_code','UPS')}")
-
-        # minimal HL/line info (not full compliance, but consistent)
-        for i, li in enumerate(asn["line_items"], 1):
-            tx.append(f"HL*{i}**I")
-            tx.append(f"LIN**BP*{li['sku']}")
-            tx.append(f"SN1**{li['ship_qty']}*{li.get('unit_of_measure','EA')}")
-
-        tx.append(f"CTT*{len(asn['line_items'])}")
-        se_count = len(tx) + 1
-        tx.append(f"SE*{se_count}*{st_ctrl}")
-
-        hdr = []
-        hdr.append(f"ISA*00*          *00*          *ZZ*SENDER_ID       *ZZ*RECEIVER_ID     *{isa_date}*{isa_time}*U*00400*{isa_ctrl}*0*P*:")
-        hdr.append(f"GS*SH*SENDER*RECEIVER*{datetime.now().strftime('%Y%m%d')}*{datetime.now().strftime('%H%M')}*{gs_ctrl}*X*004010")
-        lines = hdr + tx + [f"GE*1*{gs_ctrl}", f"IEA*1*{isa_ctrl}"]
-        return "~".join(lines) + "~"
+        return self._x12.render("856", asn)
 
     def render_810(self, inv: Dict[str, Any]) -> str:
-        isa_date, isa_time = _now_isa_date_time()
-        isa_ctrl, gs_ctrl, st_ctrl = _make_interchange_ids(seed=_stable_seed_from_str(str(inv["invoice_number"])))
-        inv_date = _yyyymmdd(datetime.fromisoformat(inv["invoice_date"]))
-
-        tx = []
-        tx.append(f"ST*810*{st_ctrl}")
-        tx.append(f"BIG*{inv_date}*{inv['invoice_number']}")
-        tx.append(f"N1*BY*{inv['buyer_code']}")
-        tx.append(f"N1*SU*{inv['supplier_code']}")
-
-        # invoice charges
-        if inv.get("freight_amount") is not None:
-            tx.append(f"SAC*C*FREIGHT***{float(inv['freight_amount']):.2f}")
-        if inv.get("discount_amount") is not None and float(inv["discount_amount"]) > 0:
-            tx.append(f"SAC*A*DISCOUNT***{float(inv['discount_amount']):.2f}")
-        if inv.get("tax_amount") is not None and float(inv["tax_amount"]) > 0:
-            tx.append(f"SAC*C*TAX***{float(inv['tax_amount']):.2f}")
-
-        for i, li in enumerate(inv["line_items"], 1):
-            tx.append(f"IT1*{i}*{li['quantity']}*{li['unit_of_measure']}*{li['unit_price']}**BP*{li['sku']}")
-
-        total = float(inv.get("total_amount") or 0.0)
-        tx.append(f"TDS*{int(round(total * 100))}")  # cents
-        se_count = len(tx) + 1
-        tx.append(f"SE*{se_count}*{st_ctrl}")
-
-        hdr = []
-        hdr.append(f"ISA*00*          *00*          *ZZ*SENDER_ID       *ZZ*RECEIVER_ID     *{isa_date}*{isa_time}*U*00400*{isa_ctrl}*0*P*:")
-        hdr.append(f"GS*IN*SENDER*RECEIVER*{datetime.now().strftime('%Y%m%d')}*{datetime.now().strftime('%H%M')}*{gs_ctrl}*X*004010")
-        lines = hdr + tx + [f"GE*1*{gs_ctrl}", f"IEA*1*{isa_ctrl}"]
-        return "~".join(lines) + "~"
+        return self._x12.render("810", inv)
+
+# -----------------------------
+# Per-document generation
+# make_labeled_triplet / add_duplicate_docs are the steps of main()'s
+# per-document loop. iter_scale_chunks (--scale) runs the same steps but
+# hands each PO on as soon as its documents and label are final, instead of
+# keeping every triplet, the NORMAL pool, labels and links until the
+# duplicate pass. Only the DUPLICATE_DOC sources wait: one size-1 reservoir
+# per duplicate draw, so each draw is uniform over all clean NORMAL
+# triplets, like random.choice(normal_pool). A slot holding the t-th
+# candidate is next replaced at candidate floor(t / u) + 1 (u uniform in
+# (0, 1]), which is drawn directly instead of flipping a coin per slot.
+# -----------------------------
+SCALE_CHUNK_ROWS = 20000
+
+def make_labeled_triplet(gen: OptionBGenerator, i: int, label: str) -> Tuple[Dict, Optional[Dict], Optional[Dict], Dict[str, Any]]:
+    po = gen._make_po(i)
+    asn = gen._make_asn_from_po(po)
+    inv = gen._make_invoice_from_po_asn(po, asn)
+
+    # doc missingness should happen mostly in MISSING_DOC class, but you can still have rare missing in NORMAL
+    if label == "NORMAL":
+        if random.random() < CFG["p_missing_asn"]:
+            asn = None
+        if random.random() < CFG["p_missing_invoice"]:
+            inv = None
+
+    # apply anomaly payload + doc edits
+    po2, asn2, inv2, payload = gen._apply_anomaly(po=po, asn=asn, inv=inv, label=label)
+    return po2, asn2, inv2, {
+        "label": label if label in LABELS_OPTION_B else "NORMAL",
+        "severity": payload["severity"],
+        "risk_score": payload["risk_score"],
+        "estimated_dollar_impact": payload["estimated_dollar_impact"],
+        "reason_codes": payload["reason_codes"],
+        "owner_team": payload["owner_team"],
+        "recommended_action": payload["recommended_action"],
+        "tolerance_profile_id": po2.get("tolerance_profile_id"),
+    }
+
+def triplet_link(po: Dict, asn: Optional[Dict], inv: Optional[Dict]) -> Dict[str, Any]:
+    return {
+        "po_number": po["po_number"],
+        "po_id": po["po_id"],
+        "asn_numbers": [asn["asn_number"]] if asn else [],
+        "invoice_numbers": [inv["invoice_number"]] if inv else [],
+    }
+
+def add_duplicate_docs(gen: OptionBGenerator, src_asn: Dict, src_inv: Dict, lab: Dict[str, Any]) -> Tuple[Optional[Dict], Optional[Dict]]:
+    # one DUPLICATE_DOC draw: copy the ASN and/or invoice (links keep the
+    # originals only) and relabel the PO in place
+    dup_asn = dup_inv = None
+    if random.random() < 0.6:
+        dup_asn = copy.deepcopy(src_asn)
+        dup_asn["asn_id"] = gen.new_id()
+        dup_asn["asn_number"] = f"{src_asn['asn_number']}-D{random.randint(10,999)}"
+
+    if random.random() < 0.6:
+        dup_inv = copy.deepcopy(src_inv)
+        dup_inv["invoice_id"] = gen.new_id()
+        dup_inv["invoice_number"] = f"{src_inv['invoice_number']}-D{random.randint(10,999)}"
+
+    # relabel that PO as DUPLICATE_DOC (business view)
+    lab["label"] = "DUPLICATE_DOC"
+    lab["reason_codes"] = list(dict.fromkeys(lab.get("reason_codes", []) + ["DUPLICATE_DOCUMENT_PATTERN"]))
+    lab["owner_team"] = "OPERATIONS"
+    lab["recommended_action"] = "DEDUPE_AND_CONFIRM_VALID_DOC"
+    lab["risk_score"] = float(np.clip(lab["risk_score"] + 0.10, 0.0, 1.0))
+    if lab["risk_score"] <= CFG["sev_low_risk_max"]:
+        lab["severity"] = "LOW"
+    elif lab["risk_score"] <= CFG["sev_med_risk_max"]:
+        lab["severity"] = "MED"
+    else:
+        lab["severity"] = "HIGH"
+    return dup_asn, dup_inv
+
+def _scale_chunk(recs: List[Dict[str, Any]]) -> Tuple[List[Dict], List[Dict], List[Dict], Dict[str, Any], List[Dict]]:
+    return (
+        [r["po"] for r in recs],
+        [a for r in recs for a in r["asns"]],
+        [v for r in recs for v in r["invs"]],
+        {r["po"]["po_number"]: r["label"] for r in recs},
+        [r["link"] for r in recs],
+    )
+
+def iter_scale_chunks(
+    gen: OptionBGenerator, quotas: Dict[str, int], chunk_rows: int = SCALE_CHUNK_ROWS
+) -> Iterator[Tuple[List[Dict], List[Dict], List[Dict], Dict[str, Any], List[Dict]]]:
+    # (pos, asns, invs, labels, links) per chunk of finished POs; a PO's
+    # documents are always in one chunk. Reservoir POs (possibly duplicated)
+    # come last.
+    dup_n = int(quotas.get("DUPLICATE_DOC", 0))
+    slots: List[Dict[str, Any]] = []
+    due: List[Tuple[int, int]] = []  # (candidate number of the next replacement, slot)
+    seen = 0
+    chunk: List[Dict[str, Any]] = []
+    i = 0
+    for label, n in quotas.items():
+        if n <= 0:
+            continue
+        _p(f"[GEN] {label}: {n}")
+        for _ in range(n):
+            po, asn, inv, lab = make_labeled_triplet(gen, i, label)
+            i += 1
+            rec = {
+                "po": po,
+                "asns": [asn] if asn else [],
+                "invs": [inv] if inv else [],
+                "label": lab,
+                "link": triplet_link(po, asn, inv),
+                "refs": 0,
+            }
+            done = [rec]
+            if dup_n > 0 and label == "NORMAL" and asn and inv:
+                seen += 1
+                if seen == 1:
+                    slots = [rec] * dup_n
+                    rec["refs"] = dup_n
+                    due = [(int(1 / (1.0 - random.random())) + 1, j) for j in range(dup_n)]
+                    heapq.heapify(due)
+                while due and due[0][0] == seen:
+                    j = heapq.heappop(due)[1]
+                    old = slots[j]
+                    old["refs"] -= 1
+                    slots[j] = rec
+                    rec["refs"] += 1
+                    heapq.heappush(due, (int(seen / (1.0 - random.random())) + 1, j))
+                    if old["refs"] == 0:
+                        done.append(old)
+                # still a possible source: written after the duplicate pass
+                if rec["refs"]:
+                    done.remove(rec)
+            chunk.extend(done)
+            if len(chunk) >= chunk_rows:
+                yield _scale_chunk(chunk)
+                chunk = []
+
+    if slots:
+        held = list({id(r): r for r in slots}.values())
+        _p(f"[GEN] Adding duplicate-doc instances: {dup_n} (from {len(held)} reservoir POs)")
+        for rec in slots:
+            dup_asn, dup_inv = add_duplicate_docs(gen, rec["asns"][0], rec["invs"][0], rec["label"])
+            if dup_asn:
+                rec["asns"].append(dup_asn)
+            if dup_inv:
+                rec["invs"].append(dup_inv)
+        chunk.extend(held)
+    for start in range(0, len(chunk), chunk_rows):
+        yield _scale_chunk(chunk[start:start + chunk_rows])
 
 # -----------------------------
 # Oracle flags (data-quality only)
@@ -961,6 +863,414 @@ def build_oracle_flags(pos: List[Dict[str, Any]], asns: List[Dict[str, Any]], in
         }
     return out
 
+def build_oracle_flags_dataset(ds: "TripletDataset") -> Dict[str, Any]:
+    # build_oracle_flags straight from the columns, same output
+    n = len(ds.pos)
+    asn_count = np.bincount(ds.asns.header["po"], minlength=n).tolist()
+    inv_count = np.bincount(ds.invs.header["po"], minlength=n).tolist()
+    L = ds.pos.lines
+    keys = [
+        f"{s}|{q}|{p}"
+        for s, q, p in zip(vocab_names("sku", L["sku"]), L["quantity"].tolist(), L["unit_price"].tolist())
+    ]
+    off = ds.pos.offsets.tolist()
+    buyers = vocab_names("buyer", ds.pos.header["buyer"])
+    suppliers = vocab_names("supplier", ds.pos.header["supplier"])
+    out = {}
+    for k, pn in enumerate(ds.po_numbers()):
+        sig = _sha1(f"{buyers[k]}||{suppliers[k]}||" + "||".join(sorted(keys[off[k]:off[k + 1]])))
+        out[pn] = {
+            "oracle_flags": {
+                "missing_asn": asn_count[k] == 0,
+                "missing_invoice": inv_count[k] == 0,
+                "po_signature": sig,
+                "asn_count": int(asn_count[k]),
+                "invoice_count": int(inv_count[k]),
+            },
+            "oracle_label_version": "optionB_flags_only_v1",
+        }
+    return out
+
+# -----------------------------
+# Match features
+# One row per PO in the training CSV layout (training/train_lightgbm_basic.py
+# FEATURE_COLUMNS), computed from the columns. Quantities and prices come from
+# the primary ASN / invoice (dup == 0); duplicates only set is_repeat.
+# -----------------------------
+MATCH_FEATURE_COLUMNS = [
+    "po_qty",
+    "po_price",
+    "asn_qty",
+    "inv_qty",
+    "inv_price",
+    "has_po_ref",
+    "is_repeat",
+    "qty_delta",
+    "price_diff_pct",
+]
+
+def build_match_features(ds: "TripletDataset") -> Dict[str, np.ndarray]:
+    n = len(ds.pos)
+
+    def per_po(table: "DocTable", weights: np.ndarray, primary: bool = True) -> np.ndarray:
+        po = table.header["po"][table.line_doc()] if len(table) else np.zeros(0, dtype=np.int64)
+        if primary and len(table):
+            keep = (table.header["dup"] == 0)[table.line_doc()]
+            po, weights = po[keep], weights[keep]
+        return np.bincount(po, weights=weights, minlength=n)
+
+    pl = ds.pos.lines
+    po_qty = np.bincount(ds.pos.line_doc(), weights=pl["quantity"], minlength=n)
+    po_value = np.bincount(ds.pos.line_doc(), weights=pl["quantity"] * pl["unit_price"], minlength=n)
+    asn_qty = per_po(ds.asns, ds.asns.lines["ship_qty"].astype(np.float64))
+    il = ds.invs.lines
+    inv_qty = per_po(ds.invs, il["quantity"].astype(np.float64))
+    inv_value = per_po(ds.invs, il["quantity"] * il["unit_price"])
+
+    po_price = np.round(np.divide(po_value, po_qty, out=np.zeros(n), where=po_qty > 0), 2)
+    inv_price = np.round(np.divide(inv_value, inv_qty, out=np.zeros(n), where=inv_qty > 0), 2)
+    asn_docs = np.bincount(ds.asns.header["po"], minlength=n)
+    inv_docs = np.bincount(ds.invs.header["po"], minlength=n)
+    return {
+        "record_id": np.array(ds.po_numbers(), dtype=object),
+        "po_qty": po_qty.astype(np.int64),
+        "po_price": po_price,
+        "asn_qty": asn_qty.astype(np.int64),
+        "inv_qty": inv_qty.astype(np.int64),
+        "inv_price": inv_price,
+        # both downstream documents reference the PO
+        "has_po_ref": ((asn_docs > 0) & (inv_docs > 0)).astype(np.int8),
+        "is_repeat": ((asn_docs > 1) | (inv_docs > 1)).astype(np.int8),
+        "qty_delta": (inv_qty - po_qty).astype(np.int64),
+        "price_diff_pct": np.round(np.divide(inv_price - po_price, po_price, out=np.zeros(n), where=po_price > 0), 6),
+    }
+
+def write_features_csv(path: Path, features: Dict[str, np.ndarray], labels: Dict[str, Any], append: bool = False) -> int:
+    # label_what / label_who / label_mitigation as the training script expects;
+    # append: add rows to an existing file (no header), e.g. one call per shard
+    cols = ["record_id"] + MATCH_FEATURE_COLUMNS
+    values = [features[c].tolist() for c in cols]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a" if append else "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        if not append:
+            w.writerow(cols + ["label_what", "label_who", "label_mitigation"])
+        for row in zip(*values):
+            lab = labels.get(row[0]) or {}
+            w.writerow(list(row) + [lab.get("label", "NORMAL"), lab.get("owner_team", "None"), lab.get("recommended_action", "REVIEW")])
+    return len(values[0])
+
+# -----------------------------
+# Gold tables (--output-format jsonl / parquet / parquet-partitioned)
+# One directory per entity of part files plus manifest.json holding the
+# small run metadata (cfg, dist, master_data, ...). Rows are written in
+# batches as they arrive, so memory stays bounded by one batch per table.
+# Row layout is the gold JSON's; labels and oracle flags get a po_number
+# column instead of being keyed by it. parquet-partitioned splits every
+# table by the PO's label and order month (gold.TableSink on
+# gold.PARTITION_COLUMNS; read back with gold.load_gold_table).
+# -----------------------------
+GOLD_TABLES = ("pos", "asns", "invoices", "labels", "links", "oracle_flags")
+GOLD_MANIFEST = "manifest.json"
+GOLD_BATCH_ROWS = 50000
+GOLD_PART_ROWS = 1000000
+
+def gold_arrow_schemas() -> Dict[str, Any]:
+    import pyarrow as pa
+
+    s, f, i = pa.string(), pa.float64(), pa.int64()
+    return {
+        "pos": pa.schema([
+            ("po_id", s), ("po_number", s), ("buyer_code", s), ("supplier_code", s),
+            ("order_date", s), ("expected_ship_date", s), ("ship_to_location", s), ("bill_to_location", s),
+            ("payment_terms", s), ("currency", s), ("carrier_code", s), ("tolerance_profile_id", s),
+            ("line_items", pa.list_(pa.struct([
+                ("line_number", i), ("sku", s), ("quantity", i), ("unit_of_measure", s),
+                ("unit_price", f), ("contract_unit_price", f), ("discount_pct", f),
+            ]))),
+            ("freight_amount", f), ("discount_amount", f), ("tax_amount", f),
+        ]),
+        "asns": pa.schema([
+            ("asn_id", s), ("asn_number", s), ("po_number", s), ("buyer_code", s), ("supplier_code", s),
+            ("ship_date", s), ("carrier_code", s), ("ship_to_location", s),
+            ("line_items", pa.list_(pa.struct([("line_number", i), ("sku", s), ("ship_qty", i), ("unit_of_measure", s)]))),
+        ]),
+        "invoices": pa.schema([
+            ("invoice_id", s), ("invoice_number", s), ("po_number", s), ("buyer_code", s), ("supplier_code", s),
+            ("invoice_date", s), ("currency", s),
+            ("line_items", pa.list_(pa.struct([
+                ("line_number", i), ("sku", s), ("quantity", i), ("unit_of_measure", s), ("unit_price", f),
+            ]))),
+            ("freight_amount", f), ("discount_amount", f), ("tax_amount", f), ("subtotal_amount", f), ("total_amount", f),
+        ]),
+        "labels": pa.schema([
+            ("po_number", s), ("label", s), ("severity", s), ("risk_score", f), ("estimated_dollar_impact", f),
+            ("reason_codes", pa.list_(s)), ("owner_team", s), ("recommended_action", s), ("tolerance_profile_id", s),
+        ]),
+        "links": pa.schema([("po_number", s), ("po_id", s), ("asn_numbers", pa.list_(s)), ("invoice_numbers", pa.list_(s))]),
+        "oracle_flags": pa.schema([
+            ("po_number", s),
+            ("oracle_flags", pa.struct([
+                ("missing_asn", pa.bool_()), ("missing_invoice", pa.bool_()), ("po_signature", s),
+                ("asn_count", i), ("invoice_count", i),
+            ])),
+            ("oracle_label_version", s),
+        ]),
+    }
+
+
+def gold_partition_keys(pos: Iterable[Dict[str, Any]], labels: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    # po_number -> partition columns, shared by every document of that PO
+    return {
+        p["po_number"]: {"label": labels[p["po_number"]]["label"], "order_month": order_month(p.get("order_date"))}
+        for p in pos
+    }
+
+def gold_rows(
+    pos: Iterable[Dict[str, Any]],
+    asns: Iterable[Dict[str, Any]],
+    invs: Iterable[Dict[str, Any]],
+    labels: Dict[str, Any],
+    links: Iterable[Dict[str, Any]],
+    oracle_flags: Dict[str, Any],
+    keys: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Iterable[Dict[str, Any]]]:
+    # one batch of gold records as table -> rows; keys (gold_partition_keys)
+    # adds the partition columns to every row
+    tables = {
+        "pos": pos,
+        "asns": asns,
+        "invoices": invs,
+        "labels": ({"po_number": pn, **v} for pn, v in labels.items()),
+        "links": links,
+        "oracle_flags": ({"po_number": pn, **v} for pn, v in oracle_flags.items()),
+    }
+    if keys is None:
+        return tables
+    return {name: ({**r, **keys[r["po_number"]]} for r in rows) for name, rows in tables.items()}
+
+def write_gold_tables(
+    outdir: Path,
+    fmt: str,
+    parts: Iterable[Dict[str, Iterable[Dict[str, Any]]]],
+    meta: Dict[str, Any],
+    batch_rows: int = GOLD_BATCH_ROWS,
+    rows_per_file: int = GOLD_PART_ROWS,
+) -> Dict[str, Any]:
+    # Streams every part (gold_rows output) into the per-table sinks, then
+    # writes the manifest. Existing table directories are replaced.
+    outdir.mkdir(parents=True, exist_ok=True)
+    for name in GOLD_TABLES:
+        shutil.rmtree(outdir / name, ignore_errors=True)
+    schemas = gold_arrow_schemas() if fmt.startswith("parquet") else {}
+    partition_cols = PARTITION_COLUMNS if fmt == "parquet-partitioned" else ()
+    sinks = {
+        name: TableSink(
+            outdir,
+            name,
+            schemas.get(name),
+            fmt="jsonl" if fmt == "jsonl" else "parquet",
+            partition_cols=partition_cols,
+            batch_rows=batch_rows,
+            rows_per_file=rows_per_file,
+        )
+        for name in GOLD_TABLES
+    }
+    try:
+        for part in parts:
+            for name, rows in part.items():
+                sink = sinks[name]
+                for row in rows:
+                    sink.add(row)
+    finally:
+        tables = {name: sink.close() for name, sink in sinks.items()}
+    manifest = {**meta, "format": fmt, "tables": tables}
+    (outdir / GOLD_MANIFEST).write_text(json.dumps(manifest, indent=2, default=str), encoding="utf-8")
+    return manifest
+
+# -----------------------------
+# Bronze writers
+# -----------------------------
+def bronze_relpath(name: str, sharded: bool) -> str:
+    # sharded: <first two hex digits of sha1(name)>/<name>, so 256 subdirectories
+    if not sharded:
+        return name
+    return f"{hashlib.sha1(name.encode('utf-8')).hexdigest()[:2]}/{name}"
+
+def plan_bronze_jobs(
+    pos: List[Dict[str, Any]],
+    asns: List[Dict[str, Any]],
+    invs: List[Dict[str, Any]],
+    batch: int = 0,
+    chunk_docs: int = BRONZE_CHUNK_DOCS,
+) -> List[Dict[str, Any]]:
+    # Fixed-size chunks in serial order. Each records the index of its first
+    # file and first interchange, which is all a worker needs to name files and
+    # number envelopes exactly as a serial run would.
+    jobs: List[Dict[str, Any]] = []
+    ix = 0
+    for tx_type, docs in (("850", pos), ("856", asns), ("810", invs)):
+        step = max(1, chunk_docs // batch) * batch if batch > 0 else chunk_docs
+        for k in range(0, len(docs), step):
+            part = docs[k:k + step]
+            jobs.append({
+                "job": len(jobs),
+                "tx_type": tx_type,
+                "docs": part,
+                "batch": batch,
+                "first_file": k // batch if batch > 0 else k,
+                "first_ix": ix,
+            })
+            ix += (len(part) + batch - 1) // batch if batch > 0 else len(part)
+    return jobs
+
+def _slice_columns(
+    cols: Dict[str, List[Any]], lines: Dict[str, List[Any]], offsets: List[int], lo: int, hi: int
+) -> Tuple[Dict[str, List[Any]], Dict[str, List[Any]], List[int]]:
+    a, b = offsets[lo], offsets[min(hi, len(offsets) - 1)]
+    return (
+        {k: v[lo:hi] for k, v in cols.items()},
+        {k: v[a:b] for k, v in lines.items()},
+        [o - a for o in offsets[lo:hi + 1]],
+    )
+
+def render_bronze_job(job: Dict[str, Any], now: datetime, seed: Optional[int] = None) -> Iterator[Tuple[str, bytes, int]]:
+    # (file name, bytes, transaction sets) for every bronze file of one chunk;
+    # docs is a list of dicts or X12Rows (columns, rendered without dicts)
+    tx_type, docs, batch = job["tx_type"], job["docs"], job["batch"]
+    ids = SequentialIds(start=job["first_ix"]) if seed is None else SequentialIds.from_seed(seed, start=job["first_ix"])
+    writer = X12Writer(now=now, ids=ids)
+    if isinstance(docs, X12Rows):
+        cols, lines, offsets = docs.columns()
+        if batch > 0:
+            for j, k in enumerate(range(0, len(docs), batch)):
+                writer.out = io.StringIO()
+                n_tx = writer.write_interchange_columns(tx_type, *_slice_columns(cols, lines, offsets, k, k + batch))
+                yield f"{tx_type}-{job['first_file'] + j:06d}.{tx_type}", writer.getvalue().encode("utf-8"), n_tx
+        else:
+            key = {"850": "po_number", "856": "asn_number", "810": "invoice_number"}[tx_type]
+            for name, text in zip(cols[key], writer.render_columns(tx_type, cols, lines, offsets)):
+                yield f"{name}.{tx_type}", text.encode("utf-8"), 1
+        return
+    if batch > 0:
+        for j, k in enumerate(range(0, len(docs), batch)):
+            writer.out = io.StringIO()
+            n_tx = writer.write_interchange(tx_type, docs[k:k + batch])
+            yield f"{tx_type}-{job['first_file'] + j:06d}.{tx_type}", writer.getvalue().encode("utf-8"), n_tx
+    else:
+        key = {"850": "po_number", "856": "asn_number", "810": "invoice_number"}[tx_type]
+        for doc in docs:
+            yield f"{doc[key]}.{tx_type}", writer.render(tx_type, doc).encode("utf-8"), 1
+
+def _write_if_changed(path: Path, data: bytes, sha1: str, previous: Dict[str, str], rel: str) -> int:
+    # skip the write when the last manifest recorded the same content hash
+    if previous.get(rel) == sha1 and path.exists():
+        return 0
+    path.write_bytes(data)
+    return 1
+
+def write_bronze_job(
+    job: Dict[str, Any],
+    bronze_dir: str,
+    now: datetime,
+    sharded: bool,
+    archive: bool = False,
+    seed: Optional[int] = None,
+    previous: Optional[Dict[str, str]] = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], int]:
+    # Runs in a worker: render + write one chunk as loose files or as one zip
+    # shard. Returns (manifest rows, archive member rows, archive document rows,
+    # files actually written). previous: path -> sha1 from the last manifest.
+    out_dir = Path(bronze_dir)
+    previous = previous or {}
+    if archive:
+        # shard number = job number, so shards line up with serial order;
+        # a previous manifest means this is an incremental run
+        members = ((name, data) for name, data, _ in render_bronze_job(job, now, seed))
+        row, member_rows, doc_rows, written = pack_shard(out_dir, job["job"], members, date_time=now, incremental=bool(previous))
+        return [row], member_rows, doc_rows, int(written)
+    rows: List[Dict[str, Any]] = []
+    written = 0
+    for name, data, n_tx in render_bronze_job(job, now, seed):
+        rel = bronze_relpath(name, sharded)
+        sha1 = hashlib.sha1(data).hexdigest()
+        written += _write_if_changed(out_dir / rel, data, sha1, previous, rel)
+        rows.append({"path": rel, "size": len(data), "sha1": sha1, "tx_type": job["tx_type"], "transactions": n_tx})
+    return rows, [], [], written
+
+def write_bronze(
+    bronze_dir: Path,
+    pos: List[Dict[str, Any]],
+    asns: List[Dict[str, Any]],
+    invs: List[Dict[str, Any]],
+    batch: int = 0,
+    workers: int = 1,
+    sharded: bool = False,
+    now: Optional[datetime] = None,
+    archive: bool = False,
+    seed: Optional[int] = None,
+    incremental: bool = False,
+) -> Dict[str, Any]:
+    # Render + write every document, in a process pool when workers > 1.
+    # Envelope time is fixed once per run and control numbers follow serial
+    # order, so the files (and manifest) are byte-identical for any --workers.
+    # archive: one zip shard per chunk plus x12.archive's document index.
+    # seed: control numbers start at a seed-derived base (SequentialIds.from_seed).
+    # incremental: files whose sha1 matches the previous manifest are left
+    # alone and files the previous manifest listed but this run did not
+    # produce are removed.
+    now = (now or datetime.now()).replace(second=0, microsecond=0)
+    bronze_dir.mkdir(parents=True, exist_ok=True)
+    if sharded and not archive:
+        for i in range(256):
+            (bronze_dir / f"{i:02x}").mkdir(exist_ok=True)
+    previous: Dict[str, str] = {}
+    manifest_path = bronze_dir / BRONZE_MANIFEST
+    if incremental and manifest_path.exists():
+        try:
+            old = json.loads(manifest_path.read_text(encoding="utf-8"))
+            previous = {r["path"]: r["sha1"] for r in old.get("files", []) if r.get("sha1")}
+        except Exception:
+            previous = {}
+    jobs = plan_bronze_jobs(pos, asns, invs, batch=batch)
+    args = (str(bronze_dir), now, sharded, archive, seed, previous)
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            # map() keeps job order, so manifest rows come back in serial order
+            parts = list(ex.map(write_bronze_job, jobs, *[itertools.repeat(a) for a in args]))
+    else:
+        parts = [write_bronze_job(job, *args) for job in jobs]
+    files = [row for part in parts for row in part[0]]
+    removed = 0
+    if archive:
+        packer = ArchiveWriter(bronze_dir, date_time=now, incremental=incremental)
+        for rows, member_rows, doc_rows, written in parts:
+            packer.add_shard(rows[0], member_rows, doc_rows, bool(written))
+        packer.close()
+        removed += packer.removed
+    if incremental:
+        current = {r["path"] for r in files}
+        for rel in previous:
+            if rel not in current and (bronze_dir / rel).is_file():
+                (bronze_dir / rel).unlink()
+                removed += 1
+    manifest = {
+        "layout": "zip" if archive else ("sharded" if sharded else "flat"),
+        "batch": batch,
+        "seed": seed,
+        "envelope_time": now.isoformat(),
+        "total_files": len(files),
+        "total_bytes": sum(r["size"] for r in files),
+        "total_transactions": sum(r["transactions"] for r in files),
+        "index": ARCHIVE_INDEX if archive else None,
+        "files": files,
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    # run stats, kept out of the manifest so reruns produce the same file
+    manifest["written_files"] = sum(part[3] for part in parts)
+    manifest["removed_files"] = removed
+    return manifest
+
 # -----------------------------
 # Main dataset builder
 # -----------------------------
@@ -976,19 +1286,80 @@ def main():
     )
 
     ap.add_argument("--outdir", type=str, default="data_full/gold")
+    ap.add_argument(
+        "--output-format",
+        choices=("json", "jsonl", "parquet", "parquet-partitioned"),
+        default="json",
+        help="json: one training_dataset_full.json; jsonl/parquet: a directory of part files per entity plus manifest.json "
+        "(with --batch-gen, streamed shard by shard); parquet-partitioned: the same, split into label=/order_month= "
+        "directories",
+    )
     ap.add_argument("--bronze-dir", type=str, default="data_full/bronze")
     ap.add_argument("--write-bronze", action="store_true")
+    ap.add_argument(
+        "--bronze-batch",
+        type=int,
+        default=0,
+        help="transaction sets per bronze interchange file (0 = one file per document)",
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes for the golden-corpus scan, --batch-gen shards and bronze writing; needs --batch-gen when > 1 "
+        "(output does not depend on it)",
+    )
+    ap.add_argument("--shard-bronze", action="store_true", help="spread bronze files over 256 hashed subdirectories")
+    ap.add_argument("--bronze-archive", action="store_true", help="pack bronze into zip shards with a document index")
+    ap.add_argument(
+        "--ref-date",
+        type=str,
+        default="",
+        help="reference date (YYYY-MM-DD) for order dates and envelopes; default today. Same seed + ref date = same bytes",
+    )
+    ap.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only rewrite bronze files whose content hash differs from the previous manifest",
+    )
+    ap.add_argument(
+        "--batch-gen",
+        action="store_true",
+        help="build triplets and inject anomalies as columnar batches (numpy Generator, one kernel per label) instead of per document",
+    )
+    ap.add_argument(
+        "--scale",
+        action="store_true",
+        help="bounded memory for 10M+ triplets (needs a streaming --output-format): per-document generation writes each PO "
+        "once final, keeping only a reservoir of duplicate sources; prints throughput and peak RSS",
+    )
+    ap.add_argument("--features-csv", type=str, default="", help="also write per-PO match features + labels (training CSV layout)")
+    ap.add_argument("--parse-cache", type=str, default=PARSE_CACHE_PATH, help="parse cache file ('' disables)")
+    ap.add_argument("--parse-cache-max-mb", type=int, default=PARSE_CACHE_MAX_BYTES >> 20)
+    ap.add_argument("--clear-parse-cache", action="store_true")
 
     args = ap.parse_args()
+    if int(args.workers) > 1 and not args.batch_gen:
+        # per-document generation runs in one process; don't let --workers look like it sped it up
+        ap.error("--workers > 1 needs --batch-gen (per-document generation is not sharded)")
     random.seed(int(args.seed))
     np.random.seed(int(args.seed))
 
     golden_dir = Path(args.golden_dir)
-    dist = extract_distributions_from_golden(golden_dir)
+    cache = None
+    if args.parse_cache:
+        cache = ParseCache(Path(args.parse_cache), max_bytes=int(args.parse_cache_max_mb) << 20)
+        if args.clear_parse_cache:
+            _p(f"[INFO] parse cache cleared: {cache.clear()} entries")
+    dist = extract_distributions_from_golden(golden_dir, workers=int(args.workers), cache=cache)
+    if cache is not None:
+        cache.close()
     _p(f"[INFO] dist: avg_lines={dist.avg_lines} qty_mean={dist.qty_mean:.2f} qty_std={dist.qty_std:.2f} price_mean={dist.price_mean:.2f} price_std={dist.price_std:.2f}")
 
-    master = build_master(dist, seed=int(args.seed))
-    gen = OptionBGenerator(dist=dist, master=master, seed=int(args.seed))
+    ref_dt = datetime.fromisoformat(args.ref_date) if args.ref_date else datetime.combine(date.today(), datetime.min.time())
+    _p(f"[INFO] reference clock: {ref_dt.isoformat()}")
+    master = build_master(dist, seed=int(args.seed), today=ref_dt.date())
+    gen = OptionBGenerator(dist=dist, master=master, seed=int(args.seed), now=ref_dt)
 
     # parse quotas
     quotas: Dict[str, int] = {}
@@ -1005,126 +1376,17 @@ def main():
     for k in LABELS_OPTION_B:
         quotas.setdefault(k, 0)
 
-    pos: List[Dict[str, Any]] = []
-    asns: List[Dict[str, Any]] = []
-    invs: List[Dict[str, Any]] = []
-    labels: Dict[str, Any] = {}
-    links: List[Dict[str, Any]] = []
-
-    i = 0
-    _p("[GEN] Building triplets...")
-
-    # First generate base NORMAL triplets, then mutate for each class.
-    def build_normal_triplet(i: int) -> Tuple[Dict, Optional[Dict], Optional[Dict]]:
-        po = gen._make_po(i)
-        asn = gen._make_asn_from_po(po)
-        inv = gen._make_invoice_from_po_asn(po, asn)
-        return po, asn, inv
-
-    # build a pool for DUPLICATE_DOC
-    normal_pool: List[Tuple[Dict, Dict, Dict]] = []
-
-    for label, n in quotas.items():
-        if n <= 0:
-            continue
-
-        _p(f"[GEN] {label}: {n}")
-        for _ in range(n):
-            po, asn, inv = build_normal_triplet(i)
-            i += 1
-
-            # doc missingness should happen mostly in MISSING_DOC class, but you can still have rare missing in NORMAL
-            if label == "NORMAL":
-                if random.random() < CFG["p_missing_asn"]:
-                    asn = None
-                if random.random() < CFG["p_missing_invoice"]:
-                    inv = None
-
-            # apply anomaly payload + doc edits
-            po2, asn2, inv2, payload = gen._apply_anomaly(po=po, asn=asn, inv=inv, label=label)
-
-            # write docs if still present
-            pos.append(po2)
-            if asn2:
-                asns.append(asn2)
-            if inv2:
-                invs.append(inv2)
-
-            pn = po2["po_number"]
-            labels[pn] = {
-                "label": label if label in LABELS_OPTION_B else "NORMAL",
-                "severity": payload["severity"],
-                "risk_score": payload["risk_score"],
-                "estimated_dollar_impact": payload["estimated_dollar_impact"],
-                "reason_codes": payload["reason_codes"],
-                "owner_team": payload["owner_team"],
-                "recommended_action": payload["recommended_action"],
-                "tolerance_profile_id": po2.get("tolerance_profile_id"),
-            }
-
-            links.append({
-                "po_number": pn,
-                "po_id": po2["po_id"],
-                "asn_numbers": [asn2["asn_number"]] if asn2 else [],
-                "invoice_numbers": [inv2["invoice_number"]] if inv2 else [],
-            })
-
-            # keep pool for duplicates
-            if label == "NORMAL" and asn2 and inv2:
-                normal_pool.append((po2, asn2, inv2))
-
-    # handle DUPLICATE_DOC as “copy a prior doc pattern”
-    # (adds extra ASN/INV for same PO)
-    dup_n = quotas.get("DUPLICATE_DOC", 0)
-    if dup_n > 0 and normal_pool:
-        _p(f"[GEN] Adding duplicate-doc instances: {dup_n}")
-        for _ in range(dup_n):
-            src_po, src_asn, src_inv = random.choice(normal_pool)
-            pn = src_po["po_number"]
-
-            # duplicate ASN and/or Invoice docs
-            if random.random() < 0.6:
-                dup_asn = copy.deepcopy(src_asn)
-                dup_asn["asn_id"] = str(uuid.uuid4())
-                dup_asn["asn_number"] = f"{src_asn['asn_number']}-D{random.randint(10,999)}"
-                asns.append(dup_asn)
-
-            if random.random() < 0.6:
-                dup_inv = copy.deepcopy(src_inv)
-                dup_inv["invoice_id"] = str(uuid.uuid4())
-                dup_inv["invoice_number"] = f"{src_inv['invoice_number']}-D{random.randint(10,999)}"
-                invs.append(dup_inv)
-
-            # relabel that PO as DUPLICATE_DOC (business view)
-            labels[pn]["label"] = "DUPLICATE_DOC"
-            labels[pn]["reason_codes"] = list(set(labels[pn].get("reason_codes", []) + ["DUPLICATE_DOCUMENT_PATTERN"]))
-            labels[pn]["owner_team"] = "OPERATIONS"
-            labels[pn]["recommended_action"] = "DEDUPE_AND_CONFIRM_VALID_DOC"
-            labels[pn]["risk_score"] = float(np.clip(labels[pn]["risk_score"] + 0.10, 0.0, 1.0))
-            if labels[pn]["risk_score"] <= CFG["sev_low_risk_max"]:
-                labels[pn]["severity"] = "LOW"
-            elif labels[pn]["risk_score"] <= CFG["sev_med_risk_max"]:
-                labels[pn]["severity"] = "MED"
-            else:
-                labels[pn]["severity"] = "HIGH"
-
-            # update links for that po_number
-            for lk in links:
-                if lk["po_number"] == pn:
-                    # we don't know which duplicates were added here, so we just leave arrays as-is
-                    break
-
-    # oracle flags
-    oracle_flags = build_oracle_flags(pos, asns, invs)
-
     outdir = Path(args.outdir)
-    outdir.mkdir(parents=True, exist_ok=True)
-    out_path = outdir / "training_dataset_full.json"
-
-    dataset = {
+    fmt = args.output_format
+    if fmt != "json" and args.write_bronze:
+        raise SystemExit("--write-bronze needs the whole dataset in memory; use --output-format json")
+    if args.scale and fmt == "json":
+        raise SystemExit("--scale streams its output; use --output-format jsonl, parquet or parquet-partitioned")
+    meta = {
         "mode": "optionB_po_asn_invoice_3way",
         "generator_version": "optionB_v1",
         "seed": int(args.seed),
+        "ref_date": ref_dt.isoformat(),
         "dist": {
             "avg_lines": dist.avg_lines,
             "qty_mean": dist.qty_mean,
@@ -1135,38 +1397,163 @@ def main():
         "cfg": CFG,
         "label_set": LABELS_OPTION_B,
         "master_data": master,
+    }
 
-        # canonical docs
-        "pos": pos,
-        "asns": asns,
-        "invoices": invs,
+    if fmt != "json" and (args.batch_gen or args.scale):
+        # stream: each shard / chunk goes to the table sinks (and features CSV) and is dropped
+        _p(f"[GEN] Streaming triplets ({'columnar' if args.batch_gen else 'per document'}) to {outdir} as {fmt}...")
+        t0 = time.perf_counter()
+        features_path = Path(args.features_csv) if args.features_csv else None
+        n_features = 0
+
+        def stream_parts() -> Iterator[Dict[str, Iterable[Dict[str, Any]]]]:
+            nonlocal n_features
+            if args.batch_gen:
+                chunks = (
+                    (ds, list(ds.po_dicts()), ds.asn_dicts(), ds.invoice_dicts(), lab.label_dicts(ds), ds.link_dicts(), build_oracle_flags_dataset(ds))
+                    for ds, lab in iter_labeled_shards(gen, quotas, seed=int(args.seed), workers=int(args.workers))
+                )
+            else:
+                chunks = (
+                    (None, pos, asns, invs, labels, links, build_oracle_flags(pos, asns, invs))
+                    for pos, asns, invs, labels, links in iter_scale_chunks(gen, quotas)
+                )
+            for ds, pos, asns, invs, labels, links, oracle_flags in chunks:
+                if features_path is not None:
+                    fds = ds if ds is not None else TripletDataset.from_dicts(pos, asns, invs)
+                    n_features += write_features_csv(features_path, build_match_features(fds), labels, append=n_features > 0)
+                keys = gold_partition_keys(pos, labels) if fmt == "parquet-partitioned" else None
+                yield gold_rows(pos, asns, invs, labels, links, oracle_flags, keys)
+
+        manifest = write_gold_tables(outdir, fmt, stream_parts(), meta)
+        elapsed = time.perf_counter() - t0
+        counts = {k: v["rows"] for k, v in manifest["tables"].items()}
+        _p(f"[OK] Wrote: {outdir} ({elapsed:.2f}s)")
+        _p(f"[INFO] counts: pos={counts['pos']} asns={counts['asns']} invs={counts['invoices']} labels={counts['labels']}")
+        if features_path is not None:
+            _p(f"[OK] Wrote {n_features} feature rows: {args.features_csv}")
+        if args.scale:
+            own, child = _peak_rss_mb()
+            rss = "n/a" if own is None else f"{own:,.0f} MB" + (f" (largest worker {child:,.0f} MB)" if child and int(args.workers) > 1 else "")
+            _p(f"[PERF] {counts['pos']:,} triplets in {elapsed:.1f}s: {counts['pos'] / max(elapsed, 1e-9):,.0f} triplets/s, peak RSS {rss}")
+        return
 
-        # linkage and labels
-        "links": links,            # row per PO_number
-        "labels": labels,          # keyed by PO_number
-        "oracle_flags": oracle_flags,  # keyed by PO_number (flags only)
-    }
-    out_path.write_text(json.dumps(dataset, indent=2, default=str), encoding="utf-8")
-    _p(f"[OK] Wrote: {out_path}")
+    pos: List[Dict[str, Any]] = []
+    asns: List[Dict[str, Any]] = []
+    invs: List[Dict[str, Any]] = []
+    labels: Dict[str, Any] = {}
+    links: List[Dict[str, Any]] = []
+
+    ds = None
+    if args.batch_gen:
+        # columnar: make_triplets + one anomaly kernel per label, dicts only for the JSON
+        _p("[GEN] Building triplets (columnar)...")
+        t0 = time.perf_counter()
+        ds, lab = generate_labeled_dataset(gen, quotas, seed=int(args.seed), workers=int(args.workers))
+        _p(f"[GEN] {len(ds.pos)} triplets + anomalies in {time.perf_counter() - t0:.2f}s")
+        pos, asns, invs = list(ds.po_dicts()), list(ds.asn_dicts()), list(ds.invoice_dicts())
+        labels = lab.label_dicts(ds)
+        links = list(ds.link_dicts())
+        oracle_flags = build_oracle_flags_dataset(ds)
+    else:
+        i = 0
+        _p("[GEN] Building triplets...")
+
+        # build a pool for DUPLICATE_DOC
+        normal_pool: List[Tuple[Dict, Dict, Dict]] = []
+
+        for label, n in quotas.items():
+            if n <= 0:
+                continue
+
+            _p(f"[GEN] {label}: {n}")
+            for _ in range(n):
+                po2, asn2, inv2, lab = make_labeled_triplet(gen, i, label)
+                i += 1
+
+                # write docs if still present
+                pos.append(po2)
+                if asn2:
+                    asns.append(asn2)
+                if inv2:
+                    invs.append(inv2)
+
+                labels[po2["po_number"]] = lab
+                links.append(triplet_link(po2, asn2, inv2))
+
+                # keep pool for duplicates
+                if label == "NORMAL" and asn2 and inv2:
+                    normal_pool.append((po2, asn2, inv2))
+
+        # handle DUPLICATE_DOC as “copy a prior doc pattern”
+        # (adds extra ASN/INV for same PO)
+        dup_n = quotas.get("DUPLICATE_DOC", 0)
+        if dup_n > 0 and normal_pool:
+            _p(f"[GEN] Adding duplicate-doc instances: {dup_n}")
+            for _ in range(dup_n):
+                src_po, src_asn, src_inv = random.choice(normal_pool)
+                dup_asn, dup_inv = add_duplicate_docs(gen, src_asn, src_inv, labels[src_po["po_number"]])
+                if dup_asn:
+                    asns.append(dup_asn)
+                if dup_inv:
+                    invs.append(dup_inv)
+
+        # oracle flags
+        oracle_flags = build_oracle_flags(pos, asns, invs)
+
+    if fmt != "json":
+        # per-document path: everything is in memory already, written as one part
+        keys = gold_partition_keys(pos, labels) if fmt == "parquet-partitioned" else None
+        write_gold_tables(outdir, fmt, [gold_rows(pos, asns, invs, labels, links, oracle_flags, keys)], meta)
+        _p(f"[OK] Wrote: {outdir} ({fmt})")
+    else:
+        outdir.mkdir(parents=True, exist_ok=True)
+        out_path = outdir / "training_dataset_full.json"
+        dataset = {
+            **meta,
+
+            # canonical docs
+            "pos": pos,
+            "asns": asns,
+            "invoices": invs,
+
+            # linkage and labels
+            "links": links,            # row per PO_number
+            "labels": labels,          # keyed by PO_number
+            "oracle_flags": oracle_flags,  # keyed by PO_number (flags only)
+        }
+        out_path.write_text(json.dumps(dataset, indent=2, default=str), encoding="utf-8")
+        _p(f"[OK] Wrote: {out_path}")
     _p(f"[INFO] counts: pos={len(pos)} asns={len(asns)} invs={len(invs)} labels={len(labels)}")
 
+    if args.features_csv:
+        features = build_match_features(ds if ds is not None else TripletDataset.from_dicts(pos, asns, invs))
+        n_rows = write_features_csv(Path(args.features_csv), features, labels)
+        _p(f"[OK] Wrote {n_rows} feature rows: {args.features_csv}")
+
     if args.write_bronze:
         bronze_dir = Path(args.bronze_dir)
-        bronze_dir.mkdir(parents=True, exist_ok=True)
         _p(f"[BRONZE] Writing X12 docs to: {bronze_dir}")
-
-        # write 850 entries
-        for po in pos:
-            (bronze_dir / f"{po['po_number']}.850").write_text(gen.render_850(po), encoding="utf-8")
-
-        # write 856 entries
-        for asn in asns:
-            (bronze_dir / f"{asn['asn_number']}.856").write_text(gen.render_856(asn), encoding="utf-8")
-
-        # write 810 entries
-        for inv in invs:
-            (bronze_dir / f"{inv['invoice_number']}.810").write_text(gen.render_810(inv), encoding="utf-8")
-
+        t0 = time.perf_counter()
+        # columnar runs render straight from the arrays
+        docs = (ds.x12_rows("850"), ds.x12_rows("856"), ds.x12_rows("810")) if ds is not None else (pos, asns, invs)
+        manifest = write_bronze(
+            bronze_dir,
+            *docs,
+            batch=int(args.bronze_batch),
+            workers=int(args.workers),
+            sharded=bool(args.shard_bronze),
+            archive=bool(args.bronze_archive),
+            now=ref_dt,
+            seed=int(args.seed),
+            incremental=bool(args.incremental),
+        )
+        _p(
+            f"[BRONZE] {manifest['total_transactions']} transactions in {manifest['total_files']} files, "
+            f"{manifest['total_bytes'] / 1e6:.1f} MB in {time.perf_counter() - t0:.1f}s ({manifest['layout']})"
+        )
+        if args.incremental:
+            _p(f"[BRONZE] incremental: {manifest['written_files']} written, {manifest['total_files'] - manifest['written_files']} unchanged, {manifest['removed_files']} removed")
         _p("[BRONZE] Done.")
 
 if __name__ == "__main__":
@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
-import re
+import copy
+import hashlib
+import itertools
 import json
 import uuid
-import time
 import random
-import zlib
+import shutil
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import os
+import sys
 import argparse
 
 import pandas as pd
@@ -20,10 +23,11 @@ try:
 except Exception:
     Faker = None  # type: ignore
 
+# backend/ml on the path for the shared x12 and gold packages (before the chdir below)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from gold import PARTITION_COLUMNS, TableSink, order_month
+from x12 import ArchiveWriter, RunningStat, SequentialIds, X12Parser, X12Writer, scan_batches
 
-DEFAULT_SEGMENT_TERMINATOR = "~"
-DEFAULT_ELEMENT_SEPARATOR = "*"
-COMPOSITE_SEPARATOR = ":"
 
 SUPPLIERS = [
     "SUPPLIER001",
@@ -110,11 +114,19 @@ REALISM_CFG = {
     "normal_qty_sigma_cap": 2.0,
 }
 
+# POs per generation shard; fixed so the output is the same whatever --workers is
+GEN_SHARD_ROWS = 8192
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 DATA_DIR = SCRIPT_DIR / "data"
 BRONZE_DIR = DATA_DIR / "bronze"
 SILVER_DIR = DATA_DIR / "silver"
 GOLD_DIR = DATA_DIR / "gold"
+# --output-format parquet-partitioned: <table>/label=/order_month=/part-NNNNN.parquet + manifest.json
+GOLD_DATASET_DIR = GOLD_DIR / "training_dataset"
+GOLD_DATASET_TABLES = ("pos", "labels", "oracle_labels")
+# bronze/manifest.json: the files the last --bronze-mode run produced
+BRONZE_MANIFEST = "manifest.json"
 
 os.chdir("..")
 GOLDEN_SAMPLES_DIR = Path(os.getcwd()) / "golden_schemas"
@@ -127,171 +139,40 @@ def _p(msg: str) -> None:
         print(msg.encode("utf-8", errors="ignore").decode("utf-8", errors="ignore"), flush=True)
 
 
-def detect_terminator_and_separator(content: str) -> Tuple[str, str]:
-    content = content.strip()
-    elem_sep = DEFAULT_ELEMENT_SEPARATOR
-    if content.startswith("ISA") and len(content) >= 4:
-        elem_sep = content[3]
-
-    candidates = ["~", "\n"]
-    best = DEFAULT_SEGMENT_TERMINATOR
-    best_score = -1
-
-    for cand in candidates:
-        segs = content.split(cand)
-        joined = " ".join(segs[:50])
-        score = 0
-        if "GS" in joined:
-            score += 2
-        if "ST" in joined:
-            score += 2
-        if len(segs) > 10:
-            score += 1
-        if score > best_score:
-            best_score = score
-            best = cand
-
-    return best, elem_sep
-
-
-def split_segments(content: str) -> List[str]:
-    content = content.strip()
-    if "~" in content:
-        segs = content.split("~")
-    else:
-        segs = re.split(r"[\r\n]+", content)
-    return [s.strip() for s in segs if s.strip()]
-
-
 def write_csv(df: pd.DataFrame, path: Path) -> None:
     df.to_csv(path, index=False)
 
 
-def _now_isa_date_time() -> Tuple[str, str]:
-    now = datetime.now()
-    return now.strftime("%y%m%d"), now.strftime("%H%M")
-
-
-def _fmt_yyyymmdd_from_iso(iso_dt: str) -> str:
-    try:
-        dt = datetime.fromisoformat(str(iso_dt))
-        return dt.strftime("%Y%m%d")
-    except Exception:
-        try:
-            return str(iso_dt)[:10].replace("-", "")
-        except Exception:
-            return datetime.now().strftime("%Y%m%d")
-
-
-def _ctrl9(n: int) -> str:
-    return str(int(n) % 1000000000).zfill(9)
-
-
-def _ctrl_st(n: int) -> str:
-    return str(int(n) % 10000).zfill(4)
-
-
-_INTERCHANGE_COUNTER = 0
-
-
-def _stable_seed_from_str(s: str) -> int:
-    try:
-        b = (s or "").encode("utf-8", errors="ignore")
-    except Exception:
-        b = b""
-    return int(zlib.crc32(b) & 0xFFFFFFFF)
-
-
-def _make_interchange_ids(seed: Optional[int] = None) -> Tuple[str, str, str]:
-    global _INTERCHANGE_COUNTER
-    _INTERCHANGE_COUNTER += 1
-    base = int(time.time() * 1000)
-    if seed is not None:
-        base += int(seed)
-    base += (_INTERCHANGE_COUNTER % 1000000)
-    isa_ctrl = _ctrl9(base)
-    gs_ctrl = str((base // 10) % 100000)
-    st_ctrl = _ctrl_st(base // 100)
-    return isa_ctrl, gs_ctrl, st_ctrl
-
-
-class X12Parser:
-    def __init__(self):
-        self.segment_terminator = DEFAULT_SEGMENT_TERMINATOR
-        self.element_separator = DEFAULT_ELEMENT_SEPARATOR
-
-    def parse_file(self, filepath: str) -> List[Dict]:
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-            content = f.read()
-
-        seg_term, elem_sep = detect_terminator_and_separator(content)
-        self.segment_terminator = seg_term
-        self.element_separator = elem_sep
-
-        segments: List[Dict] = []
-        for raw_seg in split_segments(content):
-            elements = raw_seg.split(self.element_separator)
-            tag = elements[0].strip() if elements else None
-            if tag:
-                segments.append({"tag": tag, "elements": elements, "raw": raw_seg})
-        return segments
-
-    def detect_transaction_type(self, segments: List[Dict]) -> Optional[str]:
-        for seg in segments:
-            if seg["tag"] == "ST" and len(seg["elements"]) > 1:
-                return seg["elements"][1].strip()
-        return None
-
-    def extract_po_data(self, segments: List[Dict]) -> Dict:
-        po_data = {
-            "po_id": str(uuid.uuid4()),
-            "po_number": None,
-            "buyer_code": None,
-            "supplier_code": None,
-            "order_date": None,
-            "line_items": [],
-        }
-
-        for seg in segments:
-            if seg["tag"] == "BEG":
-                if len(seg["elements"]) > 3:
-                    po_data["po_number"] = seg["elements"][3].strip()
-                if len(seg["elements"]) > 4:
-                    po_data["order_date"] = seg["elements"][4].strip()
-
-            elif seg["tag"] == "N1":
-                if len(seg["elements"]) > 2:
-                    role = seg["elements"][1].strip()
-                    code = seg["elements"][2].strip()
-                    if role == "BY":
-                        po_data["buyer_code"] = code
-                    elif role == "SU":
-                        po_data["supplier_code"] = code
-
-            elif seg["tag"] == "PO1":
-                line_item = {
-                    "line_number": seg["elements"][1].strip() if len(seg["elements"]) > 1 else None,
-                    "quantity": seg["elements"][2].strip() if len(seg["elements"]) > 2 else None,
-                    "unit_of_measure": seg["elements"][3].strip() if len(seg["elements"]) > 3 else None,
-                    "unit_price": seg["elements"][4].strip() if len(seg["elements"]) > 4 else None,
-                    "sku": None,
-                }
-                if len(seg["elements"]) > 8 and seg["elements"][8].strip():
-                    line_item["sku"] = seg["elements"][8].strip()
-                elif len(seg["elements"]) > 7 and seg["elements"][7].strip():
-                    line_item["sku"] = seg["elements"][7].strip()
-
-                po_data["line_items"].append(line_item)
-
-        return po_data
-
-
 class SyntheticDataGenerator:
-    def __init__(self, golden_pos: Optional[List[Dict]] = None, seed_val: int = 42):
+    def __init__(
+        self,
+        golden_pos: Optional[List[Dict]] = None,
+        seed_val: int = 42,
+        golden_stats: Optional[Dict[str, RunningStat]] = None,
+        now: Optional[datetime] = None,
+    ):
         self.fake = Faker() if Faker is not None else None
-        random.seed(seed_val)
-        np.random.seed(seed_val)
+        # reference clock for order dates and envelopes; pass one in for reproducible output
+        self.now = now or datetime.now()
+        # document draws come from the instance streams (global random state
+        # is left alone), so generate_pos_with_quotas can reseed them per shard
+        self.seed_val = seed_val
+        self.rng = random.Random(seed_val)
+        self.np_rng = np.random.RandomState(seed_val)
+        # ids, po_number prefix and control numbers are seeded separately so
+        # they do not shift the draws that shape the documents
+        self._id_rng = random.Random(f"ids:{seed_val}")
+        self.run_tag = self._id_rng.randrange(1000000)
+        # no ITD without payment terms and no TAX charge, as before the shared writer
+        self._x12 = X12Writer(
+            now=self.now.replace(second=0, microsecond=0),
+            default_terms=None,
+            with_tax=False,
+            ids=SequentialIds.from_seed(seed_val),
+        )
         self.golden_pos = golden_pos or []
+        # merged scan_golden_stats() output; takes precedence over golden_pos
+        self.golden_stats = golden_stats
         self._extract_distributions()
         self.master_data = self._generate_master_data()
 
@@ -299,8 +180,28 @@ class SyntheticDataGenerator:
         self._buyer_lookup = {b["buyer_code"]: b for b in self.master_data["buyer_master"]}
         self._pricing_lookup = {(p["supplier_code"], p["sku"]): p for p in self.master_data["pricing_contracts"]}
 
+    def __getstate__(self) -> Dict:
+        # shard workers only draw documents: no Faker, no X12 buffer
+        state = dict(self.__dict__)
+        state["fake"] = None
+        state["_x12"] = None
+        return state
+
+    def new_id(self) -> str:
+        return str(uuid.UUID(int=self._id_rng.getrandbits(128), version=4))
+
+    def reseed(self, seq: np.random.SeedSequence) -> None:
+        # document, numpy and id streams all derived from one SeedSequence
+        py, nump, ids = seq.spawn(3)
+        self.rng = random.Random(int(py.generate_state(1, np.uint64)[0]))
+        self.np_rng = np.random.RandomState(np.random.MT19937(nump))
+        self._id_rng = random.Random(int(ids.generate_state(1, np.uint64)[0]))
+
     def _extract_distributions(self):
-        if not self.golden_pos:
+        st = self.golden_stats
+        if st is None and self.golden_pos:
+            st = golden_partial_stats(self.golden_pos)
+        if not st or not st["lines"].n:
             self.avg_line_items = 5
             self.avg_quantity = 100.0
             self.std_quantity = 50.0
@@ -308,27 +209,9 @@ class SyntheticDataGenerator:
             self.std_unit_price = 20.0
             return
 
-        line_counts, qtys, prices = [], [], []
-        for po in self.golden_pos:
-            items = po.get("line_items", []) or []
-            line_counts.append(len(items))
-            for it in items:
-                try:
-                    if it.get("quantity") is not None:
-                        qtys.append(float(it["quantity"]))
-                except Exception:
-                    pass
-                try:
-                    if it.get("unit_price") is not None:
-                        prices.append(float(it["unit_price"]))
-                except Exception:
-                    pass
-
-        self.avg_line_items = int(np.clip(np.mean(line_counts) if line_counts else 5, 1, 15))
-        q_mean = float(np.mean(qtys) if qtys else 100.0)
-        q_std = float(np.std(qtys) if qtys else 50.0)
-        p_mean = float(np.mean(prices) if prices else 50.0)
-        p_std = float(np.std(prices) if prices else 20.0)
+        self.avg_line_items = int(np.clip(st["lines"].mean, 1, 15))
+        q_mean, q_std = (st["qty"].mean, st["qty"].std) if st["qty"].n else (100.0, 50.0)
+        p_mean, p_std = (st["price"].mean, st["price"].std) if st["price"].n else (50.0, 20.0)
 
         self.avg_quantity = float(np.clip(q_mean, 1, 10000))
         self.std_quantity = float(np.clip(q_std, 1, 10000))
@@ -342,10 +225,10 @@ class SyntheticDataGenerator:
                 {
                     "supplier_code": code,
                     "supplier_name": code.replace("_", " ").title(),
-                    "lead_time_days": int(random.randint(2, 14)),
-                    "sla_ship_days": int(random.randint(1, 7)),
-                    "default_payment_terms": random.choice(PAYMENT_TERMS),
-                    "preferred_carrier": random.choice(CARRIERS),
+                    "lead_time_days": int(self.rng.randint(2, 14)),
+                    "sla_ship_days": int(self.rng.randint(1, 7)),
+                    "default_payment_terms": self.rng.choice(PAYMENT_TERMS),
+                    "preferred_carrier": self.rng.choice(CARRIERS),
                 }
             )
 
@@ -355,8 +238,8 @@ class SyntheticDataGenerator:
                 {
                     "buyer_code": code,
                     "buyer_name": code.replace("_", " ").title(),
-                    "default_ship_to": random.choice(LOCATIONS)["location_code"],
-                    "default_bill_to": random.choice(LOCATIONS)["location_code"],
+                    "default_ship_to": self.rng.choice(LOCATIONS)["location_code"],
+                    "default_bill_to": self.rng.choice(LOCATIONS)["location_code"],
                 }
             )
 
@@ -365,11 +248,11 @@ class SyntheticDataGenerator:
             item_master.append({"sku": sku, "description": sku.replace("-", " ").title()})
 
         pricing_contracts: List[Dict] = []
-        today = datetime.now().date()
+        today = self.now.date()
         for s in SUPPLIERS:
             for sku in SKUS:
-                base_price = float(np.clip(np.random.normal(self.avg_unit_price, max(1.0, self.avg_unit_price * 0.20)), 1, 2000))
-                discount_pct = float(np.clip(np.random.normal(0.03, 0.02), 0.0, 0.15))
+                base_price = float(np.clip(self.np_rng.normal(self.avg_unit_price, max(1.0, self.avg_unit_price * 0.20)), 1, 2000))
+                discount_pct = float(np.clip(self.np_rng.normal(0.03, 0.02), 0.0, 0.15))
                 pricing_contracts.append(
                     {
                         "supplier_code": s,
@@ -393,32 +276,32 @@ class SyntheticDataGenerator:
         }
 
     def _base_po_shell(self, i: int, seen_po_numbers: set) -> Dict:
-        n_lines = int(np.clip(np.random.poisson(lam=self.avg_line_items), 1, 12))
-        buyer_code = random.choice(BUYERS)
-        supplier_code = random.choice(SUPPLIERS)
-        order_dt = datetime.now() - timedelta(days=random.randint(0, 90))
+        n_lines = int(np.clip(self.np_rng.poisson(lam=self.avg_line_items), 1, 12))
+        buyer_code = self.rng.choice(BUYERS)
+        supplier_code = self.rng.choice(SUPPLIERS)
+        order_dt = self.now - timedelta(days=self.rng.randint(0, 90))
 
         buyer_m = self._buyer_lookup.get(buyer_code, {})
         supplier_m = self._supplier_lookup.get(supplier_code, {})
 
-        ship_to = buyer_m.get("default_ship_to") or random.choice(LOCATIONS)["location_code"]
-        bill_to = buyer_m.get("default_bill_to") or random.choice(LOCATIONS)["location_code"]
-        pay_terms = supplier_m.get("default_payment_terms") or random.choice(PAYMENT_TERMS)
+        ship_to = buyer_m.get("default_ship_to") or self.rng.choice(LOCATIONS)["location_code"]
+        bill_to = buyer_m.get("default_bill_to") or self.rng.choice(LOCATIONS)["location_code"]
+        pay_terms = supplier_m.get("default_payment_terms") or self.rng.choice(PAYMENT_TERMS)
 
         lead = int(supplier_m.get("lead_time_days", 7))
         jitter = int(np.clip(
-            np.random.normal(float(REALISM_CFG["expected_ship_jitter_mean"]), float(REALISM_CFG["expected_ship_jitter_std"])),
+            self.np_rng.normal(float(REALISM_CFG["expected_ship_jitter_mean"]), float(REALISM_CFG["expected_ship_jitter_std"])),
             float(REALISM_CFG["expected_ship_jitter_min"]), float(REALISM_CFG["expected_ship_jitter_max"])
         ))
         expected_ship_dt = order_dt + timedelta(days=max(1, lead + jitter))
 
-        po_number = f"PO-{int(time.time() * 1000) % 1000000}-{i}"
+        po_number = f"PO-{self.run_tag}-{i}"
         while po_number in seen_po_numbers:
-            po_number = f"PO-{int(time.time() * 1000) % 1000000}-{i}-{random.randint(0,999)}"
+            po_number = f"PO-{self.run_tag}-{i}-{self.rng.randint(0,999)}"
         seen_po_numbers.add(po_number)
 
         po = {
-            "po_id": str(uuid.uuid4()),
+            "po_id": self.new_id(),
             "po_number": po_number,
             "buyer_code": buyer_code,
             "supplier_code": supplier_code,
@@ -427,24 +310,24 @@ class SyntheticDataGenerator:
             "ship_to_location": ship_to,
             "bill_to_location": bill_to,
             "payment_terms": pay_terms,
-            "currency": random.choice(CURRENCY_CODES),
+            "currency": self.rng.choice(CURRENCY_CODES),
             "line_items": [],
             "anomaly": "NORMAL",
             "intended_anomaly": "NORMAL",
-            "freight_amount": round(float(np.clip(np.random.normal(45.0, 15.0), 0, 250)), 2),
-            "discount_amount": round(float(np.clip(np.random.normal(20.0, 12.0), 0, 200)), 2),
-            "tax_amount": round(float(np.clip(np.random.normal(10.0, 8.0), 0, 150)), 2),
+            "freight_amount": round(float(np.clip(self.np_rng.normal(45.0, 15.0), 0, 250)), 2),
+            "discount_amount": round(float(np.clip(self.np_rng.normal(20.0, 12.0), 0, 200)), 2),
+            "tax_amount": round(float(np.clip(self.np_rng.normal(10.0, 8.0), 0, 150)), 2),
         }
 
         for j in range(n_lines):
-            sku = random.choice(SKUS)
+            sku = self.rng.choice(SKUS)
             contract = self._pricing_lookup.get((supplier_code, sku), {})
             contract_price = float(contract.get("contract_unit_price", self.avg_unit_price))
             discount_pct = float(contract.get("discount_pct", 0.0))
 
-            qty = int(np.clip(np.random.normal(self.avg_quantity, max(5.0, self.std_quantity)), 1, 5000))
+            qty = int(np.clip(self.np_rng.normal(self.avg_quantity, max(5.0, self.std_quantity)), 1, 5000))
 
-            raw_price = float(np.clip(np.random.normal(contract_price, max(0.5, contract_price * 0.05)), 0.01, 2000))
+            raw_price = float(np.clip(self.np_rng.normal(contract_price, max(0.5, contract_price * 0.05)), 0.01, 2000))
             unit_price = round(raw_price * (1.0 - discount_pct), 2)
 
             po["line_items"].append(
@@ -452,7 +335,7 @@ class SyntheticDataGenerator:
                     "line_number": j + 1,
                     "sku": sku,
                     "quantity": qty,
-                    "unit_of_measure": random.choice(UNITS_OF_MEASURE),
+                    "unit_of_measure": self.rng.choice(UNITS_OF_MEASURE),
                     "unit_price": unit_price,
                     "contract_unit_price": round(contract_price, 2),
                     "discount_pct": round(discount_pct, 4),
@@ -464,24 +347,24 @@ class SyntheticDataGenerator:
     def _sanitize_for_clean_normal(self, po: Dict) -> None:
         # critical fields present
         if not po.get("payment_terms"):
-            po["payment_terms"] = random.choice(PAYMENT_TERMS)
+            po["payment_terms"] = self.rng.choice(PAYMENT_TERMS)
         if not po.get("ship_to_location"):
-            po["ship_to_location"] = random.choice(LOCATIONS)["location_code"]
+            po["ship_to_location"] = self.rng.choice(LOCATIONS)["location_code"]
         if not po.get("bill_to_location"):
-            po["bill_to_location"] = random.choice(LOCATIONS)["location_code"]
+            po["bill_to_location"] = self.rng.choice(LOCATIONS)["location_code"]
 
         # valid order_date and not future
         try:
             dt = datetime.fromisoformat(str(po.get("order_date")))
         except Exception:
-            dt = datetime.now() - timedelta(days=5)
-        if dt > datetime.now():
-            dt = datetime.now() - timedelta(days=1)
+            dt = self.now - timedelta(days=5)
+        if dt > self.now:
+            dt = self.now - timedelta(days=1)
         po["order_date"] = dt.isoformat()
 
         # known SKUs
         for li in po.get("line_items", []) or []:
-            li["sku"] = random.choice(SKUS)
+            li["sku"] = self.rng.choice(SKUS)
 
         # ensure contract deviation stays below threshold * frac
         thr = float(REALISM_CFG["price_outlier_pct_min"])
@@ -490,7 +373,7 @@ class SyntheticDataGenerator:
             cp = float(li.get("contract_unit_price") or 0.0)
             if cp <= 0:
                 continue
-            li["unit_price"] = round(cp * random.uniform(1.0 - max_dev, 1.0 + max_dev), 2)
+            li["unit_price"] = round(cp * self.rng.uniform(1.0 - max_dev, 1.0 + max_dev), 2)
 
         # qty cap to avoid accidental z outlier
         cap = float(self.avg_quantity + float(REALISM_CFG["normal_qty_sigma_cap"]) * self.std_quantity)
@@ -500,11 +383,11 @@ class SyntheticDataGenerator:
             li["quantity"] = int(np.clip(q, 1, int(min(5000, cap))))
 
         # benign missingness on non-critical only
-        if random.random() < float(REALISM_CFG["p_missing_freight_normal"]):
+        if self.rng.random() < float(REALISM_CFG["p_missing_freight_normal"]):
             po["freight_amount"] = None
-        if random.random() < float(REALISM_CFG["p_missing_discount_normal"]):
+        if self.rng.random() < float(REALISM_CFG["p_missing_discount_normal"]):
             po["discount_amount"] = None
-        if random.random() < float(REALISM_CFG["p_missing_tax_normal"]):
+        if self.rng.random() < float(REALISM_CFG["p_missing_tax_normal"]):
             po["tax_amount"] = None
 
     def _apply_single_anomaly(self, po: Dict, anomaly: str) -> None:
@@ -512,41 +395,41 @@ class SyntheticDataGenerator:
         self._sanitize_for_clean_normal(po)
 
         if anomaly == "PO_MISSING_FIELDS":
-            which = random.choice(["payment_terms", "ship_to_location", "bill_to_location"])
+            which = self.rng.choice(["payment_terms", "ship_to_location", "bill_to_location"])
             po[which] = None
 
         elif anomaly == "PO_INVALID_DATE":
-            if random.random() < 0.7:
-                po["order_date"] = (datetime.now() + timedelta(days=random.randint(2, 30))).isoformat()
+            if self.rng.random() < 0.7:
+                po["order_date"] = (self.now + timedelta(days=self.rng.randint(2, 30))).isoformat()
             else:
                 po["order_date"] = "BAD_DATE"
             # keep missing_fields false
             if not po.get("payment_terms"):
-                po["payment_terms"] = random.choice(PAYMENT_TERMS)
+                po["payment_terms"] = self.rng.choice(PAYMENT_TERMS)
             if not po.get("ship_to_location"):
-                po["ship_to_location"] = random.choice(LOCATIONS)["location_code"]
+                po["ship_to_location"] = self.rng.choice(LOCATIONS)["location_code"]
             if not po.get("bill_to_location"):
-                po["bill_to_location"] = random.choice(LOCATIONS)["location_code"]
+                po["bill_to_location"] = self.rng.choice(LOCATIONS)["location_code"]
 
         elif anomaly == "PO_UNKNOWN_ITEM":
             if po.get("line_items"):
-                k = random.randint(0, len(po["line_items"]) - 1)
-                po["line_items"][k]["sku"] = f"UNKNOWN-{random.randint(1000,9999)}"
+                k = self.rng.randint(0, len(po["line_items"]) - 1)
+                po["line_items"][k]["sku"] = f"UNKNOWN-{self.rng.randint(1000,9999)}"
 
         elif anomaly == "PO_PRICE_OUTLIER":
             if po.get("line_items"):
-                k = random.randint(0, len(po["line_items"]) - 1)
+                k = self.rng.randint(0, len(po["line_items"]) - 1)
                 li = po["line_items"][k]
                 cp = float(li.get("contract_unit_price") or li.get("unit_price") or self.avg_unit_price)
-                if random.random() < 0.7:
-                    mult = random.uniform(float(REALISM_CFG["price_outlier_mult_hi_min"]), float(REALISM_CFG["price_outlier_mult_hi_max"]))
+                if self.rng.random() < 0.7:
+                    mult = self.rng.uniform(float(REALISM_CFG["price_outlier_mult_hi_min"]), float(REALISM_CFG["price_outlier_mult_hi_max"]))
                 else:
-                    mult = random.uniform(float(REALISM_CFG["price_outlier_mult_lo_min"]), float(REALISM_CFG["price_outlier_mult_lo_max"]))
+                    mult = self.rng.uniform(float(REALISM_CFG["price_outlier_mult_lo_min"]), float(REALISM_CFG["price_outlier_mult_lo_max"]))
                 li["unit_price"] = round(max(0.01, cp * mult), 2)
 
         elif anomaly == "PO_QTY_OUTLIER":
             if po.get("line_items"):
-                k = random.randint(0, len(po["line_items"]) - 1)
+                k = self.rng.randint(0, len(po["line_items"]) - 1)
                 big = int(np.clip(self.avg_quantity + float(REALISM_CFG["qty_outlier_sigma"]) * self.std_quantity, 50, 5000))
                 po["line_items"][k]["quantity"] = big
 
@@ -557,104 +440,144 @@ class SyntheticDataGenerator:
         po["anomaly"] = anomaly
         po["intended_anomaly"] = anomaly
 
-    def generate_pos_with_quotas(self, quotas: Dict[str, int], start_index: int = 0) -> List[Dict]:
+    def generate_pos_with_quotas(
+        self, quotas: Dict[str, int], start_index: int = 0, workers: int = 1, shard_rows: int = GEN_SHARD_ROWS
+    ) -> List[Dict]:
+        # Quota rows are cut into fixed shards; shard s draws from
+        # SeedSequence(seed, spawn_key=(0, s)) and the final shuffle from
+        # spawn_key=(1,), so any worker count gives the same POs.
         for k in quotas.keys():
             if k not in PO_ONLY_CLASSES:
                 raise ValueError(f"Unknown PO-only class in quotas: {k}")
         for k in PO_ONLY_CLASSES:
             quotas.setdefault(k, 0)
 
-        seen_po_numbers: set[str] = set()
-        pos: List[Dict] = []
-        i = int(start_index)
-
+        labels: List[str] = []
         for label in PO_ONLY_CLASSES:
             target = int(quotas.get(label, 0))
             if target <= 0:
                 continue
-
             _p(f"[GEN] Target {label}: {target}")
-            for _ in range(target):
-                po = self._base_po_shell(i=i, seen_po_numbers=seen_po_numbers)
-                self._apply_single_anomaly(po, label)
-                pos.append(po)
-                i += 1
+            labels += [label] * target
+
+        starts = list(range(0, len(labels), shard_rows))
+        parts = [labels[k:k + shard_rows] for k in starts]
+        shards = list(range(len(starts)))
+        first = [int(start_index) + k for k in starts]
+        if workers > 1 and len(starts) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                # map() keeps shard order, so the merge is the same as serial
+                chunks = list(ex.map(generate_po_shard, itertools.repeat(self), parts, first, shards))
+        else:
+            chunks = [generate_po_shard(self, p, i, s) for p, i, s in zip(parts, first, shards)]
+        pos = [po for chunk in chunks for po in chunk]
 
-        random.shuffle(pos)
+        shuffle_seq = np.random.SeedSequence(self.seed_val, spawn_key=(1,))
+        random.Random(int(shuffle_seq.generate_state(1, np.uint64)[0])).shuffle(pos)
         return pos
 
     def generate_x12_850(self, po: Dict) -> str:
-        isa_date, isa_time = _now_isa_date_time()
-        isa_ctrl, gs_ctrl, st_ctrl = _make_interchange_ids(seed=_stable_seed_from_str(str(po.get("po_number") or "")))
-        beg_date = _fmt_yyyymmdd_from_iso(po.get("order_date", ""))
+        return self._x12.render("850", po)
 
-        tx: List[str] = []
-        tx.append(f"ST*850*{st_ctrl}")
-        tx.append(f"BEG*00*SA*{po['po_number']}*{beg_date}")
-        tx.append(f"N1*BY*{po['buyer_code']}")
-        tx.append(f"N1*SU*{po['supplier_code']}")
 
-        if po.get("payment_terms"):
-            tx.append(f"ITD*01******{po['payment_terms']}")
+def generate_po_shard(gen: SyntheticDataGenerator, labels: List[str], start_index: int, shard: int) -> List[Dict]:
+    # runs in a worker (or inline): one shard on a copy with its own streams
+    g = copy.copy(gen)
+    g.reseed(np.random.SeedSequence(g.seed_val, spawn_key=(0, shard)))
+    seen_po_numbers: set[str] = set()
+    pos: List[Dict] = []
+    for k, label in enumerate(labels):
+        po = g._base_po_shell(i=start_index + k, seen_po_numbers=seen_po_numbers)
+        g._apply_single_anomaly(po, label)
+        pos.append(po)
+    return pos
 
-        if po.get("freight_amount") is not None:
-            tx.append(f"SAC*C*FREIGHT***{float(po['freight_amount']):.2f}")
-        if po.get("discount_amount") is not None and float(po["discount_amount"]) > 0:
-            tx.append(f"SAC*A*DISCOUNT***{float(po['discount_amount']):.2f}")
 
-        for idx, item in enumerate(po.get("line_items", []), 1):
-            tx.append(f"PO1*{idx}*{item['quantity']}*{item['unit_of_measure']}*{item['unit_price']}****{item['sku']}")
+# segments extract_po_data reads; everything else is skipped while parsing
+GOLDEN_PO_TAGS = frozenset({"ST", "BEG", "N1", "PO1"})
 
-        tx.append(f"CTT*{len(po.get('line_items', []))}")
-        se_count = len(tx) + 1
-        se = f"SE*{se_count}*{st_ctrl}"
 
-        lines: List[str] = []
-        lines.append(f"ISA*00*          *00*          *ZZ*SENDER_ID       *ZZ*RECEIVER_ID     *{isa_date}*{isa_time}*U*00400*{isa_ctrl}*0*P*:")
-        lines.append(f"GS*PO*SENDER*RECEIVER*{datetime.now().strftime('%Y%m%d')}*{datetime.now().strftime('%H%M')}*{gs_ctrl}*X*004010")
-        lines.extend(tx)
-        lines.append(se)
-        lines.append(f"GE*1*{gs_ctrl}")
-        lines.append(f"IEA*1*{isa_ctrl}")
-        return "~".join(lines) + "~"
+GOLDEN_STAT_KEYS = ("lines", "qty", "price")
 
 
-def parse_golden_samples() -> List[Dict]:
-    golden_pos: List[Dict] = []
-    parser = X12Parser()
-
+def _golden_files() -> List[Path]:
     if not GOLDEN_SAMPLES_DIR.exists():
         _p(f"[WARN] golden_schemas dir not found at: {GOLDEN_SAMPLES_DIR}")
-        return golden_pos
+        return []
 
     files = sorted([p for p in GOLDEN_SAMPLES_DIR.rglob("*") if p.is_file()])
     if not files:
         _p(f"[WARN] No files found under: {GOLDEN_SAMPLES_DIR}")
-        return golden_pos
+    return [p for p in files if p.suffix.lower() not in [".pdf", ".png", ".jpg", ".jpeg"]]
+
 
-    for file in files:
+def _parse_golden_files(paths: Iterable[str]) -> List[Dict]:
+    golden_pos: List[Dict] = []
+    parser = X12Parser()
+    for path in paths:
         try:
-            if file.suffix.lower() in [".pdf", ".png", ".jpg", ".jpeg"]:
-                continue
-            segments = parser.parse_file(str(file))
-            tx = parser.detect_transaction_type(segments)
+            tx, segments = parser.peek_transaction_type(parser.parse_file(path, tags=GOLDEN_PO_TAGS))
             if tx == "850":
                 po = parser.extract_po_data(segments)
                 if po.get("po_number"):
                     golden_pos.append(po)
         except Exception as e:
-            _p(f"[WARN] Failed parsing {file.name}: {e}")
-
+            _p(f"[WARN] Failed parsing {Path(path).name}: {e}")
     return golden_pos
 
 
+def parse_golden_samples() -> List[Dict]:
+    return _parse_golden_files(str(p) for p in _golden_files())
+
+
+def golden_partial_stats(pos: Iterable[Dict]) -> Dict[str, RunningStat]:
+    # line-count / quantity / price accumulators behind SyntheticDataGenerator's distributions
+    st = {k: RunningStat() for k in GOLDEN_STAT_KEYS}
+    for po in pos:
+        items = po.get("line_items", []) or []
+        st["lines"].add(len(items))
+        for it in items:
+            try:
+                if it.get("quantity") is not None:
+                    st["qty"].add(float(it["quantity"]))
+            except Exception:
+                pass
+            try:
+                if it.get("unit_price") is not None:
+                    st["price"].add(float(it["unit_price"]))
+            except Exception:
+                pass
+    return st
+
+
+def merge_golden_stats(parts: Iterable[Dict[str, RunningStat]]) -> Dict[str, RunningStat]:
+    out = {k: RunningStat() for k in GOLDEN_STAT_KEYS}
+    for part in parts:
+        for k in GOLDEN_STAT_KEYS:
+            out[k].merge(part[k])
+    return out
+
+
+def scan_golden_batch(paths: List[str]) -> Dict[str, RunningStat]:
+    # runs in a worker process: parse one batch, hand back only its partial stats
+    return golden_partial_stats(_parse_golden_files(paths))
+
+
+def scan_golden_stats(workers: int = 1) -> Dict[str, RunningStat]:
+    # fixed-size batches merged in order, so the stats are the same whatever --workers is
+    paths = [str(p) for p in _golden_files()]
+    return merge_golden_stats(scan_batches(scan_golden_batch, paths, workers=workers))
+
+
 def build_oracle_labels_po_only(
     pos: List[Dict],
     *,
     price_outlier_pct_min: float,
     qty_outlier_z: float,
     known_skus: set,
+    now: Optional[datetime] = None,
 ) -> Dict[str, Dict]:
+    now = now or datetime.now()
     all_qty: List[float] = []
     for po in pos or []:
         for li in po.get("line_items", []) or []:
@@ -687,7 +610,7 @@ def build_oracle_labels_po_only(
             flags["missing_fields"] = True
 
         dt = _parse_iso_dt(str(po.get("order_date") or ""))
-        if dt is None or dt > (datetime.now() + timedelta(days=1)):
+        if dt is None or dt > (now + timedelta(days=1)):
             flags["invalid_date"] = True
 
         for li in po.get("line_items", []) or []:
@@ -760,6 +683,97 @@ def create_anomaly_labels(pos: List[Dict], oracle_labels: Dict[str, Dict]) -> Di
     return labels
 
 
+def gold_arrow_schemas() -> Dict[str, Any]:
+    import pyarrow as pa
+
+    s, f, i, b = pa.string(), pa.float64(), pa.int64(), pa.bool_()
+    flags = pa.struct([(k, b) for k in ("missing_fields", "invalid_date", "unknown_item", "price_outlier", "qty_outlier")])
+    return {
+        "pos": pa.schema([
+            ("po_id", s), ("po_number", s), ("buyer_code", s), ("supplier_code", s),
+            ("order_date", s), ("expected_ship_date", s), ("ship_to_location", s), ("bill_to_location", s),
+            ("payment_terms", s), ("currency", s),
+            ("line_items", pa.list_(pa.struct([
+                ("line_number", i), ("sku", s), ("quantity", i), ("unit_of_measure", s),
+                ("unit_price", f), ("contract_unit_price", f), ("discount_pct", f),
+            ]))),
+            ("anomaly", s), ("intended_anomaly", s),
+            ("freight_amount", f), ("discount_amount", f), ("tax_amount", f),
+        ]),
+        "labels": pa.schema([
+            ("po_id", s), ("po_number", s), ("anomaly_type", s), ("is_anomaly", b), ("intended_anomaly_type", s),
+            ("oracle_anomaly_type", s), ("oracle_is_anomaly", b), ("oracle_flags", flags), ("oracle_label_version", s),
+        ]),
+        "oracle_labels": pa.schema([
+            ("po_id", s), ("po_number", s), ("oracle_anomaly_type", s), ("oracle_is_anomaly", b),
+            ("oracle_flags", flags), ("oracle_label_version", s),
+        ]),
+    }
+
+
+def write_gold_dataset(root: Path, pos: List[Dict], labels: Dict, oracle_labels: Dict, meta: Dict[str, Any]) -> Dict[str, Any]:
+    # Label and oracle rows follow their PO into its (anomaly, order month)
+    # partition; an order_date that does not parse lands in the null month.
+    keys = {str(po.get("po_id") or ""): {"label": str(po.get("anomaly") or "NORMAL"), "order_month": order_month(po.get("order_date"))} for po in pos}
+    numbers = {str(po.get("po_id") or ""): po.get("po_number") for po in pos}
+    rows = {
+        "pos": ({**po, **keys[str(po.get("po_id") or "")]} for po in pos),
+        "labels": ({"po_id": k, "po_number": numbers.get(k), **v, **keys[k]} for k, v in labels.items()),
+        "oracle_labels": ({"po_id": k, **v, **keys[k]} for k, v in oracle_labels.items()),
+    }
+    schemas = gold_arrow_schemas()
+    tables: Dict[str, Any] = {}
+    for name in GOLD_DATASET_TABLES:
+        shutil.rmtree(root / name, ignore_errors=True)
+        sink = TableSink(root, name, schemas[name], partition_cols=PARTITION_COLUMNS)
+        for row in rows[name]:
+            sink.add(row)
+        tables[name] = sink.close()
+    manifest = {**meta, "format": "parquet-partitioned", "tables": tables}
+    (root / "manifest.json").write_text(json.dumps(manifest, indent=2, default=str), encoding="utf-8")
+    return manifest
+
+
+def write_bronze(root: Path, docs: Iterable[Tuple[str, bytes]], archive: bool, ref_dt: datetime, incremental: bool) -> Dict[str, Any]:
+    # Loose files or zip shards plus a manifest of what was written.
+    # incremental: unchanged files are left alone and files the previous
+    # manifest listed but this run did not produce are removed, as in
+    # edi_generator_full.write_bronze.
+    manifest_path = root / BRONZE_MANIFEST
+    previous: List[str] = []
+    if incremental and manifest_path.exists():
+        try:
+            previous = [r["path"] for r in json.loads(manifest_path.read_text(encoding="utf-8")).get("files", [])]
+        except Exception:
+            previous = []
+    if archive:
+        packer = ArchiveWriter(root, date_time=ref_dt, incremental=incremental)
+        for name, data in docs:
+            packer.add(name, data)
+        files = packer.close()
+        written, removed = packer.written, packer.removed
+    else:
+        files = []
+        written = removed = 0
+        for name, data in docs:
+            path = root / name
+            files.append({"path": name, "size": len(data), "sha1": hashlib.sha1(data).hexdigest()})
+            if incremental and path.exists() and path.read_bytes() == data:
+                continue
+            path.write_bytes(data)
+            written += 1
+    if incremental:
+        current = {r["path"] for r in files}
+        for rel in previous:
+            if rel not in current and (root / rel).is_file():
+                (root / rel).unlink()
+                removed += 1
+    manifest = {"layout": "zip" if archive else "flat", "envelope_time": ref_dt.isoformat(), "total_files": len(files), "files": files}
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    # run stats, kept out of the manifest so reruns produce the same file
+    return {**manifest, "written_files": written, "removed_files": removed}
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--seed", type=int, default=42)
@@ -771,6 +785,23 @@ def main():
     ap.add_argument("--label-source", choices=["intended", "oracle"], default="oracle")
     ap.add_argument("--bronze-mode", choices=["all", "sample", "none"], default="sample")
     ap.add_argument("--bronze-sample-size", type=int, default=2000)
+    ap.add_argument("--bronze-archive", action="store_true", help="pack bronze into zip shards with a document index")
+    ap.add_argument(
+        "--workers", type=int, default=1, help="processes for the golden-corpus scan and PO generation (output does not depend on it)"
+    )
+    ap.add_argument(
+        "--ref-date",
+        type=str,
+        default="",
+        help="reference date (YYYY-MM-DD) for order dates and envelopes; default today. Same seed + ref date = same bytes",
+    )
+    ap.add_argument("--incremental", action="store_true", help="leave bronze files whose content has not changed")
+    ap.add_argument(
+        "--output-format",
+        choices=["json", "parquet-partitioned"],
+        default="json",
+        help="gold as training_dataset.json, or as gold/training_dataset/ partitioned by label and order month",
+    )
     args = ap.parse_args()
 
     def _parse_quota_arg(s: str) -> Dict[str, int]:
@@ -792,13 +823,15 @@ def main():
     GOLD_DIR.mkdir(parents=True, exist_ok=True)
 
     _p("[1/4] Parsing golden samples...")
-    golden_pos = parse_golden_samples()
-    _p(f"[INFO] Golden POs: {len(golden_pos)}")
+    golden_stats = scan_golden_stats(workers=int(args.workers))
+    _p(f"[INFO] Golden POs: {golden_stats['lines'].n}")
 
     quotas = _parse_quota_arg(str(args.quotas))
     _p("[2/4] Generating quota-driven POs...")
-    gen = SyntheticDataGenerator(golden_pos=golden_pos, seed_val=int(args.seed))
-    pos = gen.generate_pos_with_quotas(quotas=quotas)
+    ref_dt = datetime.fromisoformat(args.ref_date) if args.ref_date else datetime.combine(datetime.now().date(), datetime.min.time())
+    _p(f"[INFO] reference clock: {ref_dt.isoformat()}")
+    gen = SyntheticDataGenerator(seed_val=int(args.seed), golden_stats=golden_stats, now=ref_dt)
+    pos = gen.generate_pos_with_quotas(quotas=quotas, workers=int(args.workers))
 
     _p("[3/4] Building oracle labels...")
     oracle_labels = build_oracle_labels_po_only(
@@ -806,6 +839,7 @@ def main():
         price_outlier_pct_min=float(REALISM_CFG["price_outlier_pct_min"]),
         qty_outlier_z=float(REALISM_CFG["qty_outlier_z"]),
         known_skus=set(SKUS),
+        now=ref_dt,
     )
 
     if str(args.label_source) == "oracle":
@@ -819,18 +853,31 @@ def main():
     write_csv(pd.DataFrame(pos), SILVER_DIR / "pos.csv")
 
     # Save Gold
-    training_data = {
-        "pos": pos,
-        "asns": [],
-        "invoices": [],
-        "anomaly_labels": labels,
-        "master_data": gen.master_data,
-        "oracle_labels": oracle_labels,
-        "mode": "option_a_po_only",
-        "generator_version": "po_only_v3_clean",
-    }
-    (GOLD_DIR / "training_dataset.json").write_text(json.dumps(training_data, indent=2, default=str), encoding="utf-8")
-    _p(f"[OK] Wrote: {GOLD_DIR / 'training_dataset.json'}")
+    if str(args.output_format) == "parquet-partitioned":
+        meta = {
+            "master_data": gen.master_data,
+            "mode": "option_a_po_only",
+            "generator_version": "po_only_v3_clean",
+            "seed": int(args.seed),
+            "ref_date": ref_dt.isoformat(),
+        }
+        manifest = write_gold_dataset(GOLD_DATASET_DIR, pos, labels, oracle_labels, meta)
+        _p(f"[OK] Wrote: {GOLD_DATASET_DIR} ({manifest['tables']['pos']['partitions']} partitions)")
+    else:
+        training_data = {
+            "pos": pos,
+            "asns": [],
+            "invoices": [],
+            "anomaly_labels": labels,
+            "master_data": gen.master_data,
+            "oracle_labels": oracle_labels,
+            "mode": "option_a_po_only",
+            "generator_version": "po_only_v3_clean",
+            "seed": int(args.seed),
+            "ref_date": ref_dt.isoformat(),
+        }
+        (GOLD_DIR / "training_dataset.json").write_text(json.dumps(training_data, indent=2, default=str), encoding="utf-8")
+        _p(f"[OK] Wrote: {GOLD_DIR / 'training_dataset.json'}")
 
     # Bronze (optional)
     if str(args.bronze_mode) != "none":
@@ -843,9 +890,10 @@ def main():
         else:
             subset = pos
 
-        for po in subset:
-            (BRONZE_DIR / f"PO_{po['po_number']}.850").write_text(gen.generate_x12_850(po), encoding="utf-8")
-        _p(f"[OK] Bronze wrote {len(subset)} files to: {BRONZE_DIR}")
+        docs = ((f"PO_{po['po_number']}.850", gen.generate_x12_850(po).encode("utf-8")) for po in subset)
+        bronze = write_bronze(BRONZE_DIR, docs, bool(args.bronze_archive), ref_dt, bool(args.incremental))
+        kind = "zip shards" if args.bronze_archive else "files"
+        _p(f"[OK] Bronze: {len(subset)} docs in {bronze['total_files']} {kind} ({bronze['written_files']} written, {bronze['removed_files']} removed) in: {BRONZE_DIR}")
 
     _p("[DONE]")
 
@@ -0,0 +1,22 @@
+# Gold dataset layout shared by the generators and their readers:
+# plain or hive-partitioned JSONL / Parquet tables and a filtering loader.
+# Needs pyarrow for Parquet, imported lazily, so importing gold alone stays cheap.
+from .dataset import (
+    PARTITION_COLUMNS,
+    gold_filter,
+    load_gold_table,
+    open_gold_table,
+    order_month,
+    partition_schema,
+)
+from .sink import (
+    DATASET_BATCH_ROWS,
+    DATASET_BUFFER_BYTES,
+    DATASET_MAX_OPEN_FILES,
+    DATASET_ROWS_PER_FILE,
+    DATASET_ROWS_PER_GROUP,
+    NULL_PARTITION,
+    SINK_FORMATS,
+    TableSink,
+    arrow_schema,
+)
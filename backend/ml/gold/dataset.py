@@ -0,0 +1,102 @@
+import re
+from datetime import date
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+# -----------------------------
+# Partitioned gold datasets
+#   <root>/<table>/label=<LABEL>/order_month=<YYYY-MM>/part-NNNNN.parquet
+# Hive-style: the partition values live only in the directory names, so a
+# reader filtering on label or order month never opens the other
+# partitions' files (written by gold.TableSink with
+# partition_cols=PARTITION_COLUMNS). Line items stay nested as
+# list<struct> columns. pyarrow is imported on first use.
+# -----------------------------
+PARTITION_COLUMNS = ("label", "order_month")
+
+_MONTH_RE = re.compile(r"^\d{4}-\d{2}")
+
+def order_month(order_date: Any) -> Optional[str]:
+    # "YYYY-MM" of an ISO date or datetime; None when it does not parse
+    if isinstance(order_date, date):
+        return order_date.isoformat()[:7]
+    m = _MONTH_RE.match(str(order_date or ""))
+    return m.group(0) if m else None
+
+def partition_schema(columns: Sequence[str] = PARTITION_COLUMNS) -> Any:
+    import pyarrow as pa
+
+    return pa.schema([(c, pa.string()) for c in columns])
+
+
+# -----------------------------
+# Loader
+# label and the order-month part of a date range prune whole partition
+# directories before anything is read; supplier, buyer and the exact date
+# bounds are checked against row-group statistics, then per row. Only the
+# projected columns are decoded.
+# -----------------------------
+def open_gold_table(root: Path, table: str, partition_cols: Sequence[str] = PARTITION_COLUMNS) -> Any:
+    import pyarrow.dataset as ds
+
+    return ds.dataset(
+        str(Path(root) / table),
+        format="parquet",
+        partitioning=ds.partitioning(partition_schema(partition_cols), flavor="hive"),
+    )
+
+def _iso(x: Any) -> str:
+    return x.isoformat() if isinstance(x, date) else str(x)
+
+def gold_filter(
+    dataset: Any,
+    labels: Optional[Iterable[str]] = None,
+    suppliers: Optional[Iterable[str]] = None,
+    buyers: Optional[Iterable[str]] = None,
+    date_from: Any = None,
+    date_to: Any = None,
+) -> Any:
+    # None when nothing is filtered. The date range is [date_from, date_to)
+    # on the PO order date; tables without an order_date column are cut at
+    # order-month granularity. Rows whose order date did not parse are
+    # dropped by any date bound.
+    import pyarrow.dataset as ds
+
+    names = set(dataset.schema.names)
+    terms = []
+    if labels is not None:
+        terms.append(ds.field("label").isin(list(labels)))
+    for col, values in (("supplier_code", suppliers), ("buyer_code", buyers)):
+        if values is None:
+            continue
+        if col not in names:
+            raise ValueError(f"table has no {col} column to filter on")
+        terms.append(ds.field(col).isin(list(values)))
+    if date_from is not None:
+        terms.append(ds.field("order_month") >= order_month(_iso(date_from)))
+        if "order_date" in names:
+            terms.append(ds.field("order_date") >= _iso(date_from))
+    if date_to is not None:
+        terms.append(ds.field("order_month") <= order_month(_iso(date_to)))
+        if "order_date" in names:
+            terms.append(ds.field("order_date") < _iso(date_to))
+    expr = None
+    for t in terms:
+        expr = t if expr is None else expr & t
+    return expr
+
+def load_gold_table(
+    root: Path,
+    table: str,
+    columns: Optional[Iterable[str]] = None,
+    labels: Optional[Iterable[str]] = None,
+    suppliers: Optional[Iterable[str]] = None,
+    buyers: Optional[Iterable[str]] = None,
+    date_from: Any = None,
+    date_to: Any = None,
+) -> Any:
+    # One table of a partitioned gold dataset as a pyarrow Table
+    # (.to_pandas() / .to_pylist() for the usual shapes).
+    dataset = open_gold_table(root, table)
+    expr = gold_filter(dataset, labels=labels, suppliers=suppliers, buyers=buyers, date_from=date_from, date_to=date_to)
+    return dataset.to_table(columns=list(columns) if columns is not None else None, filter=expr)
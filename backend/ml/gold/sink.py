@@ -0,0 +1,184 @@
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+# -----------------------------
+# Table sink
+#   <out_dir>/<name>/part-NNNNN.<fmt>                       (no partition columns)
+#   <out_dir>/<name>/<col>=<value>/.../part-NNNNN.<fmt>     (hive-partitioned)
+# Shared by the generators' gold output and the silver converter. Partition
+# values live only in the directory names, so they are dropped from the
+# rows themselves. fmt is "parquet" (pyarrow, imported on first use) or
+# "jsonl".
+# -----------------------------
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+DATASET_BATCH_ROWS = 50000
+DATASET_ROWS_PER_GROUP = 65536
+DATASET_ROWS_PER_FILE = 1000000
+DATASET_BUFFER_BYTES = 64 << 20
+DATASET_MAX_OPEN_FILES = 256
+SINK_FORMATS = ("parquet", "jsonl")
+
+PartitionKey = Tuple[Optional[str], ...]
+
+
+def arrow_schema(schema: Any) -> Any:
+    # a pyarrow schema, or column -> type alias ("string", "float64", ...)
+    import pyarrow as pa
+
+    if isinstance(schema, dict):
+        return pa.schema([(c, pa.type_for_alias(t)) for c, t in schema.items()])
+    return schema
+
+
+class TableSink:
+    # Rows are buffered as dicts and split by partition key every batch_rows.
+    # A partition writes (one parquet row group) once it holds rows_per_group
+    # rows; when the buffered partitions together pass buffer_bytes the
+    # largest is written early. Part files roll every rows_per_file rows, and
+    # at most max_open_files stay open (least recently used closed first; the
+    # partition then continues in a new part file).
+    def __init__(
+        self,
+        out_dir: Path,
+        name: str,
+        schema: Any = None,
+        fmt: str = "parquet",
+        partition_cols: Sequence[str] = (),
+        batch_rows: int = DATASET_BATCH_ROWS,
+        rows_per_group: int = DATASET_ROWS_PER_GROUP,
+        rows_per_file: int = DATASET_ROWS_PER_FILE,
+        buffer_bytes: int = DATASET_BUFFER_BYTES,
+        max_open_files: int = DATASET_MAX_OPEN_FILES,
+        compression: str = "snappy",
+    ):
+        if fmt not in SINK_FORMATS:
+            raise ValueError(f"unknown sink format: {fmt}")
+        self.dir = out_dir / name
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.fmt = fmt
+        self.partition_cols = tuple(partition_cols)
+        self.pa: Any = None
+        self.file_schema: Any = None
+        if fmt == "parquet":
+            import pyarrow as pa
+
+            self.pa = pa
+            schema = arrow_schema(schema)
+            self.file_schema = pa.schema([f for f in schema if f.name not in self.partition_cols])
+        self.batch_rows = int(batch_rows)
+        self.rows_per_group = int(rows_per_group)
+        self.rows_per_file = int(rows_per_file)
+        self.buffer_bytes = int(buffer_bytes)
+        self.max_open_files = max(1, int(max_open_files))
+        self.compression = compression
+        self.buf: List[Dict[str, Any]] = []
+        self.pending: Dict[PartitionKey, List[Any]] = {}
+        self.pending_rows: Dict[PartitionKey, int] = {}
+        self.pending_bytes = 0
+        self.writers: "OrderedDict[PartitionKey, Any]" = OrderedDict()
+        self.file_rows: Dict[PartitionKey, int] = {}
+        self.n_files: Dict[PartitionKey, int] = {}
+        self.files: List[str] = []
+        self.total_rows = 0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.buf.append(row)
+        if len(self.buf) >= self.batch_rows:
+            self.flush()
+
+    def _partition_dir(self, key: PartitionKey) -> Path:
+        d = self.dir
+        for col, v in zip(self.partition_cols, key):
+            d = d / f"{col}={NULL_PARTITION if v is None else quote(str(v), safe='')}"
+        return d
+
+    def _encode(self, rows: List[Dict[str, Any]]) -> Any:
+        # rows -> an Arrow table, or a list of JSON lines
+        if self.fmt == "parquet":
+            return self.pa.Table.from_pylist(rows, schema=self.file_schema)
+        if self.partition_cols:
+            rows = [{k: v for k, v in r.items() if k not in self.partition_cols} for r in rows]
+        return [json.dumps(r, default=str) + "\n" for r in rows]
+
+    def _nbytes(self, chunk: Any) -> int:
+        return chunk.nbytes if self.fmt == "parquet" else sum(len(s) for s in chunk)
+
+    def _open(self, key: PartitionKey) -> Any:
+        if len(self.writers) >= self.max_open_files:
+            self.writers.popitem(last=False)[1].close()
+        d = self._partition_dir(key)
+        d.mkdir(parents=True, exist_ok=True)
+        n = self.n_files.get(key, 0)
+        path = d / f"part-{n:05d}.{self.fmt}"
+        self.n_files[key] = n + 1
+        self.file_rows[key] = 0
+        self.files.append(path.relative_to(self.dir.parent).as_posix())
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            w = pq.ParquetWriter(str(path), self.file_schema, compression=self.compression)
+        else:
+            w = path.open("w", encoding="utf-8")
+        self.writers[key] = w
+        return w
+
+    def _write(self, key: PartitionKey) -> None:
+        parts = self.pending.pop(key)
+        n = self.pending_rows.pop(key)
+        self.pending_bytes -= sum(self._nbytes(p) for p in parts)
+        if self.fmt == "parquet":
+            chunk = self.pa.concat_tables(parts)
+        else:
+            chunk = [s for p in parts for s in p]
+        start = 0
+        while start < n:
+            w = self.writers.get(key)
+            if w is None:
+                w = self._open(key)
+            self.writers.move_to_end(key)
+            take = min(n - start, self.rows_per_file - self.file_rows[key])
+            if self.fmt == "parquet":
+                w.write_table(chunk.slice(start, take), row_group_size=self.rows_per_group)
+            else:
+                w.writelines(chunk[start:start + take])
+            start += take
+            self.file_rows[key] += take
+            if self.file_rows[key] >= self.rows_per_file:
+                self.writers.pop(key).close()
+
+    def flush(self) -> None:
+        if not self.buf:
+            return
+        rows, self.buf = self.buf, []
+        self.total_rows += len(rows)
+        groups: Dict[PartitionKey, List[Dict[str, Any]]] = {}
+        if self.partition_cols:
+            cols = self.partition_cols
+            for r in rows:
+                groups.setdefault(tuple(r.get(c) for c in cols), []).append(r)
+        else:
+            groups[()] = rows
+        for key, group in groups.items():
+            chunk = self._encode(group)
+            self.pending.setdefault(key, []).append(chunk)
+            self.pending_rows[key] = self.pending_rows.get(key, 0) + len(group)
+            self.pending_bytes += self._nbytes(chunk)
+        for key in [k for k, n in self.pending_rows.items() if n >= self.rows_per_group]:
+            self._write(key)
+        while self.pending_bytes > self.buffer_bytes and self.pending:
+            self._write(max(self.pending_rows, key=self.pending_rows.__getitem__))
+
+    def close(self) -> Dict[str, Any]:
+        self.flush()
+        for key in list(self.pending):
+            self._write(key)
+        while self.writers:
+            self.writers.popitem()[1].close()
+        out: Dict[str, Any] = {"rows": self.total_rows, "files": self.files}
+        if self.partition_cols:
+            out["partitions"] = len(self.n_files)
+        return out
@@ -0,0 +1,35 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# backend/ml for the x12 / gold / triplets packages, data_gen for the scripts
+ML_DIR = Path(__file__).resolve().parents[1]
+for p in (ML_DIR, ML_DIR / "data_gen"):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+REF_DATE = datetime(2026, 6, 1)
+SEED = 3
+
+
+@pytest.fixture(scope="session")
+def edi():
+    import edi_generator_full
+
+    return edi_generator_full
+
+@pytest.fixture(scope="session")
+def master(edi):
+    return edi.build_master(edi.Dist(), seed=SEED, today=REF_DATE.date())
+
+@pytest.fixture
+def gen(edi, master):
+    # fresh per test: the constructor reseeds random / np.random
+    return edi.OptionBGenerator(dist=edi.Dist(), master=master, seed=SEED, now=REF_DATE)
+
+@pytest.fixture
+def triplets(gen):
+    ds = gen.make_triplets(20)
+    return list(ds.po_dicts()), list(ds.asn_dicts()), list(ds.invoice_dicts())
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+import pytest
+
+from x12 import ARCHIVE_INDEX, ArchiveWriter, BronzeArchive, X12Parser, pack_shard, render_810, render_850, render_856
+
+STAMP = datetime(2026, 6, 1)
+
+
+@pytest.fixture
+def members(triplets):
+    pos, asns, invs = triplets
+    out = []
+    for po, a, v in zip(pos, asns, invs):
+        out.append((f"{po['po_number']}.850", render_850(po, STAMP).encode(), "850", po["po_number"]))
+        out.append((f"{a['asn_number']}.856", render_856(a, STAMP).encode(), "856", a["asn_number"]))
+        out.append((f"{v['invoice_number']}.810", render_810(v, STAMP).encode(), "810", v["invoice_number"]))
+    return out
+
+def _pack(root, members, **kw):
+    w = ArchiveWriter(root, shard_members=8, date_time=STAMP, **kw)
+    for name, data, _, _ in members:
+        w.add(name, data)
+    return w, w.close()
+
+
+def test_index_finds_every_document(tmp_path, members):
+    _, shards = _pack(tmp_path, members)
+    assert len(shards) == -(-len(members) // 8)
+    assert (tmp_path / ARCHIVE_INDEX).exists()
+    p = X12Parser()
+    with BronzeArchive(tmp_path) as arc:
+        assert len(arc) == len(members)
+        assert [m for _, m in arc.members()] == [name for name, _, _, _ in members]
+        for name, data, tx, number in members:
+            loc = arc.locate(number, tx)
+            assert loc["member"] == name
+            text = arc.get(number, tx)
+            assert text.startswith("ST")
+            assert text in data.decode()
+            assert p.extract(arc.segments(number, tx)) == p.extract(p.parse_text(data.decode()))
+        assert arc.locate("NO-SUCH-DOC") is None
+        assert arc.get("NO-SUCH-DOC") is None
+
+def test_shards_are_reproducible(tmp_path, members):
+    _pack(tmp_path / "a", members)
+    _pack(tmp_path / "b", members)
+    names = sorted(p.name for p in (tmp_path / "a").glob("*.zip"))
+    assert names == sorted(p.name for p in (tmp_path / "b").glob("*.zip"))
+    for n in names:
+        assert (tmp_path / "a" / n).read_bytes() == (tmp_path / "b" / n).read_bytes()
+
+def test_incremental_rewrites_only_changed_shards(tmp_path, members):
+    _pack(tmp_path, members, incremental=True)
+    w, _ = _pack(tmp_path, members, incremental=True)
+    assert w.written == 0
+
+    # a changed member in the last shard; the earlier shards stay as they are
+    changed = members[:-1] + [(members[-1][0], members[-1][1] + b"\n", *members[-1][2:])]
+    w, _ = _pack(tmp_path, changed, incremental=True)
+    assert w.written == 1
+
+    # a smaller run removes the shards it no longer produces
+    w, shards = _pack(tmp_path, members[:8], incremental=True)
+    assert w.written == 0
+    assert w.removed == len(changed) // 8
+    assert sorted(p.name for p in tmp_path.glob("*.zip")) == [s["path"] for s in shards]
+    with BronzeArchive(tmp_path) as arc:
+        assert len(arc) == 8
+
+def test_shards_packed_apart_match_the_serial_writer(tmp_path, members):
+    # what the full generator's bronze workers do: pack_shard per chunk, then
+    # one ArchiveWriter joins the shards and writes the index
+    _, serial = _pack(tmp_path / "a", members)
+    w = ArchiveWriter(tmp_path / "b", date_time=STAMP)
+    for k in range(0, len(members), 8):
+        chunk = [(name, data) for name, data, _, _ in members[k:k + 8]]
+        w.add_shard(*pack_shard(tmp_path / "b", k // 8, chunk, date_time=STAMP))
+    assert w.close() == serial
+    for s in serial:
+        assert (tmp_path / "a" / s["path"]).read_bytes() == (tmp_path / "b" / s["path"]).read_bytes()
+    with BronzeArchive(tmp_path / "a") as a, BronzeArchive(tmp_path / "b") as b:
+        assert list(a.members()) == list(b.members())
+        assert [a.locate(n, tx) for _, _, tx, n in members] == [b.locate(n, tx) for _, _, tx, n in members]
+    with pytest.raises(ValueError):
+        w.add_shard(*pack_shard(tmp_path / "b", 0, chunk, date_time=STAMP))
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+import pytest
+
+from gold import open_gold_table
+from x12 import X12Parser, render_810, render_850, render_856
+
+pytest.importorskip("pyarrow.dataset")
+
+STAMP = datetime(2026, 6, 1)
+
+
+@pytest.fixture
+def bronze(tmp_path, triplets):
+    pos, asns, invs = triplets
+    d = tmp_path / "bronze"
+    d.mkdir()
+    for po, a, v in zip(pos, asns, invs):
+        (d / f"{po['po_number']}.850").write_text(render_850(po, STAMP))
+        (d / f"{a['asn_number']}.856").write_text(render_856(a, STAMP))
+        (d / f"{v['invoice_number']}.810").write_text(render_810(v, STAMP))
+    return d
+
+@pytest.fixture
+def silver():
+    import bronze_to_silver_full
+
+    return bronze_to_silver_full
+
+def _table(silver, root, name):
+    return open_gold_table(root, name, partition_cols=silver.SILVER_PARTITION_COLUMNS).to_table().to_pylist()
+
+
+def test_convert_partitions_by_document_month(tmp_path, bronze, triplets, silver):
+    pos, asns, invs = triplets
+    out = tmp_path / "silver"
+    counts = silver.convert(bronze, out, batch_rows=16)
+    assert counts["files"] == counts["transactions"] == 3 * len(pos)
+    assert counts["failed_files"] == 0
+    assert counts["po_lines"] == sum(len(p["line_items"]) for p in pos)
+
+    headers = {r["po_number"]: r for r in _table(silver, out, "po_headers")}
+    assert set(headers) == {p["po_number"] for p in pos}
+    for p in pos:
+        assert headers[p["po_number"]]["doc_month"] == p["order_date"][:7]
+    for name, docs, date_key in (("asn_lines", asns, "ship_date"), ("invoice_headers", invs, "invoice_date")):
+        months = {d["po_number"]: d[date_key][:7] for d in docs}
+        for r in _table(silver, out, name):
+            assert r["doc_month"] == months[r["po_number"]]
+
+def test_failed_file_keeps_complete_transaction_sets(tmp_path, bronze, triplets, silver, monkeypatch):
+    pos = triplets[0]
+    # two interchanges in one file; it fails inside the second, after the
+    # first PO's transaction set is complete
+    bad = bronze / "batch.850"
+    bad.write_text(render_850(pos[0], STAMP) + render_850(pos[1], STAMP))
+    first = sum(1 for _ in X12Parser().iter_file(bronze / f"{pos[0]['po_number']}.850"))
+    iter_file = X12Parser.iter_file
+
+    def flaky(self, path, *args, **kw):
+        for k, seg in enumerate(iter_file(self, path, *args, **kw)):
+            if path == bad and k == first + 4:
+                raise ValueError("truncated interchange")
+            yield seg
+
+    monkeypatch.setattr(X12Parser, "iter_file", flaky)
+    out = tmp_path / "silver"
+    counts = silver.convert(bronze, out)
+    assert counts["failed_files"] == 1
+    assert counts["transactions"] == 3 * len(pos) + 1
+    batch = [r for r in _table(silver, out, "po_headers") if r["source_file"] == "batch.850"]
+    assert counts["po_headers"] == len(pos) + 1
+    assert [r["po_number"] for r in batch] == [pos[0]["po_number"]]
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from triplets import DictView, DocTable, TripletDataset
+
+QUOTAS = {"NORMAL": 60, "LATE_SHIPMENT": 10, "SHORT_SHIP": 10, "OVERBILL": 10, "MISSING_DOC": 10, "DUPLICATE_DOC": 10}
+
+
+@pytest.fixture
+def labeled(gen):
+    ds, _ = gen.make_labeled_triplets(QUOTAS, rng=np.random.default_rng(11))
+    return ds
+
+def _dicts(ds):
+    return list(ds.po_dicts()), list(ds.asn_dicts()), list(ds.invoice_dicts())
+
+
+def test_from_dicts_round_trip(labeled):
+    pos, asns, invs = _dicts(labeled)
+    # the labeled set has missing and duplicated ASNs / invoices
+    assert len(asns) != len(pos) or len(invs) != len(pos)
+    back = TripletDataset.from_dicts(pos, asns, invs)
+    assert back.run_tag == labeled.run_tag
+    assert _dicts(back) == (pos, asns, invs)
+    assert list(back.link_dicts()) == list(labeled.link_dicts())
+
+def test_per_document_dicts_round_trip(edi, gen):
+    pos, asns, invs = [], [], []
+    for i, label in enumerate(["NORMAL"] * 8 + ["MISSING_DOC"] * 4 + ["OVERBILL"] * 4):
+        po, asn, inv, _ = edi.make_labeled_triplet(gen, i, label)
+        pos.append(po)
+        asns += [asn] if asn else []
+        invs += [inv] if inv else []
+    ds = TripletDataset.from_dicts(pos, asns, invs)
+    assert _dicts(ds) == (pos, asns, invs)
+
+def test_from_dicts_rejects_mixed_runs(labeled):
+    pos, asns, invs = _dicts(labeled)
+    pos[0] = dict(pos[0], po_number="PO-1-0")
+    with pytest.raises(ValueError):
+        TripletDataset.from_dicts(pos, [], [])
+
+def test_dict_view_indexing(labeled, monkeypatch):
+    monkeypatch.setattr(DictView, "CHUNK", 7)
+    view = labeled.po_dicts()
+    full = list(view)
+    assert len(full) == len(view) == len(labeled.pos)
+    assert view[0] == full[0]
+    assert view[-1] == full[-1]
+    assert view[5:23] == full[5:23]
+    assert view[3:40:4] == full[3:40:4]
+    assert view[40:3] == []
+    with pytest.raises(IndexError):
+        view[len(full)]
+
+def test_dict_view_reversed_and_strided_slices(labeled):
+    view = labeled.po_dicts()
+    full = list(view)
+    for k in (slice(None, None, -1), slice(40, 3, -1), slice(-2, None, -3), slice(30, 5, -7), slice(3, 40, -1), slice(-1, -2, -1)):
+        assert view[k] == full[k], k
+
+def test_take_and_concat(labeled):
+    pos = labeled.pos
+    rows = np.arange(len(pos))
+    halves = [pos.take(rows[: len(pos) // 2]), pos.take(rows[len(pos) // 2:])]
+    merged = DocTable.concat(halves)
+    np.testing.assert_array_equal(merged.offsets, pos.offsets)
+    for k in pos.lines:
+        np.testing.assert_array_equal(merged.lines[k], pos.lines[k])
+    picked = pos.take(np.array([5, 2, 5]))
+    np.testing.assert_array_equal(picked.n_lines, pos.n_lines[[5, 2, 5]])
+    a, b = pos.offsets[5], pos.offsets[6]
+    np.testing.assert_array_equal(picked.lines["sku"][: b - a], pos.lines["sku"][a:b])
+
+def test_dataset_concat_shifts_po_rows(gen):
+    a = gen.make_triplets(12, start_index=0, rng=np.random.default_rng(1))
+    b = gen.make_triplets(9, start_index=12, rng=np.random.default_rng(2))
+    ds = TripletDataset.concat([a, b])
+    assert _dicts(ds) == tuple(x + y for x, y in zip(_dicts(a), _dicts(b)))
+    assert list(ds.link_dicts()) == list(a.link_dicts()) + list(b.link_dicts())
@@ -0,0 +1,82 @@
+from datetime import date, datetime
+
+import pytest
+
+from gold import PARTITION_COLUMNS, TableSink, gold_filter, load_gold_table, open_gold_table, order_month
+
+pytest.importorskip("pyarrow.dataset")
+
+LABELS = ["NORMAL", "OVERBILL", "LATE_SHIPMENT"]
+SUPPLIERS = ["ACME_PARTS", "WIDGET_CO"]
+
+
+@pytest.fixture(scope="module")
+def gold_root(tmp_path_factory):
+    root = tmp_path_factory.mktemp("gold")
+    rows = []
+    for i in range(600):
+        d = date(2026, 1 + i % 5, 1 + i % 28)
+        rows.append({
+            "po_number": f"PO-1-{i}",
+            "supplier_code": SUPPLIERS[i % 2],
+            "buyer_code": f"BUYER_{i % 3}",
+            "order_date": f"{d.isoformat()}T08:00:00",
+            "label": LABELS[i % 3],
+            "order_month": order_month(d),
+        })
+    schema = {k: "string" for k in rows[0]}
+    pos = TableSink(root, "pos", schema, partition_cols=PARTITION_COLUMNS, rows_per_group=16)
+    # a table without order_date is cut at month granularity
+    links = TableSink(root, "links", {"po_number": "string", "label": "string", "order_month": "string"}, partition_cols=PARTITION_COLUMNS)
+    for r in rows:
+        pos.add(r)
+        links.add({"po_number": r["po_number"], "label": r["label"], "order_month": r["order_month"]})
+    pos.close()
+    links.close()
+    return root, rows
+
+def _numbers(table):
+    return sorted(table.column("po_number").to_pylist())
+
+
+def test_order_month():
+    assert order_month("2026-03-09T10:00:00") == "2026-03"
+    assert order_month(date(2026, 3, 9)) == "2026-03"
+    assert order_month(datetime(2026, 3, 9, 10)) == "2026-03"
+    assert order_month("") is None
+    assert order_month(None) is None
+
+def test_load_without_filters(gold_root):
+    root, rows = gold_root
+    t = load_gold_table(root, "pos")
+    assert t.num_rows == len(rows)
+    assert set(PARTITION_COLUMNS) <= set(t.schema.names)
+    assert gold_filter(open_gold_table(root, "pos")) is None
+
+def test_filters_match_row_predicate(gold_root):
+    root, rows = gold_root
+    t = load_gold_table(
+        root, "pos", columns=["po_number", "label"], labels=["OVERBILL"], suppliers=["WIDGET_CO"],
+        date_from="2026-02-10", date_to=date(2026, 4, 5),
+    )
+    assert t.schema.names == ["po_number", "label"]
+    want = [
+        r["po_number"] for r in rows
+        if r["label"] == "OVERBILL" and r["supplier_code"] == "WIDGET_CO" and "2026-02-10" <= r["order_date"] < "2026-04-05"
+    ]
+    assert want
+    assert _numbers(t) == sorted(want)
+
+def test_filter_prunes_partitions(gold_root):
+    root, _ = gold_root
+    ds = open_gold_table(root, "pos")
+    expr = gold_filter(ds, labels=["NORMAL"], date_from="2026-03-01", date_to="2026-04-01")
+    dirs = {f.path.split("/pos/")[1].rsplit("/", 1)[0] for f in ds.get_fragments(filter=expr)}
+    assert dirs == {"label=NORMAL/order_month=2026-03", "label=NORMAL/order_month=2026-04"}
+
+def test_month_granularity_without_order_date(gold_root):
+    root, rows = gold_root
+    t = load_gold_table(root, "links", date_from="2026-02-15", date_to="2026-03-15")
+    assert _numbers(t) == sorted(r["po_number"] for r in rows if r["order_month"] in ("2026-02", "2026-03"))
+    with pytest.raises(ValueError):
+        load_gold_table(root, "links", suppliers=["ACME_PARTS"])
@@ -0,0 +1,118 @@
+import os
+import pickle
+import sqlite3
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from x12 import ParseCache, X12Parser, decode_record, encode_record, extract_file_cached, render_810, render_850, render_856
+
+STAMP = datetime(2026, 6, 1)
+
+
+@pytest.fixture
+def corpus(tmp_path, triplets):
+    pos, asns, invs = triplets
+    d = tmp_path / "golden"
+    d.mkdir()
+    paths = []
+    for k, (po, a, v) in enumerate(zip(pos, asns, invs)):
+        for ext, text in (("850", render_850(po, STAMP)), ("856", render_856(a, STAMP)), ("810", render_810(v, STAMP))):
+            p = d / f"doc{k:03d}.{ext}"
+            p.write_text(text)
+            paths.append(p)
+    return paths
+
+
+def _scan(paths, cache):
+    parser = X12Parser()
+    return [extract_file_cached(p, parser, cache) for p in paths]
+
+
+def test_cached_matches_uncached(tmp_path, corpus):
+    plain = _scan(corpus, None)
+    cache = ParseCache(tmp_path / "cache.sqlite")
+    assert _scan(corpus, cache) == plain
+    assert (cache.hits, cache.misses) == (0, len(corpus))
+    cache.flush()
+    cache.close()
+
+    cache = ParseCache(tmp_path / "cache.sqlite")
+    cache.prefetch([str(p) for p in corpus])
+    assert _scan(corpus, cache) == plain
+    assert (cache.hits, cache.misses) == (len(corpus), 0)
+    cache.close()
+
+def test_unchanged_file_is_not_read_on_hit(tmp_path, corpus, monkeypatch):
+    cache = ParseCache(tmp_path / "cache.sqlite")
+    plain = _scan(corpus, cache)
+    cache.flush()
+
+    def no_read(self):
+        raise AssertionError(f"read {self}")
+
+    monkeypatch.setattr(Path, "read_bytes", no_read)
+    assert _scan(corpus, cache) == plain
+    cache.close()
+
+def test_changed_file_is_parsed_again(tmp_path, corpus, triplets):
+    cache = ParseCache(tmp_path / "cache.sqlite")
+    _scan(corpus, cache)
+    cache.flush()
+    cache.hits = cache.misses = 0
+
+    target = corpus[0]
+    st = os.stat(target)
+    # another stamp: bytes no file in the corpus has, so no entry to reuse
+    target.write_text(render_850(triplets[0][1], datetime(2026, 6, 2)))
+    os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    tx, rec = extract_file_cached(target, X12Parser(), cache)
+    assert tx == "850"
+    assert rec["po_number"] == triplets[0][1]["po_number"]
+    assert (cache.hits, cache.misses) == (0, 1)
+    cache.close()
+
+def test_readonly_without_file(tmp_path, corpus):
+    cache = ParseCache(tmp_path / "missing.sqlite", readonly=True)
+    assert _scan(corpus[:3], cache) == _scan(corpus[:3], None)
+    assert not (tmp_path / "missing.sqlite").exists()
+
+def test_prune_drops_least_recently_used(tmp_path, corpus):
+    cache = ParseCache(tmp_path / "cache.sqlite")
+    _scan(corpus[:3], cache)
+    cache.flush()
+    _scan(corpus[3:], cache)
+    cache.flush()
+    total = cache.size_bytes()
+    cache.max_bytes = total // 2
+    dropped = cache.prune()
+    assert dropped > 0
+    assert cache.size_bytes() <= cache.max_bytes
+    cache.hits = cache.misses = 0
+    _scan(corpus[:3], cache)
+    assert cache.misses == 3
+    cache.close()
+
+def test_record_round_trip(corpus):
+    for tx, rec in _scan(corpus, None) + [("850", None), (None, None)]:
+        assert decode_record(encode_record((tx, rec))) == (tx, rec)
+
+def test_foreign_blobs_are_misses(tmp_path, corpus):
+    cache = ParseCache(tmp_path / "cache.sqlite")
+    plain = _scan(corpus[:3], cache)
+    cache.flush()
+
+    class Boom:
+        def __reduce__(self):
+            return (os.system, ("exit 1",))
+
+    with sqlite3.connect(tmp_path / "cache.sqlite") as db:
+        db.execute("UPDATE entries SET rec = ?", (zlib.compress(pickle.dumps(Boom())),))
+    cache.close()
+    cache = ParseCache(tmp_path / "cache.sqlite")
+    assert _scan(corpus[:3], cache) == plain
+    assert (cache.hits, cache.misses) == (0, 3)
+    assert decode_record(zlib.compress(b'{"v": 0, "tx": "850", "doc": null}')) is None
+    cache.close()
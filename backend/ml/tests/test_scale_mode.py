@@ -0,0 +1,73 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+QUOTAS = {"NORMAL": 400, "LATE_SHIPMENT": 50, "MISSING_DOC": 50, "DUPLICATE_DOC": 40}
+
+
+@pytest.fixture
+def quiet(edi, monkeypatch):
+    monkeypatch.setattr(edi, "_p", lambda msg: None)
+    return edi
+
+def _po_index(po_number: str) -> int:
+    return int(po_number.rsplit("-", 1)[1])
+
+
+def test_chunks_hold_every_po_once_with_its_documents(quiet, gen):
+    chunks = list(quiet.iter_scale_chunks(gen, QUOTAS, chunk_rows=64))
+    seen = []
+    for pos, asns, invs, labels, links in chunks:
+        assert len(pos) <= 64
+        numbers = {p["po_number"] for p in pos}
+        assert set(labels) == numbers
+        assert [lk["po_number"] for lk in links] == [p["po_number"] for p in pos]
+        # a PO's documents, duplicates included, never straddle chunks
+        assert {a["po_number"] for a in asns} <= numbers
+        assert {v["po_number"] for v in invs} <= numbers
+        seen += [p["po_number"] for p in pos]
+    assert sorted(map(_po_index, seen)) == list(range(sum(QUOTAS.values())))
+
+def test_duplicate_pass(quiet, gen):
+    chunks = list(quiet.iter_scale_chunks(gen, QUOTAS, chunk_rows=64))
+    labels = {k: v for c in chunks for k, v in c[3].items()}
+    asns = [a for c in chunks for a in c[1]]
+    invs = [v for c in chunks for v in c[2]]
+    links = [lk for c in chunks for lk in c[4]]
+    n_normal = QUOTAS["NORMAL"]
+    sources = [k for k, v in labels.items() if _po_index(k) < n_normal and v["label"] == "DUPLICATE_DOC"]
+    assert 0 < len(sources) <= QUOTAS["DUPLICATE_DOC"]
+    counts = Counter(v["label"] for v in labels.values())
+    assert counts["DUPLICATE_DOC"] == QUOTAS["DUPLICATE_DOC"] + len(sources)
+    for k in sources:
+        assert "DUPLICATE_DOCUMENT_PATTERN" in labels[k]["reason_codes"]
+    dup_docs = [a for a in asns if "-D" in a["asn_number"]] + [v for v in invs if "-D" in v["invoice_number"]]
+    assert {d["po_number"] for d in dup_docs} <= set(sources)
+    # links list the original documents only
+    linked = {n for lk in links for n in lk["asn_numbers"] + lk["invoice_numbers"]}
+    assert not any("-D" in n for n in linked)
+
+def test_reservoir_draw_is_uniform(quiet, gen):
+    # one duplicate draw per run: the source's rank among the clean NORMAL
+    # triplets should be uniform, like random.choice(normal_pool)
+    n_normal, runs = 10, 400
+    ranks = []
+    for k in range(runs):
+        random.seed(k)
+        clean, source = [], None
+        for _, _, _, labels, links in quiet.iter_scale_chunks(gen, {"NORMAL": n_normal, "DUPLICATE_DOC": 1}):
+            for lk in links:
+                ix = _po_index(lk["po_number"])
+                if ix < n_normal and lk["asn_numbers"] and lk["invoice_numbers"]:
+                    clean.append(ix)
+                if ix < n_normal and labels[lk["po_number"]]["label"] == "DUPLICATE_DOC":
+                    source = ix
+        clean.sort()
+        ranks.append((clean.index(source) + 0.5) / len(clean))
+    ranks = np.array(ranks)
+    # mean of U(0, 1) over 400 draws: sd ~0.0144
+    assert ranks.mean() == pytest.approx(0.5, abs=0.06)
+    assert (ranks < 0.5).mean() == pytest.approx(0.5, abs=0.1)
+    assert ranks.min() < 0.1 and ranks.max() > 0.9
@@ -0,0 +1,56 @@
+import json
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from triplets import LABELS_OPTION_B, generate_labeled_dataset, iter_labeled_shards, plan_label_shards, quota_labels
+
+QUOTAS = {"NORMAL": 900, "THREE_WAY_QTY_MISMATCH": 150, "OVERBILL": 150, "MISSING_DOC": 100, "DUPLICATE_DOC": 80}
+
+
+def _dump(ds, lab) -> str:
+    return json.dumps([
+        list(ds.po_dicts()),
+        list(ds.asn_dicts()),
+        list(ds.invoice_dicts()),
+        lab.label_dicts(ds),
+        list(ds.link_dicts()),
+    ])
+
+
+@pytest.mark.parametrize("shard_rows", [1, 256, 5000])
+def test_plan_covers_quotas(shard_rows):
+    jobs = plan_label_shards(QUOTAS, shard_rows)
+    assert [j["shard"] for j in jobs] == list(range(len(jobs)))
+    assert [j["start_index"] for j in jobs] == list(range(0, sum(QUOTAS.values()), shard_rows))
+    np.testing.assert_array_equal(np.concatenate([j["label"] for j in jobs]), quota_labels(QUOTAS))
+    assert sum(j["n_dup"] for j in jobs) == QUOTAS["DUPLICATE_DOC"]
+    assert all(j["n_dup"] >= 0 for j in jobs)
+    # shards without NORMAL rows get no duplicates
+    assert all(j["n_dup"] == 0 for j in jobs if not (j["label"] == 0).any())
+
+def test_workers_give_the_same_dataset(gen):
+    one = _dump(*generate_labeled_dataset(gen, QUOTAS, seed=3, workers=1, shard_rows=256))
+    two = _dump(*generate_labeled_dataset(gen, QUOTAS, seed=3, workers=2, shard_rows=256))
+    assert one == two
+    assert one != _dump(*generate_labeled_dataset(gen, QUOTAS, seed=4, workers=1, shard_rows=256))
+
+def test_shards_stream_in_order(gen):
+    whole = generate_labeled_dataset(gen, QUOTAS, seed=3, shard_rows=256)
+    parts = list(iter_labeled_shards(gen, QUOTAS, seed=3, workers=2, shard_rows=256))
+    assert len(parts) == len(plan_label_shards(QUOTAS, 256))
+    assert [x for ds, _ in parts for x in ds.po_numbers()] == whole[0].po_numbers()
+
+def test_sharded_dataset_is_complete(gen):
+    ds, lab = generate_labeled_dataset(gen, QUOTAS, seed=3, workers=2, shard_rows=256)
+    assert len(ds.pos) == sum(QUOTAS.values())
+    assert ds.po_numbers() == [f"PO-{ds.run_tag}-{i}" for i in range(len(ds.pos))]
+    ids = [p["po_id"] for p in ds.po_dicts()] + [a["asn_id"] for a in ds.asn_dicts()] + [v["invoice_id"] for v in ds.invoice_dicts()]
+    assert len(set(ids)) == len(ids)
+    counts = Counter(LABELS_OPTION_B[k] for k in lab.label.tolist())
+    # DUPLICATE_DOC sources are NORMAL rows relabeled by the duplicate pass
+    assert counts["DUPLICATE_DOC"] > QUOTAS["DUPLICATE_DOC"]
+    assert counts["NORMAL"] + counts["DUPLICATE_DOC"] == QUOTAS["NORMAL"] + QUOTAS["DUPLICATE_DOC"]
+    dups = [a for a in ds.asn_dicts() if "-D" in a["asn_number"]] + [v for v in ds.invoice_dicts() if "-D" in v["invoice_number"]]
+    assert dups
@@ -0,0 +1,68 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from x12 import RunningStat, golden_scan_paths, scan_batches
+
+
+def _stat(xs) -> RunningStat:
+    s = RunningStat()
+    for x in xs:
+        s.add(float(x))
+    return s
+
+def _batch_stat(batch: List[str], scale: float) -> RunningStat:
+    # module level so the process pool can pickle it
+    return _stat(float(p) * scale for p in batch)
+
+
+def test_single_pass_matches_numpy():
+    xs = np.random.default_rng(0).lognormal(3.0, 1.2, 5000)
+    s = _stat(xs)
+    assert s.n == len(xs)
+    assert s.mean == pytest.approx(xs.mean(), rel=1e-12)
+    assert s.std == pytest.approx(xs.std(), rel=1e-9)
+
+@pytest.mark.parametrize("cuts", [[0, 5000], [0, 1, 5000], [0, 17, 2500, 2501, 4999, 5000]])
+def test_merge_matches_single_pass(cuts):
+    xs = np.random.default_rng(1).normal(1e6, 3.0, 5000)
+    whole = _stat(xs)
+    merged = RunningStat()
+    for a, b in zip(cuts, cuts[1:]):
+        merged.merge(_stat(xs[a:b]))
+    assert merged.n == whole.n
+    assert merged.mean == pytest.approx(whole.mean, rel=1e-12)
+    assert merged.std == pytest.approx(whole.std, rel=1e-9)
+
+def test_merge_with_empty():
+    s = _stat([1.0, 2.0, 4.0])
+    assert RunningStat().merge(s).mean == pytest.approx(7.0 / 3)
+    assert s.merge(RunningStat()).n == 3
+    assert RunningStat().std == 0.0
+
+def test_golden_scan_paths_skips_scans():
+    files = ["a.850", "b.PDF", "c.x12", "d.png", "e.jpeg", "f.txt"]
+    assert golden_scan_paths(files) == ["a.850", "c.x12", "f.txt"]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_scan_batches_order_independent_of_workers(workers):
+    paths = [str(i) for i in range(150)]
+    out = scan_batches(_batch_stat, paths, workers=workers, args=(0.5,), batch=64)
+    assert [s.n for s in out] == [64, 64, 22]
+    total = RunningStat()
+    for s in out:
+        total.merge(s)
+    xs = np.arange(150) * 0.5
+    assert total.mean == pytest.approx(xs.mean())
+    assert total.std == pytest.approx(xs.std())
+
+def test_golden_scan_reports_failed_files(edi, tmp_path, capsys):
+    missing = tmp_path / "gone.850"
+    _, parsed, _, failed = edi.scan_golden_batch([str(missing)])
+    assert parsed == 1
+    assert [name for name, _ in failed] == ["gone.850"]
+    edi.scan_golden_stats([missing])
+    out = capsys.readouterr().out
+    assert "[WARN] Failed parsing gone.850" in out
+    assert "1 of 1 files failed" in out
@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import pytest
+
+from x12 import EXTRACT_HANDLERS, EXTRACT_TAGS, Segment, X12Parser, extract_segments, render_810, render_850, render_856
+
+STAMP = datetime(2026, 6, 1)
+
+
+def _segs(*raw):
+    return [Segment(r.split("*")[0], r.split("*"), "*") for r in raw]
+
+@pytest.fixture
+def rendered(triplets):
+    pos, asns, invs = triplets
+    return (
+        [("850", po, render_850(po, STAMP)) for po in pos]
+        + [("856", a, render_856(a, STAMP)) for a in asns]
+        + [("810", v, render_810(v, STAMP)) for v in invs]
+    )
+
+
+def test_extract_dispatches_to_typed_extractors(rendered):
+    p = X12Parser()
+    single = {"850": p.extract_850, "856": p.extract_856, "810": p.extract_810}
+    for tx, _, text in rendered:
+        segs = p.parse_text(text)
+        assert p.extract(segs) == (tx, single[tx](segs))
+
+def test_extract_accepts_one_shot_stream(rendered):
+    p = X12Parser()
+    for tx, _, text in rendered:
+        assert p.extract(iter(p.parse_text(text))) == p.extract(p.parse_text(text))
+
+def test_projected_parse_extracts_the_same(rendered):
+    p = X12Parser()
+    for _, _, text in rendered:
+        assert p.extract(p.parse_text(text, tags=EXTRACT_TAGS)) == p.extract(p.parse_text(text))
+
+def test_extract_reads_back_rendered_documents(rendered):
+    p = X12Parser()
+    number = {"850": ("po_number", "po_number"), "856": ("bsn", "asn_number"), "810": ("invoice_number", "invoice_number")}
+    for tx, doc, text in rendered:
+        got_tx, rec = p.extract(p.parse_text(text))
+        assert got_tx == tx
+        ours, theirs = number[tx]
+        assert rec[ours] == doc[theirs]
+        assert [li.sku for li in rec["line_items"]] == [li["sku"] for li in doc["line_items"]]
+
+def test_extract_unknown_transaction():
+    p = X12Parser()
+    assert p.extract([]) == (None, None)
+
+def test_extract_walks_the_segments_once(rendered):
+    _, _, text = rendered[0]
+    segs = X12Parser().parse_text(text)
+    pulled = []
+
+    def stream():
+        for s in segs:
+            pulled.append(s.tag)
+            yield s
+
+    assert extract_segments(stream()) == X12Parser().extract(segs)
+    assert pulled == [s.tag for s in segs]
+
+def test_extract_uses_the_handler_table(rendered, monkeypatch):
+    seen = []
+    table = dict(EXTRACT_HANDLERS["850"][0], CTT=lambda r, els: seen.append(els[1]))
+    monkeypatch.setitem(EXTRACT_HANDLERS, "850", (table, EXTRACT_HANDLERS["850"][1]))
+    tx, _, text = rendered[0]
+    X12Parser().extract(X12Parser().parse_text(text))
+    assert seen and seen[0].isdigit()
+
+def test_extract_tags_cover_the_handlers():
+    assert EXTRACT_TAGS == {"ST"}.union(*(table for table, _ in EXTRACT_HANDLERS.values()))
+
+def test_handler_edge_cases():
+    tx, po = extract_segments(_segs(
+        "ST*850*0001", "BEG*00*SA*PO-1-7*20260101",
+        "PO1*1*5*EA*2.50****SKU-A",     # SKU in element 8
+        "PO1*2*3*EA*1.25***SKU-B",      # element 7 fallback
+        "PO1*3**EA*abc****SKU-C",       # blank / bad numbers
+        "PO1*4*1",                      # no SKU: skipped
+    ))
+    assert tx == "850"
+    assert po["po_number"] == "PO-1-7"
+    assert [(li.sku, li.quantity, li.unit_price) for li in po["line_items"]] == [
+        ("SKU-A", 5.0, 2.5), ("SKU-B", 3.0, 1.25), ("SKU-C", None, None),
+    ]
+    tx, asn = extract_segments(_segs(
+        "ST*856*0002", "BSN*00*ASN-PO-1-7*20260102", "DTM*002*20260101", "DTM*011*20260105",
+        "SN1**9*EA",                    # before any LIN: no SKU yet
+        "LIN**VP*X-1", "SN1**4*CS", "LIN** SK *X-2", "SN1**",
+    ))
+    assert (tx, asn["bsn"], asn["ship_date"]) == ("856", "ASN-PO-1-7", "20260105")
+    assert [(li.sku, li.ship_qty, li.uom) for li in asn["line_items"]] == [("X-1", 4.0, "CS"), ("X-2", None, None)]
+    tx, inv = extract_segments(_segs("ST*810*0003", "BIG*20260106*INV-PO-1-7", "IT1*1*2*EA*3.5**BP*S-1", "IT1*2*1*EA*1"))
+    assert [(li.sku, li.quantity, li.unit_price) for li in inv["line_items"]] == [("S-1", 2.0, 3.5)]
+    assert extract_segments(_segs("ST*850*0001", "BEG*00*SA*PO-1-7")) == ("850", None)
+    assert extract_segments(_segs("ST*997*0001", "AK1*PO*1")) == ("997", None)
+
+def test_generator_renders_the_same_bytes_every_run(edi, master, triplets):
+    def render_all():
+        g = edi.OptionBGenerator(dist=edi.Dist(), master=master, seed=3, now=STAMP)
+        pos, asns, invs = triplets
+        return [g.render_850(po) for po in pos] + [g.render_856(a) for a in asns] + [g.render_810(v) for v in invs]
+
+    first = render_all()
+    assert render_all() == first
+    assert len({t.split("*")[13] for t in first}) == len(first)
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from x12 import EXTRACT_TAGS, MappedX12, X12Parser, X12Writer
+
+STAMP = datetime(2026, 6, 1)
+
+
+@pytest.fixture
+def interchange(triplets):
+    w = X12Writer(now=STAMP)
+    for tx, docs in zip(("850", "856", "810"), triplets):
+        for doc in docs:
+            w.write(tx, doc)
+    return w.getvalue()
+
+def _dump(doc, tags=None):
+    return [
+        (s.tag, s.offset, s.end, list(s.elements), [s.elements.offset(i) for i in range(len(s.elements))])
+        for s in doc.iter_segments(tags)
+    ]
+
+
+@pytest.mark.parametrize("layout", ["~", "~\n", "~\r\n", " ~  "])
+def test_mapped_matches_text_parser(tmp_path, interchange, layout):
+    text = interchange.replace("~", layout)
+    path = tmp_path / "batch.x12"
+    path.write_text(text)
+    data = path.read_bytes()
+    expected = [s.elements for s in X12Parser().parse_text(text)]
+    with MappedX12(path, mmap_min_bytes=1) as doc:
+        mapped = _dump(doc)
+        projected = _dump(doc, EXTRACT_TAGS)
+    assert [els for _, _, _, els, _ in mapped] == expected
+    assert projected == [m for m in mapped if m[0] in EXTRACT_TAGS]
+    for _, start, end, els, offsets in mapped:
+        assert data[start:end].decode() == "*".join(els)
+        assert [data[o:o + len(e)].decode() for o, e in zip(offsets, els)] == els
+    with MappedX12.from_bytes(data) as doc:
+        assert _dump(doc) == mapped
+
+def test_elements_are_views_into_the_file(interchange):
+    with MappedX12.from_bytes(interchange.encode()) as doc:
+        seg = next(s for s in doc.iter_segments() if s.tag == "PO1")
+        els = seg.elements
+        raw = els.raw(2)
+        assert raw.obj is doc.buf
+        assert bytes(raw).decode() == els[2]
+        assert els[-1] == els[len(els) - 1]
+        assert els[1:3] == [els[1], els[2]]
+        assert seg["raw"] == "*".join(els)
+        with pytest.raises(IndexError):
+            els[len(els)]
+        del raw
@@ -0,0 +1,33 @@
+# Synthetic PO / ASN / invoice triplets in columnar form: the master data and
+# generator config, numpy-backed document and label tables, the batch
+# generation kernels and the shard planning used by --batch-gen.
+# Needs numpy.
+from .batch import BatchTriplets
+from .columnar import DictView, DocTable, LabelTable, TripletDataset, X12Rows, codes, vocab_names
+from .config import (
+    ACTIONS,
+    BUYERS,
+    CARRIERS,
+    CFG,
+    CURRENCY_CODES,
+    LABELS_OPTION_B,
+    LOCATION_CODES,
+    LOCATIONS,
+    OWNER_TEAMS,
+    PAYMENT_TERMS,
+    REASON_BITS,
+    REASON_CODES,
+    SEVERITIES,
+    SKUS,
+    SUPPLIERS,
+    TOL_PROFILE_IDS,
+    UNITS_OF_MEASURE,
+)
+from .shards import (
+    GEN_SHARD_ROWS,
+    generate_labeled_dataset,
+    generate_labeled_shard,
+    iter_labeled_shards,
+    plan_label_shards,
+    quota_labels,
+)
@@ -0,0 +1,342 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .columnar import DocTable, LabelTable, TripletDataset, codes
+from .config import (
+    ACTIONS,
+    BUYERS,
+    CARRIERS,
+    CFG,
+    LABELS_OPTION_B,
+    LOCATION_CODES,
+    OWNER_TEAMS,
+    PAYMENT_TERMS,
+    REASON_BITS,
+    SKUS,
+    SUPPLIERS,
+    TOL_PROFILE_IDS,
+    UNITS_OF_MEASURE,
+)
+from .shards import quota_labels
+
+# -----------------------------
+# Batch generation
+# Columnar counterpart of OptionBGenerator's per-document methods, mixed
+# into it: make_triplets draws baseline triplets, label_rows applies one
+# anomaly kernel per label, add_duplicates adds DUPLICATE_DOC copies. The
+# host class provides dist, now, run_tag, the _supplier_lookup /
+# _buyer_lookup / _price_lookup / _tol_lookup master dicts and
+# _choose_tol_profile, and calls _init_batch(seed) once they are set.
+# -----------------------------
+class BatchTriplets:
+    def _init_batch(self, seed: int) -> None:
+        # batch path: its own Generator plus master data as arrays indexed by
+        # position in SUPPLIERS / BUYERS / SKUS
+        self.rng = np.random.default_rng(seed)
+        sup = [self._supplier_lookup.get(c, {}) for c in SUPPLIERS]
+        self._sup_lead = np.array([int(s.get("lead_time_days", 7)) for s in sup], dtype=np.int64)
+        contracts = [[self._price_lookup.get((c, sku), {}) for sku in SKUS] for c in SUPPLIERS]
+        self._contract_price = np.array(
+            [[float(x.get("contract_unit_price", self.dist.price_mean)) for x in row] for row in contracts]
+        )
+        self._contract_disc = np.array([[float(x.get("discount_pct", 0.0)) for x in row] for row in contracts])
+        self._tol_price = np.array(
+            [float(self._tol_lookup.get(t, self._tol_lookup["STANDARD"])["price_pct"]) for t in TOL_PROFILE_IDS]
+        )
+
+    # ------------------------------------------------------------
+    # Batch path: N baseline triplets per call
+    # ------------------------------------------------------------
+    def make_triplets(
+        self, n: int, start_index: int = 0, rng: Optional[np.random.Generator] = None
+    ) -> TripletDataset:
+        """
+        Same distributions as _make_po / _make_asn_from_po /
+        _make_invoice_from_po_asn, drawn for n POs at once from a numpy
+        Generator and returned as a TripletDataset (ASN and invoice k belong to
+        PO k, whose number is PO-<run_tag>-<start_index + k>).
+        """
+        rng = rng or self.rng
+        day = np.timedelta64(1, "D")
+
+        n_lines = np.clip(rng.poisson(self.dist.avg_lines, n), 1, CFG["line_items_max"]).astype(np.int64)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(n_lines, out=offsets[1:])
+        buyer = rng.integers(0, len(BUYERS), n)
+        supplier = rng.integers(0, len(SUPPLIERS), n)
+
+        days_ago = rng.integers(0, CFG["history_days"] + 1, n)
+        order_date = np.datetime64(self.now.replace(microsecond=0), "s") - days_ago * day
+        recent = days_ago < CFG["recent_days"]
+        jitter = np.clip(
+            rng.normal(CFG["ship_jitter_mean"], CFG["ship_jitter_std"], n), CFG["ship_jitter_min"], CFG["ship_jitter_max"]
+        ).astype(np.int64)
+        expected_ship_date = order_date + np.maximum(1, self._sup_lead[supplier] + jitter) * day
+
+        # line items
+        line_po = np.repeat(np.arange(n), n_lines)
+        n_total = int(offsets[-1])
+        sku = rng.integers(0, len(SKUS), n_total)
+        contract = self._contract_price[supplier[line_po], sku]
+        disc = self._contract_disc[supplier[line_po], sku]
+        qty_mult = np.where(recent[line_po], CFG["recent_qty_mult"], 1.0)
+        quantity = np.clip(
+            rng.normal(self.dist.qty_mean * qty_mult, max(5.0, self.dist.qty_std)), 1, CFG["qty_max"]
+        ).astype(np.int64)
+        raw_price = np.clip(rng.normal(contract, np.maximum(0.5, contract * 0.05)), 0.01, CFG["price_max"])
+        unit_price = np.round(raw_price * (1.0 - disc), 2)
+        uom = rng.integers(0, len(UNITS_OF_MEASURE), n_total)
+
+        subtotal = np.bincount(line_po, weights=quantity * unit_price, minlength=n)
+        base = np.maximum(0.01, subtotal)
+        freight_pct = np.clip(rng.normal(CFG["freight_pct_mean"], CFG["freight_pct_std"], n), 0.0, 0.25)
+        disc_pct = np.clip(rng.normal(CFG["discount_pct_mean"], CFG["discount_pct_std"], n), 0.0, 0.35)
+        tax_pct = np.clip(rng.normal(CFG["tax_pct_mean"], CFG["tax_pct_std"], n), 0.0, 0.25)
+        freight = np.round(base * freight_pct, 2)
+        discount = np.round(base * disc_pct, 2)
+        tax = np.round(base * tax_pct, 2)
+
+        ship_date = expected_ship_date + rng.integers(-1, 3, n) * day
+        invoice_date = ship_date + rng.integers(
+            CFG["invoice_after_ship_days_min"], CFG["invoice_after_ship_days_max"] + 1, n
+        ) * day
+
+        # the invoice takes ASN qty by sku, so a sku repeated within a PO is
+        # billed at the qty of its last line (same as the dict lookup)
+        key = line_po * len(SKUS) + sku
+        last = np.full(n * len(SKUS), -1, dtype=np.int64)
+        np.maximum.at(last, key, np.arange(n_total))
+        inv_quantity = quantity[last[key]]
+        inv_subtotal = np.bincount(line_po, weights=inv_quantity * unit_price, minlength=n)
+
+        # po / asn / invoice uuids, 128 bits each as (hi, lo)
+        ids = rng.integers(0, np.iinfo(np.uint64).max, size=(n, 6), dtype=np.uint64, endpoint=True)
+
+        sup_master = [self._supplier_lookup.get(c, {}) for c in SUPPLIERS]
+        buy_master = [self._buyer_lookup.get(c, {}) for c in BUYERS]
+        rows = np.arange(n, dtype=np.int64)
+        pos = DocTable(
+            {
+                "ix": start_index + rows,
+                "id": ids[:, 0:2],
+                "buyer": buyer.astype(np.int16),
+                "supplier": supplier.astype(np.int16),
+                "ship_to": codes([b.get("default_ship_to") for b in buy_master], LOCATION_CODES)[buyer],
+                "bill_to": codes([b.get("default_bill_to") for b in buy_master], LOCATION_CODES)[buyer],
+                "terms": codes([s.get("default_payment_terms") for s in sup_master], PAYMENT_TERMS)[supplier],
+                "carrier": codes([s.get("preferred_carrier") for s in sup_master], CARRIERS)[supplier],
+                "tol": codes([self._choose_tol_profile(c) for c in SUPPLIERS], TOL_PROFILE_IDS)[supplier],
+                "order_date": order_date,
+                "expected_ship_date": expected_ship_date,
+                "freight_amount": freight,
+                "discount_amount": discount,
+                "tax_amount": tax,
+            },
+            {
+                "sku": sku.astype(np.int16),
+                "quantity": quantity.astype(np.int32),
+                "uom": uom.astype(np.int16),
+                "unit_price": unit_price,
+                "contract_unit_price": np.round(contract, 2),
+                "discount_pct": np.round(disc, 4),
+            },
+            offsets,
+        )
+        no_dup = np.zeros(n, dtype=np.int32)
+        asns = DocTable(
+            {"po": rows, "dup": no_dup, "id": ids[:, 2:4], "ship_date": ship_date},
+            {"sku": pos.lines["sku"], "ship_qty": pos.lines["quantity"].copy(), "uom": pos.lines["uom"]},
+            offsets,
+        )
+        invs = DocTable(
+            {
+                "po": rows,
+                "dup": no_dup,
+                "id": ids[:, 4:6],
+                "invoice_date": invoice_date,
+                # own copies: the anomaly kernels change invoice charges only
+                "freight_amount": freight.copy(),
+                "discount_amount": discount.copy(),
+                "tax_amount": tax.copy(),
+                "subtotal_amount": np.round(inv_subtotal, 2),
+                "total_amount": np.round(inv_subtotal + freight + tax - discount, 2),
+            },
+            {"sku": pos.lines["sku"], "quantity": inv_quantity.astype(np.int32), "uom": pos.lines["uom"], "unit_price": unit_price.copy()},
+            offsets,
+        )
+        return TripletDataset(pos, asns, invs, run_tag=self.run_tag)
+
+    # ------------------------------------------------------------
+    # Batch path: anomaly kernels
+    # One kernel per label, each applied once to all PO rows with that label
+    # in a fresh make_triplets dataset, where ASN / invoice row k and line j
+    # are still PO row k, line j. Same edits and payloads as _apply_anomaly;
+    # documents to drop are only flagged in st["has_asn"] / st["has_inv"].
+    # ------------------------------------------------------------
+    def _pick_lines(self, ds: TripletDataset, rows: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        # a random line per document, and the first line of that document
+        # with the same sku (the next(...) lookup of _apply_anomaly)
+        sku = ds.pos.lines["sku"]
+        line = ds.pos.offsets[rows] + (rng.random(len(rows)) * ds.pos.n_lines[rows]).astype(np.int64)
+        li, sub = ds.pos.line_index(rows)
+        counts = np.diff(sub)
+        group = np.repeat(np.arange(len(rows)), counts)
+        hit = np.flatnonzero(sku[li] == np.repeat(sku[line], counts))
+        first = li[hit[np.unique(group[hit], return_index=True)[1]]]
+        return line, first
+
+    def _kernel_missing_doc(self, ds: TripletDataset, rows: np.ndarray, lab: LabelTable, st: Dict[str, np.ndarray], rng: np.random.Generator, label: str) -> None:
+        drop_asn = rng.random(len(rows)) < 0.55
+        a, v = rows[drop_asn], rows[~drop_asn]
+        st["has_asn"][a] = False
+        st["has_inv"][v] = False
+        lab.set(a, "LOGISTICS", "REQUEST_ASN_PROOF", st["base_total"][a] * 0.15, "MISSING_ASN")
+        lab.set(v, "AP", "REQUEST_INVOICE", st["base_total"][v] * 0.15, "MISSING_INVOICE")
+
+    def _kernel_late_shipment(self, ds: TripletDataset, rows: np.ndarray, lab: LabelTable, st: Dict[str, np.ndarray], rng: np.random.Generator, label: str) -> None:
+        late = rng.integers(3, 19, len(rows))
+        ds.asns.header["ship_date"][rows] = ds.pos.header["expected_ship_date"][rows] + late * np.timedelta64(1, "D")
+        lab.late_days[rows] = late
+        lab.set(rows, "LOGISTICS", "EXPEDITE_OR_ESCALATE", st["base_total"][rows] * np.minimum(0.30, 0.02 * late), "LATE_SHIP_{}D")
+
+    def _kernel_qty(self, ds: TripletDataset, rows: np.ndarray, lab: LabelTable, st: Dict[str, np.ndarray], rng: np.random.Generator, label: str) -> None:
+        # SHORT_SHIP / THREE_WAY_QTY_MISMATCH: one ASN line short (or over),
+        # the invoice line follows the PO or the ASN
+        m = len(rows)
+        line, first = self._pick_lines(ds, rows, rng)
+        q_po = ds.pos.lines["quantity"][first].astype(np.int64)
+        mult = rng.uniform(CFG["anom_qty_mult_min"], CFG["anom_qty_mult_max"], m)
+        short = np.ones(m, dtype=bool) if label == "SHORT_SHIP" else rng.random(m) < 0.65
+        q_asn = np.where(short, np.maximum(0, np.rint(q_po / mult)), np.rint(q_po * mult)).astype(np.int64)
+        ds.asns.lines["ship_qty"][line] = q_asn
+        to_po = (rng.random(m) < 0.55) & st["has_inv"][rows]
+        ds.invs.lines["quantity"][first] = np.where(to_po, q_po, q_asn)
+        lab.set(
+            rows,
+            np.where(short, OWNER_TEAMS.index("LOGISTICS"), OWNER_TEAMS.index("RECEIVING")),
+            np.where(short, ACTIONS.index("FILE_SHORTAGE_CLAIM"), ACTIONS.index("VERIFY_RECEIPT")),
+            np.maximum(np.abs((q_po - q_asn) * ds.pos.lines["unit_price"][first]), st["base_total"][rows] * 0.05),
+            np.where(short, REASON_BITS["SHORT_SHIP_BEYOND_TOL"], REASON_BITS["OVER_SHIP_BEYOND_TOL"])
+            | np.where(to_po, REASON_BITS["INV_QTY_MATCHES_PO_NOT_ASN"], 0),
+        )
+
+    def _kernel_price(self, ds: TripletDataset, rows: np.ndarray, lab: LabelTable, st: Dict[str, np.ndarray], rng: np.random.Generator, label: str) -> None:
+        # OVERBILL / THREE_WAY_PRICE_MISMATCH: one invoice line priced above tolerance
+        m = len(rows)
+        line, first = self._pick_lines(ds, rows, rng)
+        p_po = ds.pos.lines["unit_price"][first]
+        tol_price = self._tol_price[ds.pos.header["tol"][rows]]
+        mult = rng.uniform(CFG["anom_price_mult_min"], CFG["anom_price_mult_max"], m)
+        mult = np.where(mult < 1.0 + tol_price + 0.002, 1.0 + tol_price + 0.02 + rng.random(m) * 0.05, mult)
+        new_price = np.round(p_po * mult, 2)
+        ds.invs.lines["unit_price"][line] = new_price
+        impact = (new_price - p_po) * ds.invs.lines["quantity"][line]
+        lab.set(rows, "AP", "DISPUTE_INVOICE_OR_REQUEST_CREDIT_MEMO", impact, "INVOICE_UNIT_PRICE_ABOVE_TOL")
+
+    def _kernel_charges(self, ds: TripletDataset, rows: np.ndarray, lab: LabelTable, st: Dict[str, np.ndarray], rng: np.random.Generator, label: str) -> None:
+        m = len(rows)
+        h = ds.invs.header
+        mult = rng.uniform(CFG["anom_charge_mult_min"], CFG["anom_charge_mult_max"], m)
+        which = rng.integers(0, 4, m)  # freight, tax, discount, combo
+        reasons = np.zeros(m, dtype=np.int32)
+        for key, pick, add, code in (
+            ("freight_amount", 0, 10.0, "FREIGHT_OUTSIDE_PROFILE"),
+            ("tax_amount", 1, 5.0, "TAX_OUTSIDE_PROFILE"),
+            ("discount_amount", 2, 0.0, "DISCOUNT_OUTSIDE_PROFILE"),
+        ):
+            hit = (which == pick) | (which == 3)
+            h[key][rows[hit]] = np.round(h[key][rows[hit]] * mult[hit] + add, 2)
+            reasons[hit] |= REASON_BITS[code]
+        sub = h["subtotal_amount"][rows]
+        inv_sub = np.where(sub != 0, sub, st["base_sub"][rows])
+        inv_total = inv_sub + h["freight_amount"][rows] + h["tax_amount"][rows] - h["discount_amount"][rows]
+        lab.set(rows, "AP", "RECONCILE_CHARGES_WITH_CONTRACT", inv_total - st["base_total"][rows], reasons)
+
+    def _kernel_duplicate_doc(self, ds: TripletDataset, rows: np.ndarray, lab: LabelTable, st: Dict[str, np.ndarray], rng: np.random.Generator, label: str) -> None:
+        # the extra documents are added by make_labeled_triplets
+        lab.set(rows, "OPERATIONS", "DEDUPE_AND_CONFIRM_VALID_DOC", st["base_total"][rows] * 0.10, "DUPLICATE_DOCUMENT_PATTERN")
+
+    def label_rows(
+        self, label: np.ndarray, start_index: int = 0, rng: Optional[np.random.Generator] = None
+    ) -> Tuple[TripletDataset, LabelTable]:
+        """
+        Triplets for PO rows start_index.. with the given LABELS_OPTION_B
+        codes: NORMAL missing docs, then one kernel call per label. Dropped
+        documents are gone from the result; duplicates are add_duplicates'.
+        """
+        rng = rng or self.rng
+        n = len(label)
+        ds = self.make_triplets(n, start_index=start_index, rng=rng)
+        lab = LabelTable(label)
+
+        base_sub = np.maximum(0.0, np.bincount(ds.pos.line_doc(), weights=ds.pos.lines["quantity"] * ds.pos.lines["unit_price"], minlength=n))
+        h = ds.pos.header
+        st = {
+            "has_asn": np.ones(n, dtype=bool),
+            "has_inv": np.ones(n, dtype=bool),
+            "base_sub": base_sub,
+            "base_total": np.maximum(0.0, base_sub + h["freight_amount"] + h["tax_amount"] - h["discount_amount"]),
+        }
+        normal = np.flatnonzero(lab.label == 0)
+        st["has_asn"][normal] = rng.random(len(normal)) >= CFG["p_missing_asn"]
+        st["has_inv"][normal] = rng.random(len(normal)) >= CFG["p_missing_invoice"]
+
+        kernels = {
+            "MISSING_DOC": self._kernel_missing_doc,
+            "THREE_WAY_QTY_MISMATCH": self._kernel_qty,
+            "THREE_WAY_PRICE_MISMATCH": self._kernel_price,
+            "LATE_SHIPMENT": self._kernel_late_shipment,
+            "SHORT_SHIP": self._kernel_qty,
+            "OVERBILL": self._kernel_price,
+            "CHARGES_ANOMALY": self._kernel_charges,
+            "DUPLICATE_DOC": self._kernel_duplicate_doc,
+        }
+        # only NORMAL rows lose documents above, so every kernel finds the
+        # ASN / invoice it edits, as in the per-document path
+        for ix, name in enumerate(LABELS_OPTION_B):
+            rows = np.flatnonzero(lab.label == ix)
+            if name not in kernels or not len(rows):
+                continue
+            kernels[name](ds, rows, lab, st, rng, name)
+        lab.score()
+        out = TripletDataset(
+            ds.pos, ds.asns.take(np.flatnonzero(st["has_asn"])), ds.invs.take(np.flatnonzero(st["has_inv"])), run_tag=ds.run_tag
+        )
+        return out, lab
+
+    def add_duplicates(
+        self, ds: TripletDataset, lab: LabelTable, n_dup: int, rng: Optional[np.random.Generator] = None
+    ) -> TripletDataset:
+        # DUPLICATE_DOC pass of main(): n_dup picks among complete NORMAL
+        # triplets, each copying the ASN and / or invoice (-D<n>) and
+        # relabelling the PO; risk goes up 0.10 per pick
+        rng = rng or self.rng
+        asn_row, inv_row = ds.primary_rows(ds.asns), ds.primary_rows(ds.invs)
+        pool = np.flatnonzero((lab.label == 0) & (asn_row >= 0) & (inv_row >= 0))
+        if n_dup <= 0 or not len(pool):
+            return ds
+        src = pool[rng.integers(0, len(pool), n_dup)]
+        tables = []
+        for table, row in ((ds.asns, asn_row), (ds.invs, inv_row)):
+            dup = table.take(row[src[rng.random(n_dup) < 0.6]])
+            dup.header["dup"] = rng.integers(10, 1000, len(dup)).astype(np.int32)
+            dup.header["id"] = rng.integers(0, np.iinfo(np.uint64).max, size=(len(dup), 2), dtype=np.uint64, endpoint=True)
+            tables.append(DocTable.concat([table, dup]))
+        hits = np.bincount(src, minlength=len(lab))
+        r = np.flatnonzero(hits)
+        lab.label[r] = LABELS_OPTION_B.index("DUPLICATE_DOC")
+        lab.reasons[r] |= REASON_BITS["DUPLICATE_DOCUMENT_PATTERN"]
+        lab.owner[r] = OWNER_TEAMS.index("OPERATIONS")
+        lab.action[r] = ACTIONS.index("DEDUPE_AND_CONFIRM_VALID_DOC")
+        lab.risk[r] = np.clip(lab.risk[r] + 0.10 * hits[r], 0.0, 1.0)
+        lab.grade()
+        return TripletDataset(ds.pos, tables[0], tables[1], run_tag=ds.run_tag)
+
+    def make_labeled_triplets(
+        self, quotas: Dict[str, int], rng: Optional[np.random.Generator] = None
+    ) -> Tuple[TripletDataset, LabelTable]:
+        # columnar counterpart of the per-document loop in main(), one stream
+        rng = rng or self.rng
+        ds, lab = self.label_rows(quota_labels(quotas), rng=rng)
+        return self.add_duplicates(ds, lab, int(quotas.get("DUPLICATE_DOC", 0)), rng), lab
@@ -0,0 +1,620 @@
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import (
+    ACTIONS,
+    BUYERS,
+    CARRIERS,
+    CFG,
+    CURRENCY_CODES,
+    LABELS_OPTION_B,
+    LOCATION_CODES,
+    OWNER_TEAMS,
+    PAYMENT_TERMS,
+    REASON_BITS,
+    REASON_CODES,
+    SEVERITIES,
+    SKUS,
+    SUPPLIERS,
+    TOL_PROFILE_IDS,
+    UNITS_OF_MEASURE,
+)
+
+# -----------------------------
+# Columnar triplets
+# Struct-of-arrays form of pos / asns / invs: a few numpy arrays per table
+# instead of a dict per document and per line item. Dict views rebuild the
+# per-document schema on demand for code that still wants it.
+# -----------------------------
+_VOCAB = {
+    name: np.array(values, dtype=object)
+    for name, values in (
+        ("buyer", BUYERS),
+        ("supplier", SUPPLIERS),
+        ("sku", SKUS),
+        ("uom", UNITS_OF_MEASURE),
+        ("terms", PAYMENT_TERMS),
+        ("carrier", CARRIERS),
+        ("location", LOCATION_CODES),
+        ("tol", TOL_PROFILE_IDS),
+    )
+}
+
+def codes(values: List[Any], vocab: List[str]) -> np.ndarray:
+    ix = {v: i for i, v in enumerate(vocab)}
+    return np.array([ix[v] for v in values], dtype=np.int16)
+
+def vocab_names(kind: str, ix: np.ndarray) -> List[str]:
+    return _VOCAB[kind][ix].tolist()
+
+def _iso(dates: np.ndarray) -> List[str]:
+    # same text as datetime.isoformat() for whole seconds
+    return np.datetime_as_string(dates, unit="s").tolist()
+
+def _uuids(ids: np.ndarray) -> List[str]:
+    return [str(uuid.UUID(int=(hi << 64) | lo, version=4)) for hi, lo in ids.tolist()]
+
+
+class DocTable:
+    """
+    Documents as header columns (one value per document) plus flat line-item
+    columns; document k owns lines offsets[k]:offsets[k + 1].
+    """
+
+    def __init__(self, header: Dict[str, np.ndarray], lines: Dict[str, np.ndarray], offsets: np.ndarray):
+        self.header = header
+        self.lines = lines
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def n_lines(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + sum(a.nbytes for a in self.header.values()) + sum(a.nbytes for a in self.lines.values())
+
+    def line_doc(self) -> np.ndarray:
+        # document row of every line
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.n_lines)
+
+    def line_index(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # (flat line indices of the given documents in order, their new offsets)
+        rows = np.asarray(rows, dtype=np.int64)
+        counts = self.n_lines[rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return np.repeat(self.offsets[rows] - offsets[:-1], counts) + np.arange(offsets[-1], dtype=np.int64), offsets
+
+    def take(self, rows: np.ndarray) -> "DocTable":
+        rows = np.asarray(rows, dtype=np.int64)
+        li, offsets = self.line_index(rows)
+        return DocTable({k: v[rows] for k, v in self.header.items()}, {k: v[li] for k, v in self.lines.items()}, offsets)
+
+    @classmethod
+    def concat(cls, tables: List["DocTable"]) -> "DocTable":
+        offsets = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for t in tables:
+            offsets.append(t.offsets[1:] + base)
+            base += int(t.offsets[-1])
+        first = tables[0]
+        return cls(
+            {k: np.concatenate([t.header[k] for t in tables]) for k in first.header},
+            {k: np.concatenate([t.lines[k] for t in tables]) for k in first.lines},
+            np.concatenate(offsets),
+        )
+
+
+class DictView(Sequence):
+    # read-only list of per-document dicts built in chunks from a TripletDataset
+    CHUNK = 4096
+
+    def __init__(self, build: Any, n: int):
+        self._build = build
+        self._n = n
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, k: Any) -> Any:
+        if isinstance(k, slice):
+            # one build over the rows the slice touches, then pick them in
+            # slice order (reversed and strided slices included)
+            rows = range(*k.indices(self._n))
+            if not rows:
+                return []
+            lo = min(rows[0], rows[-1])
+            out = self._build(lo, max(rows[0], rows[-1]) + 1)
+            return out if rows.step == 1 else [out[i - lo] for i in rows]
+        if k < 0:
+            k += self._n
+        if not 0 <= k < self._n:
+            raise IndexError(k)
+        return self._build(k, k + 1)[0]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for lo in range(0, self._n, self.CHUNK):
+            yield from self._build(lo, min(self._n, lo + self.CHUNK))
+
+
+class TripletDataset:
+    """
+    pos / asns / invs as DocTables. ASN and invoice rows carry `po` (row in
+    pos) and `dup` (0, or n for a duplicate numbered <doc>-D<n>); PO row k is
+    PO-<run_tag>-<ix[k]>. Categoricals are int16 indices into the module
+    vocabularies (BUYERS, SKUS, ...), dates datetime64[s], ids (hi, lo) uint64.
+    """
+
+    def __init__(self, pos: DocTable, asns: DocTable, invs: DocTable, run_tag: int):
+        self.pos = pos
+        self.asns = asns
+        self.invs = invs
+        self.run_tag = int(run_tag)
+
+    @property
+    def nbytes(self) -> int:
+        return self.pos.nbytes + self.asns.nbytes + self.invs.nbytes
+
+    # -- document numbers
+    def po_numbers(self, rows: Any = slice(None)) -> List[str]:
+        return [f"PO-{self.run_tag}-{ix}" for ix in self.pos.header["ix"][rows].tolist()]
+
+    def _child_numbers(self, prefix: str, table: DocTable, rows: Any) -> List[str]:
+        pns = self.po_numbers(table.header["po"][rows])
+        return [f"{prefix}-{pn}-D{d}" if d else f"{prefix}-{pn}" for pn, d in zip(pns, table.header["dup"][rows].tolist())]
+
+    def asn_numbers(self, rows: Any = slice(None)) -> List[str]:
+        return self._child_numbers("ASN", self.asns, rows)
+
+    def invoice_numbers(self, rows: Any = slice(None)) -> List[str]:
+        return self._child_numbers("INV", self.invs, rows)
+
+    # -- dict views in the per-document schema
+    def _po_dicts(self, lo: int, hi: int) -> List[Dict[str, Any]]:
+        h, L = self.pos.header, self.pos.lines
+        off = (self.pos.offsets[lo:hi + 1] - self.pos.offsets[lo]).tolist()
+        a, b = int(self.pos.offsets[lo]), int(self.pos.offsets[hi])
+        sku, uom = vocab_names("sku", L["sku"][a:b]), vocab_names("uom", L["uom"][a:b])
+        qty, price = L["quantity"][a:b].tolist(), L["unit_price"][a:b].tolist()
+        cprice, dpct = L["contract_unit_price"][a:b].tolist(), L["discount_pct"][a:b].tolist()
+        cols = zip(
+            _uuids(h["id"][lo:hi]),
+            self.po_numbers(slice(lo, hi)),
+            vocab_names("buyer", h["buyer"][lo:hi]),
+            vocab_names("supplier", h["supplier"][lo:hi]),
+            _iso(h["order_date"][lo:hi]),
+            _iso(h["expected_ship_date"][lo:hi]),
+            vocab_names("location", h["ship_to"][lo:hi]),
+            vocab_names("location", h["bill_to"][lo:hi]),
+            vocab_names("terms", h["terms"][lo:hi]),
+            vocab_names("carrier", h["carrier"][lo:hi]),
+            vocab_names("tol", h["tol"][lo:hi]),
+            h["freight_amount"][lo:hi].tolist(),
+            h["discount_amount"][lo:hi].tolist(),
+            h["tax_amount"][lo:hi].tolist(),
+        )
+        out = []
+        for k, (po_id, pn, buyer, supplier, od, esd, ship_to, bill_to, terms, carrier, tol, fr, dc, tx) in enumerate(cols):
+            out.append({
+                "po_id": po_id,
+                "po_number": pn,
+                "buyer_code": buyer,
+                "supplier_code": supplier,
+                "order_date": od,
+                "expected_ship_date": esd,
+                "ship_to_location": ship_to,
+                "bill_to_location": bill_to,
+                "payment_terms": terms,
+                "currency": CURRENCY_CODES[0],
+                "carrier_code": carrier,
+                "tolerance_profile_id": tol,
+                "line_items": [
+                    {
+                        "line_number": j - off[k] + 1,
+                        "sku": sku[j],
+                        "quantity": qty[j],
+                        "unit_of_measure": uom[j],
+                        "unit_price": price[j],
+                        "contract_unit_price": cprice[j],
+                        "discount_pct": dpct[j],
+                    }
+                    for j in range(off[k], off[k + 1])
+                ],
+                "freight_amount": fr,
+                "discount_amount": dc,
+                "tax_amount": tx,
+            })
+        return out
+
+    def _asn_dicts(self, lo: int, hi: int) -> List[Dict[str, Any]]:
+        h, L, ph = self.asns.header, self.asns.lines, self.pos.header
+        po = h["po"][lo:hi]
+        off = (self.asns.offsets[lo:hi + 1] - self.asns.offsets[lo]).tolist()
+        a, b = int(self.asns.offsets[lo]), int(self.asns.offsets[hi])
+        sku, uom, qty = vocab_names("sku", L["sku"][a:b]), vocab_names("uom", L["uom"][a:b]), L["ship_qty"][a:b].tolist()
+        cols = zip(
+            _uuids(h["id"][lo:hi]),
+            self.asn_numbers(slice(lo, hi)),
+            self.po_numbers(po),
+            vocab_names("buyer", ph["buyer"][po]),
+            vocab_names("supplier", ph["supplier"][po]),
+            _iso(h["ship_date"][lo:hi]),
+            vocab_names("carrier", ph["carrier"][po]),
+            vocab_names("location", ph["ship_to"][po]),
+        )
+        out = []
+        for k, (asn_id, an, pn, buyer, supplier, sd, carrier, ship_to) in enumerate(cols):
+            out.append({
+                "asn_id": asn_id,
+                "asn_number": an,
+                "po_number": pn,
+                "buyer_code": buyer,
+                "supplier_code": supplier,
+                "ship_date": sd,
+                "carrier_code": carrier,
+                "ship_to_location": ship_to,
+                "line_items": [
+                    {"line_number": j - off[k] + 1, "sku": sku[j], "ship_qty": qty[j], "unit_of_measure": uom[j]}
+                    for j in range(off[k], off[k + 1])
+                ],
+            })
+        return out
+
+    def _invoice_dicts(self, lo: int, hi: int) -> List[Dict[str, Any]]:
+        h, L, ph = self.invs.header, self.invs.lines, self.pos.header
+        po = h["po"][lo:hi]
+        off = (self.invs.offsets[lo:hi + 1] - self.invs.offsets[lo]).tolist()
+        a, b = int(self.invs.offsets[lo]), int(self.invs.offsets[hi])
+        sku, uom = vocab_names("sku", L["sku"][a:b]), vocab_names("uom", L["uom"][a:b])
+        qty, price = L["quantity"][a:b].tolist(), L["unit_price"][a:b].tolist()
+        cols = zip(
+            _uuids(h["id"][lo:hi]),
+            self.invoice_numbers(slice(lo, hi)),
+            self.po_numbers(po),
+            vocab_names("buyer", ph["buyer"][po]),
+            vocab_names("supplier", ph["supplier"][po]),
+            _iso(h["invoice_date"][lo:hi]),
+            h["freight_amount"][lo:hi].tolist(),
+            h["discount_amount"][lo:hi].tolist(),
+            h["tax_amount"][lo:hi].tolist(),
+            h["subtotal_amount"][lo:hi].tolist(),
+            h["total_amount"][lo:hi].tolist(),
+        )
+        out = []
+        for k, (inv_id, vn, pn, buyer, supplier, idt, fr, dc, tx, sub, total) in enumerate(cols):
+            out.append({
+                "invoice_id": inv_id,
+                "invoice_number": vn,
+                "po_number": pn,
+                "buyer_code": buyer,
+                "supplier_code": supplier,
+                "invoice_date": idt,
+                "currency": CURRENCY_CODES[0],
+                "line_items": [
+                    {
+                        "line_number": j - off[k] + 1,
+                        "sku": sku[j],
+                        "quantity": qty[j],
+                        "unit_of_measure": uom[j],
+                        "unit_price": price[j],
+                    }
+                    for j in range(off[k], off[k + 1])
+                ],
+                "freight_amount": fr,
+                "discount_amount": dc,
+                "tax_amount": tx,
+                "subtotal_amount": sub,
+                "total_amount": total,
+            })
+        return out
+
+    def po_dicts(self) -> DictView:
+        return DictView(self._po_dicts, len(self.pos))
+
+    def asn_dicts(self) -> DictView:
+        return DictView(self._asn_dicts, len(self.asns))
+
+    def invoice_dicts(self) -> DictView:
+        return DictView(self._invoice_dicts, len(self.invs))
+
+    def primary_rows(self, table: DocTable) -> np.ndarray:
+        # per PO row: the row of its primary (dup == 0) document in table, or -1
+        row = np.full(len(self.pos), -1, dtype=np.int64)
+        sel = np.flatnonzero(table.header["dup"] == 0)
+        row[table.header["po"][sel]] = sel
+        return row
+
+    def link_dicts(self) -> DictView:
+        # gold `links` rows: each PO with its primary ASN / invoice
+        asn_row, inv_row = self.primary_rows(self.asns), self.primary_rows(self.invs)
+
+        def build(lo: int, hi: int) -> List[Dict[str, Any]]:
+            a, v = asn_row[lo:hi], inv_row[lo:hi]
+            an = iter(self.asn_numbers(a[a >= 0]))
+            vn = iter(self.invoice_numbers(v[v >= 0]))
+            return [
+                {
+                    "po_number": pn,
+                    "po_id": po_id,
+                    "asn_numbers": [next(an)] if ha else [],
+                    "invoice_numbers": [next(vn)] if hv else [],
+                }
+                for pn, po_id, ha, hv in zip(
+                    self.po_numbers(slice(lo, hi)), _uuids(self.pos.header["id"][lo:hi]), (a >= 0).tolist(), (v >= 0).tolist()
+                )
+            ]
+
+        return DictView(build, len(self.pos))
+
+    # -- X12 rendering input
+    def x12_columns(self, tx_type: str, lo: int, hi: int) -> Tuple[Dict[str, List[Any]], Dict[str, List[Any]], List[int]]:
+        # rows lo:hi of one document type as X12Writer.render_columns input
+        table = {"850": self.pos, "856": self.asns, "810": self.invs}[tx_type]
+        h, L = table.header, table.lines
+        offsets = (table.offsets[lo:hi + 1] - table.offsets[lo]).tolist()
+        a, b = int(table.offsets[lo]), int(table.offsets[hi])
+        lines = {"sku": vocab_names("sku", L["sku"][a:b]), "unit_of_measure": vocab_names("uom", L["uom"][a:b])}
+        rows = slice(lo, hi)
+        if tx_type == "850":
+            lines["quantity"] = L["quantity"][a:b].tolist()
+            lines["unit_price"] = L["unit_price"][a:b].tolist()
+            cols = {
+                "po_number": self.po_numbers(rows),
+                "order_date": _iso(h["order_date"][rows]),
+                "buyer_code": vocab_names("buyer", h["buyer"][rows]),
+                "supplier_code": vocab_names("supplier", h["supplier"][rows]),
+                "payment_terms": vocab_names("terms", h["terms"][rows]),
+            }
+        elif tx_type == "856":
+            lines["ship_qty"] = L["ship_qty"][a:b].tolist()
+            cols = {
+                "asn_number": self.asn_numbers(rows),
+                "ship_date": _iso(h["ship_date"][rows]),
+                "carrier_code": vocab_names("carrier", self.pos.header["carrier"][h["po"][rows]]),
+            }
+        else:
+            lines["quantity"] = L["quantity"][a:b].tolist()
+            lines["unit_price"] = L["unit_price"][a:b].tolist()
+            po = h["po"][rows]
+            cols = {
+                "invoice_number": self.invoice_numbers(rows),
+                "invoice_date": _iso(h["invoice_date"][rows]),
+                "buyer_code": vocab_names("buyer", self.pos.header["buyer"][po]),
+                "supplier_code": vocab_names("supplier", self.pos.header["supplier"][po]),
+                "total_amount": h["total_amount"][rows].tolist(),
+            }
+        for k in ("freight_amount", "discount_amount", "tax_amount"):
+            if k in h:
+                cols[k] = h[k][rows].tolist()
+        return cols, lines, offsets
+
+    def x12_rows(self, tx_type: str) -> "X12Rows":
+        return X12Rows(self, tx_type, 0, len({"850": self.pos, "856": self.asns, "810": self.invs}[tx_type]))
+
+    # -- conversions
+    @classmethod
+    def concat(cls, parts: List["TripletDataset"]) -> "TripletDataset":
+        # po references are shifted to the merged pos rows
+        base, asns, invs = 0, [], []
+        for p in parts:
+            for src, dst in ((p.asns, asns), (p.invs, invs)):
+                header = dict(src.header)
+                header["po"] = src.header["po"] + base
+                dst.append(DocTable(header, src.lines, src.offsets))
+            base += len(p.pos)
+        return cls(
+            DocTable.concat([p.pos for p in parts]),
+            DocTable.concat(asns),
+            DocTable.concat(invs),
+            run_tag=parts[0].run_tag,
+        )
+
+    @classmethod
+    def from_dicts(cls, pos: List[Dict[str, Any]], asns: List[Dict[str, Any]], invs: List[Dict[str, Any]]) -> "TripletDataset":
+        # per-document dicts (PO-<tag>-<ix> numbering) -> columns
+        tags = {str(p["po_number"]).split("-")[1] for p in pos}
+        if len(tags) != 1:
+            raise ValueError(f"expected one PO-<run_tag>-<n> prefix, got {sorted(tags)[:5]}")
+        row_of = {p["po_number"]: k for k, p in enumerate(pos)}
+        voc = {k: {v: i for i, v in enumerate(vals.tolist())} for k, vals in _VOCAB.items()}
+        dt = lambda docs, key: np.array([d[key] for d in docs], dtype="datetime64[s]")
+        uid = lambda docs, key: np.array([divmod(uuid.UUID(d[key]).int, 1 << 64) for d in docs], dtype=np.uint64).reshape(-1, 2)
+        code = lambda kind, values: np.array([voc[kind][v] for v in values], dtype=np.int16)
+        f64 = lambda docs, key: np.array([float(d.get(key) or 0.0) for d in docs])
+
+        def offsets(docs: List[Dict[str, Any]]) -> np.ndarray:
+            out = np.zeros(len(docs) + 1, dtype=np.int64)
+            np.cumsum([len(d["line_items"]) for d in docs], out=out[1:])
+            return out
+
+        def line_col(docs: List[Dict[str, Any]], key: str, kind: Optional[str] = None, dtype: Any = None) -> np.ndarray:
+            vals = [li[key] for d in docs for li in d["line_items"]]
+            return code(kind, vals) if kind else np.array(vals, dtype=dtype)
+
+        def child(docs: List[Dict[str, Any]], prefix: str, key: str) -> Tuple[np.ndarray, np.ndarray]:
+            po = np.array([row_of[d["po_number"]] for d in docs], dtype=np.int64)
+            dup = [str(d[key])[len(prefix) + 1 + len(d["po_number"]):] for d in docs]
+            return po, np.array([int(x[2:]) if x else 0 for x in dup], dtype=np.int32)
+
+        po_table = DocTable(
+            {
+                "ix": np.array([int(str(p["po_number"]).rsplit("-", 1)[1]) for p in pos], dtype=np.int64),
+                "id": uid(pos, "po_id"),
+                "buyer": code("buyer", [p["buyer_code"] for p in pos]),
+                "supplier": code("supplier", [p["supplier_code"] for p in pos]),
+                "ship_to": code("location", [p["ship_to_location"] for p in pos]),
+                "bill_to": code("location", [p["bill_to_location"] for p in pos]),
+                "terms": code("terms", [p["payment_terms"] for p in pos]),
+                "carrier": code("carrier", [p["carrier_code"] for p in pos]),
+                "tol": code("tol", [p["tolerance_profile_id"] for p in pos]),
+                "order_date": dt(pos, "order_date"),
+                "expected_ship_date": dt(pos, "expected_ship_date"),
+                "freight_amount": f64(pos, "freight_amount"),
+                "discount_amount": f64(pos, "discount_amount"),
+                "tax_amount": f64(pos, "tax_amount"),
+            },
+            {
+                "sku": line_col(pos, "sku", "sku"),
+                "quantity": line_col(pos, "quantity", dtype=np.int32),
+                "uom": line_col(pos, "unit_of_measure", "uom"),
+                "unit_price": line_col(pos, "unit_price", dtype=np.float64),
+                "contract_unit_price": line_col(pos, "contract_unit_price", dtype=np.float64),
+                "discount_pct": line_col(pos, "discount_pct", dtype=np.float64),
+            },
+            offsets(pos),
+        )
+        a_po, a_dup = child(asns, "ASN", "asn_number")
+        asn_table = DocTable(
+            {"po": a_po, "dup": a_dup, "id": uid(asns, "asn_id"), "ship_date": dt(asns, "ship_date")},
+            {
+                "sku": line_col(asns, "sku", "sku"),
+                "ship_qty": line_col(asns, "ship_qty", dtype=np.int32),
+                "uom": line_col(asns, "unit_of_measure", "uom"),
+            },
+            offsets(asns),
+        )
+        i_po, i_dup = child(invs, "INV", "invoice_number")
+        inv_table = DocTable(
+            {
+                "po": i_po,
+                "dup": i_dup,
+                "id": uid(invs, "invoice_id"),
+                "invoice_date": dt(invs, "invoice_date"),
+                "freight_amount": f64(invs, "freight_amount"),
+                "discount_amount": f64(invs, "discount_amount"),
+                "tax_amount": f64(invs, "tax_amount"),
+                "subtotal_amount": f64(invs, "subtotal_amount"),
+                "total_amount": f64(invs, "total_amount"),
+            },
+            {
+                "sku": line_col(invs, "sku", "sku"),
+                "quantity": line_col(invs, "quantity", dtype=np.int32),
+                "uom": line_col(invs, "unit_of_measure", "uom"),
+                "unit_price": line_col(invs, "unit_price", dtype=np.float64),
+            },
+            offsets(invs),
+        )
+        return cls(po_table, asn_table, inv_table, run_tag=int(tags.pop()))
+
+
+class X12Rows:
+    # Rows lo:hi of one document type, sliceable like a list of documents so
+    # plan_bronze_jobs can chunk it. Only the rows in the slice are converted
+    # (x12_columns) and pickled when a chunk goes to a worker.
+    def __init__(self, ds: Optional[TripletDataset], tx_type: str, lo: int, hi: int, columns: Any = None):
+        self.ds = ds
+        self.tx_type = tx_type
+        self.lo = lo
+        self.hi = hi
+        self._columns = columns
+
+    def __len__(self) -> int:
+        return self.hi - self.lo
+
+    def __getitem__(self, sl: slice) -> "X12Rows":
+        lo, hi, _ = sl.indices(len(self))
+        return X12Rows(self.ds, self.tx_type, self.lo + lo, self.lo + max(lo, hi))
+
+    def columns(self) -> Tuple[Dict[str, List[Any]], Dict[str, List[Any]], List[int]]:
+        if self._columns is None:
+            self._columns = self.ds.x12_columns(self.tx_type, self.lo, self.hi)
+        return self._columns
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"ds": None, "tx_type": self.tx_type, "lo": self.lo, "hi": self.hi, "_columns": self.columns()}
+
+
+_VOCAB.update(
+    (name, np.array(values, dtype=object))
+    for name, values in (("label", LABELS_OPTION_B), ("owner", OWNER_TEAMS), ("action", ACTIONS), ("severity", SEVERITIES))
+)
+
+
+class LabelTable:
+    """
+    Gold `labels` payloads as one row per PO. label / owner / action /
+    severity index LABELS_OPTION_B / OWNER_TEAMS / ACTIONS / SEVERITIES,
+    reasons is a REASON_BITS mask and late_days fills LATE_SHIP_{}D.
+    """
+
+    def __init__(self, label: np.ndarray):
+        n = len(label)
+        self.label = np.asarray(label, dtype=np.int16)
+        self.reasons = np.zeros(n, dtype=np.int32)
+        self.late_days = np.zeros(n, dtype=np.int16)
+        self.owner = np.zeros(n, dtype=np.int16)
+        self.action = np.zeros(n, dtype=np.int16)
+        self.impact = np.zeros(n)
+        self.risk = np.zeros(n)
+        self.severity = np.zeros(n, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.label)
+
+    @classmethod
+    def concat(cls, parts: List["LabelTable"]) -> "LabelTable":
+        out = cls(np.concatenate([p.label for p in parts]))
+        for k in ("reasons", "late_days", "owner", "action", "impact", "risk", "severity"):
+            setattr(out, k, np.concatenate([getattr(p, k) for p in parts]))
+        return out
+
+    def set(self, rows: np.ndarray, owner: Any, action: Any, impact: np.ndarray, reasons: Any = 0) -> None:
+        # owner / action / reasons: a name (same for every row) or per-row codes
+        self.owner[rows] = OWNER_TEAMS.index(owner) if isinstance(owner, str) else owner
+        self.action[rows] = ACTIONS.index(action) if isinstance(action, str) else action
+        self.reasons[rows] |= REASON_BITS[reasons] if isinstance(reasons, str) else reasons
+        self.impact[rows] = np.maximum(0.0, impact)
+
+    def score(self) -> None:
+        # risk_score / severity as in OptionBGenerator._make_label_payload
+        n_reasons = sum((self.reasons >> i) & 1 for i in range(len(REASON_CODES)))
+        base = 1.0 - np.exp(-self.impact / 2500.0) + 0.05 * np.minimum(6, n_reasons)
+        self.risk = np.clip(base, 0.0, 1.0)
+        self.grade()
+
+    def grade(self) -> None:
+        self.severity = (self.risk > CFG["sev_low_risk_max"]).astype(np.int8) + (self.risk > CFG["sev_med_risk_max"])
+
+    def reason_codes(self, rows: Any = slice(None)) -> List[List[str]]:
+        memo: Dict[Tuple[int, int], List[str]] = {}
+        out = []
+        for mask, days in zip(self.reasons[rows].tolist(), self.late_days[rows].tolist()):
+            codes = memo.get((mask, days))
+            if codes is None:
+                codes = memo[(mask, days)] = [c.format(days) for i, c in enumerate(REASON_CODES) if mask >> i & 1]
+            out.append(list(codes))
+        return out
+
+    def label_dicts(self, ds: TripletDataset, lo: int = 0, hi: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        # rows lo:hi keyed by po_number, same schema as the per-document labels
+        rows = slice(lo, len(self) if hi is None else hi)
+        cols = zip(
+            ds.po_numbers(rows),
+            _VOCAB["label"][self.label[rows]].tolist(),
+            _VOCAB["severity"][self.severity[rows]].tolist(),
+            self.risk[rows].tolist(),
+            self.impact[rows].tolist(),
+            self.reason_codes(rows),
+            _VOCAB["owner"][self.owner[rows]].tolist(),
+            _VOCAB["action"][self.action[rows]].tolist(),
+            vocab_names("tol", ds.pos.header["tol"][rows]),
+        )
+        return {
+            pn: {
+                "label": label,
+                "severity": severity,
+                "risk_score": risk,
+                "estimated_dollar_impact": impact,
+                "reason_codes": reasons,
+                "owner_team": owner,
+                "recommended_action": action,
+                "tolerance_profile_id": tol,
+            }
+            for pn, label, severity, risk, impact, reasons, owner, action, tol in cols
+        }
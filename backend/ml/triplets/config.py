@@ -0,0 +1,167 @@
+# -----------------------------
+# Masters (you can swap with your real masters later)
+# -----------------------------
+SUPPLIERS = [
+    "SUPPLIER001",
+    "SUPP_ACE_MFG",
+    "WIDGET_CO",
+    "ACME_PARTS",
+    "INDUSTRIAL_GOODS_LTD",
+    "TECH_SUPPLY_INT",
+    "LOGISTICS_PLUS",
+    "PREMIUM_GOODS",
+]
+
+BUYERS = [
+    "BUYER_RETAIL_A",
+    "BUYER_DISTRIB_B",
+    "BUYER_WAREHOUSE_C",
+    "BUYER_CHAIN_D",
+    "BUYER_ECOMM_E",
+]
+
+SKUS = [
+    "SKU-10001",
+    "SKU-10002",
+    "SKU-10003",
+    "SKU-20001",
+    "SKU-20002",
+    "SKU-30001",
+    "PART-XYZ-100",
+    "PART-ABC-200",
+    "WIDGET-BLUE-SM",
+    "WIDGET-RED-LG",
+]
+
+UNITS_OF_MEASURE = ["EA", "CS", "DZ", "BOX", "PLT", "CT"]
+PAYMENT_TERMS = ["NET30", "NET45", "NET60", "2%10NET30"]
+CARRIERS = ["UPS", "FEDEX", "DHL", "XPO", "OLD_DOMINION", "JB_HUNT"]
+
+LOCATIONS = [
+    {"location_code": "WH-NE-01", "name": "Northeast DC", "city": "Newark", "state": "NJ", "timezone": "America/New_York"},
+    {"location_code": "WH-SE-01", "name": "Southeast DC", "city": "Atlanta", "state": "GA", "timezone": "America/New_York"},
+    {"location_code": "WH-MW-01", "name": "Midwest DC", "city": "Chicago", "state": "IL", "timezone": "America/Chicago"},
+    {"location_code": "WH-W-01", "name": "West DC", "city": "Reno", "state": "NV", "timezone": "America/Los_Angeles"},
+]
+
+CURRENCY_CODES = ["USD"]
+
+# ------------------------------------------------------------
+# OPTION B Label Set (business oriented + demo-friendly)
+# ------------------------------------------------------------
+LABELS_OPTION_B = [
+    "NORMAL",
+    "MISSING_DOC",                 # missing ASN or Invoice
+    "THREE_WAY_QTY_MISMATCH",       # PO vs ASN vs INV qty mismatch
+    "THREE_WAY_PRICE_MISMATCH",     # PO vs INV unit price mismatch (or INV ext mismatch)
+    "LATE_SHIPMENT",               # ASN ship date late vs PO expected
+    "SHORT_SHIP",                  # ASN qty < PO qty beyond tolerance
+    "OVERBILL",                    # INV qty/price causes overbill beyond tolerance
+    "CHARGES_ANOMALY",             # freight/discount/tax ratios weird
+    "DUPLICATE_DOC",               # duplicate ASN/INV patterns
+]
+
+# ------------------------------------------------------------
+# Realism configuration (tune as needed)
+# ------------------------------------------------------------
+CFG = {
+    # volume / drift
+    "history_days": 120,
+    "recent_days": 21,
+    "recent_qty_mult": 1.10,
+
+    # base distributions (fallback if no golden parsed)
+    "avg_line_items": 6,
+    "line_items_max": 14,
+
+    "qty_mean": 120.0,
+    "qty_std": 70.0,
+    "qty_max": 6000,
+
+    "price_mean": 50.0,
+    "price_std": 18.0,
+    "price_max": 2500.0,
+
+    # lead time + shipping behavior
+    "supplier_lead_days_min": 2,
+    "supplier_lead_days_max": 14,
+    "ship_jitter_mean": 0.0,
+    "ship_jitter_std": 1.2,
+    "ship_jitter_min": -2,
+    "ship_jitter_max": 4,
+
+    # invoice timing
+    "invoice_after_ship_days_min": 0,
+    "invoice_after_ship_days_max": 10,
+
+    # charges (percent of subtotal)
+    "freight_pct_mean": 0.028,
+    "freight_pct_std": 0.012,
+    "discount_pct_mean": 0.015,
+    "discount_pct_std": 0.010,
+    "tax_pct_mean": 0.020,
+    "tax_pct_std": 0.008,
+
+    # missing docs / dup docs
+    "p_missing_asn": 0.03,
+    "p_missing_invoice": 0.02,
+    "p_duplicate_doc": 0.03,
+
+    # tolerance profiles (context-aware tolerance)
+    # These are not hard rules; you use them as *context* for features/labels.
+    "tol_profiles": [
+        {"id": "STRICT", "qty_pct": 0.01, "price_pct": 0.005, "charge_pct": 0.01},
+        {"id": "STANDARD", "qty_pct": 0.02, "price_pct": 0.01, "charge_pct": 0.02},
+        {"id": "LOOSE", "qty_pct": 0.05, "price_pct": 0.02, "charge_pct": 0.04},
+    ],
+
+    # anomaly magnitudes (beyond tolerance)
+    "anom_qty_mult_min": 1.05,
+    "anom_qty_mult_max": 1.40,
+    "anom_price_mult_min": 1.02,
+    "anom_price_mult_max": 1.25,
+    "anom_charge_mult_min": 1.6,
+    "anom_charge_mult_max": 4.0,
+
+    # severity mapping knobs
+    "sev_low_risk_max": 0.35,
+    "sev_med_risk_max": 0.70,
+}
+
+# vocabulary positions used by the columnar tables
+LOCATION_CODES = [x["location_code"] for x in LOCATIONS]
+TOL_PROFILE_IDS = [t["id"] for t in CFG["tol_profiles"]]
+
+# label payload vocabularies; REASON_CODES is in the order _apply_anomaly
+# appends them, so a bitmask lists them back in the same order
+OWNER_TEAMS = ["OPERATIONS", "LOGISTICS", "AP", "RECEIVING"]
+ACTIONS = [
+    "REVIEW",
+    "REQUEST_ASN_PROOF",
+    "REQUEST_INVOICE",
+    "EXPEDITE_OR_ESCALATE",
+    "RECONCILE_QTY",
+    "FILE_SHORTAGE_CLAIM",
+    "VERIFY_RECEIPT",
+    "HOLD_PAYMENT",
+    "DISPUTE_INVOICE_OR_REQUEST_CREDIT_MEMO",
+    "RECONCILE_CHARGES_WITH_CONTRACT",
+    "DEDUPE_AND_CONFIRM_VALID_DOC",
+]
+REASON_CODES = [
+    "MISSING_ASN",
+    "MISSING_INVOICE",
+    "LATE_SHIP_{}D",
+    "QTY_MISMATCH",
+    "SHORT_SHIP_BEYOND_TOL",
+    "OVER_SHIP_BEYOND_TOL",
+    "INV_QTY_MATCHES_PO_NOT_ASN",
+    "PRICE_MISMATCH",
+    "INVOICE_UNIT_PRICE_ABOVE_TOL",
+    "FREIGHT_OUTSIDE_PROFILE",
+    "TAX_OUTSIDE_PROFILE",
+    "DISCOUNT_OUTSIDE_PROFILE",
+    "DUPLICATE_DOCUMENT_PATTERN",
+]
+REASON_BITS = {code: 1 << i for i, code in enumerate(REASON_CODES)}
+SEVERITIES = ["LOW", "MED", "HIGH"]
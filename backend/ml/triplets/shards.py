@@ -0,0 +1,76 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .columnar import LabelTable, TripletDataset
+from .config import LABELS_OPTION_B
+
+# PO rows per generation shard (--batch-gen); fixed so the dataset is the
+# same whatever --workers is
+GEN_SHARD_ROWS = 65536
+
+# -----------------------------
+# Sharded generation
+# Quota rows are cut into fixed GEN_SHARD_ROWS shards and shard s draws from
+# SeedSequence(seed, spawn_key=(0, s)). Each shard is complete on its own
+# (duplicates included: DUPLICATE_DOC picks are split over shards by their
+# NORMAL rows), so shards can be written out and dropped one at a time.
+# Nothing depends on --workers, so any worker count gives the same dataset.
+# -----------------------------
+def quota_labels(quotas: Dict[str, int]) -> np.ndarray:
+    # LABELS_OPTION_B code per PO row, rows in quota order like main()'s loop
+    return np.repeat([LABELS_OPTION_B.index(k) for k in quotas], [max(0, int(n)) for n in quotas.values()])
+
+def plan_label_shards(quotas: Dict[str, int], shard_rows: int = GEN_SHARD_ROWS) -> List[Dict[str, Any]]:
+    label = quota_labels(quotas)
+    starts = list(range(0, max(1, len(label)), shard_rows))
+    labels = [label[k:k + shard_rows] for k in starts]
+    # cumulative rounding: shares proportional to NORMAL rows, summing to n_dup
+    cum = np.concatenate([[0], np.cumsum([int((lb == 0).sum()) for lb in labels])])
+    n_dup = max(0, int(quotas.get("DUPLICATE_DOC", 0)))
+    dups = np.diff(np.round(cum * n_dup / max(1, int(cum[-1]))).astype(np.int64)).tolist()
+    return [
+        {"shard": s, "start_index": k, "label": lb, "n_dup": d}
+        for s, (k, lb, d) in enumerate(zip(starts, labels, dups))
+    ]
+
+def generate_labeled_shard(gen: Any, job: Dict[str, Any], seed: int) -> Tuple[TripletDataset, LabelTable]:
+    # runs in a worker process
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0, job["shard"])))
+    ds, lab = gen.label_rows(job["label"], start_index=job["start_index"], rng=rng)
+    return gen.add_duplicates(ds, lab, job["n_dup"], rng), lab
+
+def iter_labeled_shards(
+    gen: Any,
+    quotas: Dict[str, int],
+    seed: int,
+    workers: int = 1,
+    shard_rows: int = GEN_SHARD_ROWS,
+) -> Iterator[Tuple[TripletDataset, LabelTable]]:
+    # shards in order; with workers > 1 at most workers + 1 are in flight, so
+    # a slow consumer does not pile up finished shards
+    jobs = plan_label_shards(quotas, shard_rows)
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            pending: Deque[Any] = deque()
+            for job in jobs:
+                pending.append(ex.submit(generate_labeled_shard, gen, job, seed))
+                if len(pending) > workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    else:
+        for job in jobs:
+            yield generate_labeled_shard(gen, job, seed)
+
+def generate_labeled_dataset(
+    gen: Any,
+    quotas: Dict[str, int],
+    seed: int,
+    workers: int = 1,
+    shard_rows: int = GEN_SHARD_ROWS,
+) -> Tuple[TripletDataset, LabelTable]:
+    parts = list(iter_labeled_shards(gen, quotas, seed, workers=workers, shard_rows=shard_rows))
+    return TripletDataset.concat([p[0] for p in parts]), LabelTable.concat([p[1] for p in parts])
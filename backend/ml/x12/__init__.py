@@ -0,0 +1,46 @@
+# Shared X12 tokenizer, extractors and writers for the synthetic data scripts.
+# Standard library only: importing x12 must not pull in numpy / pandas.
+from .archive import (
+    ARCHIVE_INDEX,
+    ARCHIVE_SHARD_FMT,
+    ARCHIVE_SHARD_MEMBERS,
+    ArchiveWriter,
+    BronzeArchive,
+    pack_shard,
+    write_archive_index,
+    write_shard,
+)
+from .cache import PARSE_CACHE_MAX_BYTES, PARSE_CACHE_VERSION, ParseCache, decode_record, encode_record, extract_file_cached
+from .delimiters import (
+    COMPOSITE_SEPARATOR,
+    DEFAULT_ELEMENT_SEPARATOR,
+    DEFAULT_SEGMENT_TERMINATOR,
+    ISA_ELEMENT_SEP_POSITIONS,
+    ISA_LENGTH,
+    STREAM_CHUNK_SIZE,
+    detect_terminator_and_separator,
+    isa_delimiters,
+    iter_raw_segments,
+    projection_re,
+    split_segments,
+)
+from .extract import EXTRACT_HANDLERS, EXTRACT_TAGS, extract_segments, extract_tx
+from .index import TX_INDEX_SUFFIX, TX_INDEX_VERSION, build_tx_index, index_bytes, load_tx_index, tx_index_path
+from .mapped import MMAP_MIN_BYTES, MappedElements, MappedSegment, MappedX12
+from .parser import X12Parser
+from .records import ASNLine, InvoiceLine, POLine, Segment, safe_float
+from .render import (
+    TX_TYPES,
+    SequentialIds,
+    X12Writer,
+    ctrl9,
+    ctrl_st,
+    fmt_yyyymmdd_from_iso,
+    render_810,
+    render_850,
+    render_856,
+    stable_seed_from_str,
+    write_interchange,
+    yyyymmdd,
+)
+from .stats import GOLDEN_SCAN_BATCH, GOLDEN_SKIP_SUFFIXES, RunningStat, golden_scan_paths, scan_batches
@@ -0,0 +1,256 @@
+import hashlib
+import io
+import json
+import sqlite3
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+
+from .index import index_bytes
+from .parser import X12Parser
+
+# -----------------------------
+# Bronze archives
+# Documents packed into zip shards (deflate, one member per interchange file)
+# plus a sqlite side index: document number -> shard, member, the member's
+# local header offset and the ST..SE byte range inside the member. Zip rather
+# than tar.gz because a member can be inflated on its own; a gzip stream has
+# to be read from the start.
+# -----------------------------
+ARCHIVE_INDEX = "index.sqlite"
+ARCHIVE_SHARD_FMT = "bronze-{:05d}.zip"
+ARCHIVE_SHARD_MEMBERS = 2048
+ARCHIVE_COMPRESSLEVEL = 6
+
+def write_shard(
+    path: Union[Path, BinaryIO],
+    members: Iterable[Tuple[str, bytes]],
+    date_time: Optional[datetime] = None,
+    compresslevel: int = ARCHIVE_COMPRESSLEVEL,
+    name: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    # Writes one shard and returns (member rows, document rows) for the index.
+    # Every member gets the same timestamp, so equal input gives equal bytes.
+    # path may be a file object; then `name` is the shard name for the index.
+    stamp = (date_time or datetime(1980, 1, 1)).timetuple()[:6]
+    member_rows: List[Dict[str, Any]] = []
+    doc_rows: List[Dict[str, Any]] = []
+    shard = name or Path(path).name
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+        for name, data in members:
+            info = zipfile.ZipInfo(name, date_time=stamp)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            zf.writestr(info, data, compresslevel=compresslevel)
+            idx = index_bytes(data)
+            member_rows.append({
+                "shard": shard,
+                "member": name,
+                "header_offset": info.header_offset,
+                "size": len(data),
+                "compressed_size": info.compress_size,
+                "delimiters": idx["delimiters"],
+            })
+            for tx in idx["transactions"]:
+                doc_rows.append({
+                    "doc_number": tx["doc_number"],
+                    "tx_type": tx["type"],
+                    "shard": shard,
+                    "member": name,
+                    "start": tx["start"],
+                    "end": tx["end"],
+                })
+    return member_rows, doc_rows
+
+def pack_shard(
+    root: Path,
+    number: int,
+    members: Iterable[Tuple[str, bytes]],
+    date_time: Optional[datetime] = None,
+    compresslevel: int = ARCHIVE_COMPRESSLEVEL,
+    incremental: bool = False,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]], bool]:
+    # Shard `number` under root, built in memory so that with incremental a
+    # shard whose bytes match the file on disk is not rewritten. Returns
+    # (manifest row, member rows, document rows, written).
+    path = Path(root) / ARCHIVE_SHARD_FMT.format(number)
+    buf = io.BytesIO()
+    member_rows, doc_rows = write_shard(buf, members, date_time, compresslevel, name=path.name)
+    data = buf.getvalue()
+    written = not (incremental and path.exists() and path.read_bytes() == data)
+    if written:
+        path.write_bytes(data)
+    row = {
+        "path": path.name,
+        "size": len(data),
+        "sha1": hashlib.sha1(data).hexdigest(),
+        "members": len(member_rows),
+        "transactions": len(doc_rows),
+    }
+    return row, member_rows, doc_rows, written
+
+def write_archive_index(root: Path, member_rows: Iterable[Dict[str, Any]], doc_rows: Iterable[Dict[str, Any]]) -> Path:
+    # rebuilt from scratch; the first row wins if a document number repeats
+    path = Path(root) / ARCHIVE_INDEX
+    if path.exists():
+        path.unlink()
+    db = sqlite3.connect(str(path))
+    try:
+        db.execute(
+            "CREATE TABLE members (shard TEXT, member TEXT, header_offset INTEGER, size INTEGER, "
+            "compressed_size INTEGER, delimiters TEXT, PRIMARY KEY (shard, member))"
+        )
+        db.execute(
+            "CREATE TABLE documents (doc_number TEXT, tx_type TEXT, shard TEXT, member TEXT, "
+            "start INTEGER, end INTEGER, PRIMARY KEY (doc_number, tx_type))"
+        )
+        db.executemany(
+            "INSERT OR IGNORE INTO members VALUES (?, ?, ?, ?, ?, ?)",
+            ((r["shard"], r["member"], r["header_offset"], r["size"], r["compressed_size"], json.dumps(r["delimiters"]))
+             for r in member_rows),
+        )
+        db.executemany(
+            "INSERT OR IGNORE INTO documents VALUES (?, ?, ?, ?, ?, ?)",
+            ((r["doc_number"], r["tx_type"], r["shard"], r["member"], r["start"], r["end"])
+             for r in doc_rows if r["doc_number"]),
+        )
+        db.commit()
+    finally:
+        db.close()
+    return path
+
+
+class ArchiveWriter:
+    # Serial packer: add() members, shards roll every `shard_members`; close()
+    # writes the index and returns one manifest row per shard. Shards packed
+    # elsewhere (e.g. by pack_shard in worker processes) join with add_shard().
+    # incremental: a shard whose bytes match the file on disk is not rewritten,
+    # and leftover shards from a larger previous run are removed.
+    def __init__(
+        self,
+        root: Path,
+        shard_members: int = ARCHIVE_SHARD_MEMBERS,
+        date_time: Optional[datetime] = None,
+        compresslevel: int = ARCHIVE_COMPRESSLEVEL,
+        incremental: bool = False,
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.shard_members = max(1, int(shard_members))
+        self.date_time = date_time
+        self.compresslevel = compresslevel
+        self.incremental = incremental
+        self.written = 0
+        self.removed = 0
+        self._pending: List[Tuple[str, bytes]] = []
+        self._members: List[Dict[str, Any]] = []
+        self._docs: List[Dict[str, Any]] = []
+        self.shards: List[Dict[str, Any]] = []
+
+    def add(self, name: str, data: bytes) -> None:
+        self._pending.append((name, data))
+        if len(self._pending) >= self.shard_members:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        packed = pack_shard(self.root, len(self.shards), self._pending, self.date_time, self.compresslevel, self.incremental)
+        self.add_shard(*packed)
+        self._pending = []
+
+    def add_shard(
+        self, row: Dict[str, Any], members: List[Dict[str, Any]], docs: List[Dict[str, Any]], written: bool
+    ) -> None:
+        # pack_shard() output; shard numbers must follow len(self.shards)
+        if row["path"] != ARCHIVE_SHARD_FMT.format(len(self.shards)):
+            raise ValueError(f"shard {row['path']} out of order (expected {ARCHIVE_SHARD_FMT.format(len(self.shards))})")
+        self.shards.append(row)
+        self._members += members
+        self._docs += docs
+        self.written += int(written)
+
+    def close(self) -> List[Dict[str, Any]]:
+        self._flush()
+        if self.incremental:
+            keep = {s["path"] for s in self.shards}
+            for old in self.root.glob(ARCHIVE_SHARD_FMT.replace("{:05d}", "*")):
+                if old.name not in keep:
+                    old.unlink()
+                    self.removed += 1
+        write_archive_index(self.root, self._members, self._docs)
+        return self.shards
+
+
+class BronzeArchive:
+    # Reader over a directory of shards + index.sqlite. Lookups go through the
+    # index; only the one member holding the document is inflated.
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._db = sqlite3.connect(f"file:{self.root / ARCHIVE_INDEX}?mode=ro", uri=True)
+        self._zips: Dict[str, zipfile.ZipFile] = {}
+        self._delims: Dict[Tuple[str, str], Dict[str, str]] = {}
+
+    def close(self) -> None:
+        for zf in self._zips.values():
+            zf.close()
+        self._zips.clear()
+        self._db.close()
+
+    def __enter__(self) -> "BronzeArchive":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _zip(self, shard: str) -> zipfile.ZipFile:
+        zf = self._zips.get(shard)
+        if zf is None:
+            zf = self._zips[shard] = zipfile.ZipFile(self.root / shard)
+        return zf
+
+    def __len__(self) -> int:
+        return int(self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0])
+
+    def locate(self, doc_number: str, tx_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        sql = "SELECT d.doc_number, d.tx_type, d.shard, d.member, m.header_offset, d.start, d.end FROM documents d JOIN members m USING (shard, member) WHERE d.doc_number = ?"
+        args: Tuple[Any, ...] = (doc_number,)
+        if tx_type is not None:
+            sql += " AND d.tx_type = ?"
+            args += (tx_type,)
+        row = self._db.execute(sql + " LIMIT 1", args).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("doc_number", "tx_type", "shard", "member", "header_offset", "start", "end"), row))
+
+    def members(self) -> Iterable[Tuple[str, str]]:
+        # (shard, member) in write order
+        return self._db.execute("SELECT shard, member FROM members ORDER BY rowid").fetchall()
+
+    def read_member(self, shard: str, member: str) -> bytes:
+        return self._zip(shard).read(member)
+
+    def delimiters(self, shard: str, member: str) -> Dict[str, str]:
+        key = (shard, member)
+        d = self._delims.get(key)
+        if d is None:
+            row = self._db.execute("SELECT delimiters FROM members WHERE shard = ? AND member = ?", key).fetchone()
+            d = self._delims[key] = json.loads(row[0])
+        return d
+
+    def get(self, doc_number: str, tx_type: Optional[str] = None) -> Optional[str]:
+        # the document's ST..SE text (without the ISA/GS envelope)
+        loc = self.locate(doc_number, tx_type)
+        if loc is None:
+            return None
+        with self._zip(loc["shard"]).open(loc["member"]) as fh:
+            data = fh.read(loc["end"])
+        return data[loc["start"]:loc["end"]].decode("utf-8", errors="ignore")
+
+    def segments(self, doc_number: str, tx_type: Optional[str] = None, parser: Optional[X12Parser] = None) -> Optional[List[Dict]]:
+        loc = self.locate(doc_number, tx_type)
+        if loc is None:
+            return None
+        text = self.get(doc_number, loc["tx_type"])
+        return (parser or X12Parser()).parse_slice(text or "", self.delimiters(loc["shard"], loc["member"]))
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .extract import EXTRACT_TAGS
+from .parser import X12Parser
+from .records import ASNLine, InvoiceLine, POLine
+
+# -----------------------------
+# Parse cache
+# X12Parser.extract() records stored as zlib-compressed JSON in one sqlite
+# file (plain data only: a tampered cache file can give wrong records, never
+# run code).
+# Entries are keyed by sha256(content) + parser version. A path -> (size,
+# mtime_ns, sha256) table lets unchanged files skip both the read and the
+# hash. Lookups are read-only, so pool workers can share the file; new
+# entries, file rows and hit timestamps come back as a pending batch that
+# the parent writes in one transaction. prune() evicts least-recently-used
+# entries past the size cap.
+# -----------------------------
+# bump whenever the parser / extractors change what they return
+PARSE_CACHE_VERSION = 4
+PARSE_CACHE_MAX_BYTES = 512 << 20
+
+# line-item type per transaction, rebuilt from [field, ...] rows on decode
+_LINE_TYPES = {"850": POLine, "856": ASNLine, "810": InvoiceLine}
+
+
+def encode_record(rec: Tuple[Optional[str], Optional[Dict[str, Any]]]) -> bytes:
+    # (tx, extract() record) -> zlib(JSON); line items become field lists
+    tx, doc = rec
+    if doc is not None:
+        doc = dict(doc)
+        doc["line_items"] = [[li[f] for f in li.keys()] for li in doc["line_items"]]
+    data = json.dumps({"v": PARSE_CACHE_VERSION, "tx": tx, "doc": doc}, separators=(",", ":"))
+    return zlib.compress(data.encode("utf-8"), 6)
+
+def decode_record(blob: bytes) -> Optional[Tuple[Optional[str], Optional[Dict[str, Any]]]]:
+    # None for anything that is not a record of this version (treated as a miss)
+    try:
+        obj = json.loads(zlib.decompress(blob))
+        if not isinstance(obj, dict) or obj.get("v") != PARSE_CACHE_VERSION:
+            return None
+        tx, doc = obj["tx"], obj["doc"]
+        if doc is not None:
+            line = _LINE_TYPES[tx]
+            doc["line_items"] = [line(*row) for row in doc["line_items"]]
+        return tx, doc
+    except (ValueError, TypeError, KeyError, zlib.error):
+        return None
+
+
+class ParseCache:
+    def __init__(self, path: Path, max_bytes: int = PARSE_CACHE_MAX_BYTES, readonly: bool = False):
+        self.path = Path(path)
+        self.max_bytes = int(max_bytes)
+        self.readonly = readonly
+        self.hits = 0
+        self.misses = 0
+        self.pending: Dict[str, List[Tuple]] = {"entries": [], "files": [], "used": []}
+        self._db: Optional[sqlite3.Connection] = None
+        # path -> (size, mtime_ns, digest, compressed record or None), see prefetch()
+        self._known: Dict[str, Tuple] = {}
+
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        if self._db is None:
+            if self.readonly:
+                if not self.path.exists():
+                    return None
+                self._db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(self.path))
+                self._db.executescript(
+                    "CREATE TABLE IF NOT EXISTS entries(key TEXT PRIMARY KEY, rec BLOB NOT NULL, used INTEGER NOT NULL);"
+                    "CREATE TABLE IF NOT EXISTS files(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT);"
+                    "CREATE INDEX IF NOT EXISTS entries_used ON entries(used);"
+                )
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    @staticmethod
+    def key(digest: str) -> str:
+        return f"{digest}:v{PARSE_CACHE_VERSION}"
+
+    def prefetch(self, paths: List[str]) -> None:
+        # one query for a whole batch instead of two per file
+        db = self._conn()
+        if db is None or not paths:
+            return
+        marks = ",".join("?" * len(paths))
+        rows = db.execute(
+            "SELECT f.path, f.size, f.mtime_ns, f.digest, e.rec FROM files f "
+            "LEFT JOIN entries e ON e.key = f.digest || ? "
+            f"WHERE f.path IN ({marks})",
+            [f":v{PARSE_CACHE_VERSION}", *paths],
+        )
+        self._known.update((r[0], r[1:]) for r in rows)
+
+    def known_digest(self, path: str, st: os.stat_result) -> Optional[str]:
+        row = self._known.get(path)
+        if row is None:
+            db = self._conn()
+            if db is None:
+                return None
+            row = db.execute("SELECT size, mtime_ns, digest, NULL FROM files WHERE path = ?", (path,)).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return row[2]
+        return None
+
+    def get(self, key: str, path: Optional[str] = None) -> Optional[Any]:
+        blob = None
+        known = self._known.get(path) if path is not None else None
+        if known is not None and known[3] is not None and self.key(known[2]) == key:
+            blob = known[3]
+        else:
+            db = self._conn()
+            row = db.execute("SELECT rec FROM entries WHERE key = ?", (key,)).fetchone() if db is not None else None
+            blob = row[0] if row is not None else None
+        rec = decode_record(blob) if blob is not None else None
+        if rec is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.pending["used"].append((key,))
+        return rec
+
+    def put(self, key: str, rec: Any) -> None:
+        self.pending["entries"].append((key, encode_record(rec)))
+
+    def note_file(self, path: str, st: os.stat_result, digest: str) -> None:
+        self.pending["files"].append((path, st.st_size, st.st_mtime_ns, digest))
+
+    def absorb(self, pending: Dict[str, List[Tuple]]) -> None:
+        for k, rows in pending.items():
+            self.pending[k].extend(rows)
+
+    def flush(self) -> None:
+        db = self._conn()
+        now = time.time_ns()
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO entries(key, rec, used) VALUES (?, ?, ?)",
+                [(k, blob, now) for k, blob in self.pending["entries"]],
+            )
+            db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", self.pending["files"])
+            db.executemany("UPDATE entries SET used = ? WHERE key = ?", [(now, k) for (k,) in self.pending["used"]])
+        self.pending = {"entries": [], "files": [], "used": []}
+
+    def size_bytes(self) -> int:
+        db = self._conn()
+        return int(db.execute("SELECT COALESCE(SUM(LENGTH(rec)), 0) FROM entries").fetchone()[0])
+
+    def prune(self) -> int:
+        # LRU by last use; returns the number of entries removed
+        db = self._conn()
+        total = self.size_bytes()
+        if total <= self.max_bytes:
+            return 0
+        drop = []
+        for key, size in db.execute("SELECT key, LENGTH(rec) FROM entries ORDER BY used"):
+            if total <= self.max_bytes:
+                break
+            drop.append((key,))
+            total -= size
+        with db:
+            db.executemany("DELETE FROM entries WHERE key = ?", drop)
+        return len(drop)
+
+    def clear(self) -> int:
+        db = self._conn()
+        with db:
+            n = db.execute("DELETE FROM entries").rowcount
+            db.execute("DELETE FROM files")
+        return n
+
+
+def extract_file_cached(
+    path: Path,
+    parser: X12Parser,
+    cache: Optional[ParseCache] = None,
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    # parser.extract() for one file, served from / queued into `cache` when given;
+    # an unchanged file (same size and mtime) is not even read on a hit
+    if cache is None:
+        data = Path(path).read_bytes()
+        return parser.extract(parser.parse_text(data.decode("utf-8", errors="ignore"), tags=EXTRACT_TAGS))
+    path = str(path)
+    st = os.stat(path)
+    data = None
+    digest = cache.known_digest(path, st)
+    if digest is None:
+        data = Path(path).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        cache.note_file(path, st, digest)
+    key = cache.key(digest)
+    rec = cache.get(key, path)
+    if rec is None:
+        if data is None:
+            data = Path(path).read_bytes()
+        rec = parser.extract(parser.parse_text(data.decode("utf-8", errors="ignore"), tags=EXTRACT_TAGS))
+        cache.put(key, rec)
+    return rec
@@ -0,0 +1,140 @@
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# -----------------------------
+# X12 Defaults
+# -----------------------------
+DEFAULT_SEGMENT_TERMINATOR = "~"
+DEFAULT_ELEMENT_SEPARATOR = "*"
+COMPOSITE_SEPARATOR = ":"
+
+# ISA is fixed width: 106 chars, element separator at [3], component
+# separator at [104], segment terminator at [105]
+ISA_LENGTH = 106
+ISA_ELEMENT_SEP_POSITIONS = (3, 6, 17, 20, 31, 34, 50, 53, 69, 76, 81, 83, 89, 99, 101, 103)
+
+# streaming reader: bytes of text pulled per read() call
+STREAM_CHUNK_SIZE = 1 << 20
+
+
+def isa_delimiters(content: str) -> Optional[Tuple[str, str, str]]:
+    # (segment terminator, element separator, component separator) read from
+    # the ISA header; None if there is no usable header.
+    i = 0
+    n = len(content)
+    while i < n and content[i] in " \t\r\n":
+        i += 1
+    if content[i:i + 3] != "ISA" or n - i < ISA_LENGTH:
+        return None
+    elem_sep = content[i + 3]
+    if elem_sep.isalnum() or elem_sep.isspace():
+        return None
+    head = content[i:i + ISA_LENGTH]
+    if all(head[p] == elem_sep for p in ISA_ELEMENT_SEP_POSITIONS):
+        comp_sep, seg_term = head[104], head[105]
+    else:
+        # not padded to spec (e.g. over-wide sender/receiver IDs): the
+        # component separator still follows the 16th element separator
+        pos = i + 3
+        for _ in range(15):
+            pos = content.find(elem_sep, pos + 1, i + ISA_LENGTH + 32)
+            if pos == -1:
+                return None
+        if pos + 2 >= n:
+            return None
+        comp_sep, seg_term = content[pos + 1], content[pos + 2]
+    if seg_term in "\r\n":
+        seg_term = "\n"
+    elif seg_term.isalnum() or seg_term in (" ", elem_sep, comp_sep):
+        return None
+    return seg_term, elem_sep, comp_sep
+
+
+def detect_terminator_and_separator(content: str) -> Tuple[str, str]:
+    delims = isa_delimiters(content)
+    if delims:
+        return delims[0], delims[1]
+    # malformed / header-less input: score candidate terminators
+    content = content.strip()
+    elem_sep = DEFAULT_ELEMENT_SEPARATOR
+    if content.startswith("ISA") and len(content) >= 4:
+        elem_sep = content[3]
+    candidates = ["~", "\n"]
+    best = DEFAULT_SEGMENT_TERMINATOR
+    best_score = -1
+    for cand in candidates:
+        segs = content.split(cand)
+        joined = " ".join(segs[:50])
+        score = 0
+        if "GS" in joined: score += 2
+        if "ST" in joined: score += 2
+        if len(segs) > 10: score += 1
+        if score > best_score:
+            best_score = score
+            best = cand
+    return best, elem_sep
+
+_NEWLINE_SPLIT_RE = re.compile(r"[\r\n]+")
+
+def split_segments(content: str, terminator: Optional[str] = None) -> List[str]:
+    content = content.strip()
+    if terminator is not None:
+        # delimiters already known from the ISA header: a single split
+        segs = _NEWLINE_SPLIT_RE.split(content) if terminator == "\n" else content.split(terminator)
+    elif "~" in content:
+        segs = content.split("~")
+    else:
+        segs = re.split(r"[\r\n]+", content)
+    return [s.strip() for s in segs if s.strip()]
+
+_PROJECTION_RE_CACHE: Dict[Tuple[Any, ...], Any] = {}
+
+
+def projection_re(tags: Iterable[str], elem_sep: str, terminator: str, binary: bool = False) -> Any:
+    # Regex that matches only segments whose tag is in `tags`; group 1 is the
+    # segment (trailing whitespace aside). Everything else is skipped inside
+    # the regex engine without being sliced or split.
+    key = (frozenset(tags), elem_sep, terminator, binary)
+    pat = _PROJECTION_RE_CACHE.get(key)
+    if pat is None:
+        term_cls = "\\r\\n" if terminator == "\n" else re.escape(terminator)
+        alts = "|".join(re.escape(t) for t in sorted(key[0], key=len, reverse=True))
+        src = (
+            rf"(?:\A|[{term_cls}])\s*((?:{alts})(?:{re.escape(elem_sep)}[^{term_cls}]*)?)"
+            rf"(?=\s*(?:[{term_cls}]|\Z))"
+        )
+        pat = re.compile(src.encode("latin-1") if binary else src)
+        _PROJECTION_RE_CACHE[key] = pat
+    return pat
+
+
+def iter_raw_segments(
+    fh: TextIO,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    head: Optional[str] = None,
+    terminator: Optional[str] = None,
+) -> Iterator[str]:
+    # Streaming counterpart of split_segments: reads fixed-size chunks and keeps
+    # the unterminated tail of each chunk as carry-over, so a terminator that
+    # falls across a chunk boundary still produces one whole segment.
+    # Without an explicit terminator the choice mirrors split_segments, decided
+    # on the first chunk (`head`, if the caller already read it).
+    pending = fh.read(chunk_size) if head is None else head
+    if not pending:
+        return
+    if terminator is None:
+        terminator = "~" if "~" in pending else "\n"
+    while True:
+        parts = _NEWLINE_SPLIT_RE.split(pending) if terminator == "\n" else pending.split(terminator)
+        pending = parts.pop()
+        for raw_seg in parts:
+            raw_seg = raw_seg.strip()
+            if raw_seg:
+                yield raw_seg
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            break
+        pending += chunk
+    pending = pending.strip()
+    if pending:
+        yield pending
@@ -0,0 +1,143 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .records import ASNLine, InvoiceLine, POLine, Segment, _num
+
+# -----------------------------
+# Single-pass extraction
+# One walk over the segments: find ST, then hand every later segment to the
+# {tag: handler} table of that transaction type. Other tags cost one dict
+# lookup. X12Parser.extract / extract_850 / extract_856 / extract_810 are
+# thin wrappers over this.
+# -----------------------------
+_SKU_QUALIFIERS = frozenset(("BP", "SK", "VP"))
+
+
+class _Rec:
+    # number: BEG03 / BSN02 / BIG02; date: ASN ship date; sku: current LIN sku
+    __slots__ = ("number", "items", "date", "sku")
+
+    def __init__(self):
+        self.number: Optional[str] = None
+        self.items: List[Any] = []
+        self.date: Optional[str] = None
+        self.sku: Optional[str] = None
+
+
+def _qualified_sku(els: List[str]) -> Optional[str]:
+    # the element after the first BP / SK / VP qualifier
+    i = 1
+    for e in els[1:-1]:
+        if e in _SKU_QUALIFIERS or e.strip() in _SKU_QUALIFIERS:
+            return els[i + 1].strip()
+        i += 1
+    return None
+
+def _on_beg(r: _Rec, els: List[str]) -> None:
+    if len(els) > 3:
+        r.number = els[3].strip()
+
+def _on_po1(r: _Rec, els: List[str]) -> None:
+    # PO1*1*QTY*UOM*PRICE****SKU
+    n = len(els)
+    sku = els[8].strip() if n > 8 else ""
+    if not sku and n > 7:
+        sku = els[7].strip()
+    if sku:
+        # float() first; _num covers blanks and short segments
+        try:
+            q, p = float(els[2]), float(els[4])
+        except (IndexError, ValueError):
+            q, p = _num(els, 2), _num(els, 4)
+        r.items.append(POLine(sku, q, p))
+
+def _on_bsn(r: _Rec, els: List[str]) -> None:
+    if len(els) > 2:
+        r.number = els[2].strip()
+
+def _on_dtm(r: _Rec, els: List[str]) -> None:
+    # DTM*011*YYYYMMDD (ship date commonly 011)
+    if len(els) > 2 and els[1].strip() in ("011", "017"):
+        r.date = els[2].strip()
+
+def _on_lin(r: _Rec, els: List[str]) -> None:
+    # LIN**BP*SKU
+    sku = _qualified_sku(els)
+    if sku is not None:
+        r.sku = sku
+
+def _on_sn1(r: _Rec, els: List[str]) -> None:
+    # SN1**QTY*UOM
+    if r.sku:
+        try:
+            q = float(els[2])
+        except (IndexError, ValueError):
+            q = None
+        r.items.append(ASNLine(r.sku, q, els[3].strip() if len(els) > 3 else None))
+
+def _on_big(r: _Rec, els: List[str]) -> None:
+    if len(els) > 2:
+        r.number = els[2].strip()
+
+def _on_it1(r: _Rec, els: List[str]) -> None:
+    # IT1*1*QTY*UOM*UNITPRICE**BP*SKU
+    sku = _qualified_sku(els)
+    if sku:
+        try:
+            q, p = float(els[2]), float(els[4])
+        except (IndexError, ValueError):
+            q, p = _num(els, 2), _num(els, 4)
+        r.items.append(InvoiceLine(sku, q, p))
+
+def _po_result(r: _Rec) -> Optional[Dict[str, Any]]:
+    return {"po_number": r.number, "line_items": r.items} if r.number and r.items else None
+
+def _asn_result(r: _Rec) -> Optional[Dict[str, Any]]:
+    return {"bsn": r.number, "ship_date": r.date, "line_items": r.items} if r.items else None
+
+def _invoice_result(r: _Rec) -> Optional[Dict[str, Any]]:
+    return {"invoice_number": r.number, "line_items": r.items} if r.number and r.items else None
+
+Handler = Callable[[_Rec, List[str]], None]
+
+# transaction type -> ({tag: handler}, result builder)
+EXTRACT_HANDLERS: Dict[str, Tuple[Dict[str, Handler], Callable[[_Rec], Optional[Dict[str, Any]]]]] = {
+    "850": ({"BEG": _on_beg, "PO1": _on_po1}, _po_result),
+    "856": ({"BSN": _on_bsn, "DTM": _on_dtm, "LIN": _on_lin, "SN1": _on_sn1}, _asn_result),
+    "810": ({"BIG": _on_big, "IT1": _on_it1}, _invoice_result),
+}
+
+# every tag extraction reads, so tag-projected parses (and cached records)
+# are complete for 850/856/810
+EXTRACT_TAGS = frozenset({"ST"}.union(*(table for table, _ in EXTRACT_HANDLERS.values())))
+
+
+def extract_tx(segs: Iterable[Segment], tx: str) -> Optional[Dict[str, Any]]:
+    # every segment through tx's handlers (no ST needed); None when incomplete
+    table, result = EXTRACT_HANDLERS[tx]
+    get = table.get
+    r = _Rec()
+    for s in segs:
+        h = get(s.tag)
+        if h is not None:
+            h(r, s.elements)
+    return result(r)
+
+def extract_segments(segs: Iterable[Segment]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    # (transaction type, record) in one pass; segs may be a one-shot stream
+    it: Iterator[Segment] = iter(segs)
+    for s in it:
+        if s.tag == "ST" and len(s.elements) > 1:
+            tx = s.elements[1].strip()
+            break
+    else:
+        return None, None
+    entry = EXTRACT_HANDLERS.get(tx)
+    if entry is None:
+        return tx, None
+    get = entry[0].get
+    r = _Rec()
+    for s in it:
+        h = get(s.tag)
+        if h is not None:
+            h(r, s.elements)
+    return tx, entry[1](r)
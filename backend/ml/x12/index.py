@@ -0,0 +1,108 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .mapped import MappedSegment, MappedX12
+
+# -----------------------------
+# Transaction-set index
+# Byte offsets of every ISA/GS/ST..SE in an interchange, persisted next to
+# the file so a single transaction can be read back without a full parse.
+# -----------------------------
+TX_INDEX_SUFFIX = ".txidx.json"
+TX_INDEX_VERSION = 1
+
+# segment/element holding the business document number per transaction type
+TX_DOC_NUMBER_FIELDS = {"850": ("BEG", 3), "856": ("BSN", 2), "810": ("BIG", 2)}
+
+def tx_index_path(path: Path) -> Path:
+    return Path(path).with_name(Path(path).name + TX_INDEX_SUFFIX)
+
+def _index_segments(doc: MappedX12) -> Dict[str, Any]:
+    interchanges: List[Dict[str, Any]] = []
+    groups: List[Dict[str, Any]] = []
+    txs: List[Dict[str, Any]] = []
+    cur: Optional[Dict[str, Any]] = None
+    doc_field: Optional[Tuple[str, int]] = None
+
+    def el(seg: MappedSegment, i: int) -> str:
+        els = seg["elements"]
+        return els[i].strip() if len(els) > i else ""
+
+    for seg in doc.iter_segments():
+        tag = seg["tag"]
+        if tag == "ISA":
+            interchanges.append({"offset": seg.offset, "control_number": el(seg, 13)})
+        elif tag == "GS":
+            groups.append({
+                "offset": seg.offset,
+                "control_number": el(seg, 6),
+                "functional_id": el(seg, 1),
+                "isa": len(interchanges) - 1,
+            })
+        elif tag == "ST":
+            cur = {
+                "type": el(seg, 1),
+                "control_number": el(seg, 2),
+                "start": seg.offset,
+                "end": None,
+                "doc_number": None,
+                "isa": len(interchanges) - 1,
+                "gs": len(groups) - 1,
+            }
+            doc_field = TX_DOC_NUMBER_FIELDS.get(cur["type"])
+            txs.append(cur)
+        elif cur is not None:
+            if doc_field and tag == doc_field[0] and cur["doc_number"] is None:
+                cur["doc_number"] = el(seg, doc_field[1]) or None
+            elif tag == "SE":
+                cur["end"] = seg.end
+                cur = None
+    if cur is not None:
+        # ST without SE: runs to end of input
+        cur["end"] = doc.size
+
+    return {
+        "delimiters": {
+            "segment": doc.seg_term.decode("latin-1"),
+            "element": doc.elem_sep.decode("latin-1"),
+            "component": doc.comp_sep.decode("latin-1"),
+        },
+        "interchanges": interchanges,
+        "groups": groups,
+        "transactions": txs,
+    }
+
+def build_tx_index(path: Path) -> Dict[str, Any]:
+    path = Path(path)
+    st = path.stat()
+    with MappedX12(path) as doc:
+        body = _index_segments(doc)
+    return {
+        "version": TX_INDEX_VERSION,
+        "source": path.name,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        **body,
+    }
+
+def index_bytes(data: bytes) -> Dict[str, Any]:
+    # build_tx_index for an in-memory interchange; offsets are into `data`
+    with MappedX12.from_bytes(data) as doc:
+        return {"version": TX_INDEX_VERSION, "size": len(data), **_index_segments(doc)}
+
+def load_tx_index(path: Path, rebuild: bool = False) -> Dict[str, Any]:
+    # reuse the persisted index while it still matches the file; otherwise rebuild it
+    path = Path(path)
+    idx_path = tx_index_path(path)
+    if not rebuild and idx_path.exists():
+        try:
+            idx = json.loads(idx_path.read_text(encoding="utf-8"))
+            st = path.stat()
+            if idx.get("version") == TX_INDEX_VERSION and idx.get("size") == st.st_size and idx.get("mtime_ns") == st.st_mtime_ns:
+                return idx
+        except Exception:
+            pass
+    idx = build_tx_index(path)
+    idx_path.write_text(json.dumps(idx), encoding="utf-8")
+    return idx
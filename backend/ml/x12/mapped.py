@@ -0,0 +1,198 @@
+import mmap
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .delimiters import COMPOSITE_SEPARATOR, isa_delimiters, projection_re
+
+# -----------------------------
+# Memory-mapped, bytes-level parsing
+# Segments are (start, end) offsets into a memoryview of the file; an element
+# is sliced out and decoded to str only when an extractor indexes it.
+# -----------------------------
+# files smaller than this are read() whole: mapping costs more than it saves
+MMAP_MIN_BYTES = 1 << 20
+
+# what bytes.strip() removes around a segment
+_WS = b" \t\n\r\x0b\x0c"
+
+# raw tag bytes (leading whitespace included) -> (tag, bytes of leading whitespace)
+_TAG_CACHE: Dict[bytes, Tuple[str, int]] = {}
+
+def _tag(tag_b: bytes) -> Tuple[str, int]:
+    hit = _TAG_CACHE.get(tag_b)
+    if hit is None:
+        body = tag_b.lstrip()
+        hit = _TAG_CACHE.setdefault(tag_b, (body.rstrip().decode("utf-8", errors="ignore"), len(tag_b) - len(body)))
+    return hit
+
+class MappedElements:
+    # element i is view[bounds[i]:bounds[i + 1] - 1] (the -1 drops the separator)
+    __slots__ = ("_view", "_bounds")
+
+    def __init__(self, view: memoryview, bounds: List[int]):
+        self._view = view
+        self._bounds = bounds
+
+    def __len__(self) -> int:
+        return len(self._bounds) - 1
+
+    def __getitem__(self, i: Any) -> Any:
+        n = len(self._bounds) - 1
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(n))]
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("element index out of range")
+        return str(self._view[self._bounds[i]:self._bounds[i + 1] - 1], "utf-8", "ignore")
+
+    def __iter__(self) -> Iterator[str]:
+        view, bounds = self._view, self._bounds
+        for k in range(len(bounds) - 1):
+            yield str(view[bounds[k]:bounds[k + 1] - 1], "utf-8", "ignore")
+
+    def raw(self, i: int) -> memoryview:
+        # no copy; drop it before the MappedX12 closes
+        return self._view[self._bounds[i]:self._bounds[i + 1] - 1]
+
+    def offset(self, i: int) -> int:
+        # byte offset of element i in the source file
+        return self._bounds[i]
+
+class MappedSegment(dict):
+    # Holds only "tag" until an extractor asks for "elements" or "raw"; both
+    # are materialized on that first lookup. The segment is doc.buf[offset:end].
+    __slots__ = ("doc", "offset", "end")
+
+    @property
+    def tag(self) -> str:
+        return self["tag"]
+
+    @property
+    def elements(self) -> "MappedElements":
+        return self["elements"]
+
+    def __missing__(self, key: str) -> Any:
+        if key == "elements":
+            # element start offsets; the split pieces are only measured and
+            # dropped, elements are sliced out of the view when read
+            doc = self.doc
+            x = self.offset
+            bounds = [x]
+            add = bounds.append
+            for piece in doc.buf[x:self.end].split(doc.elem_sep):
+                x += len(piece) + 1
+                add(x)
+            value: Any = MappedElements(doc.view, bounds)
+        elif key == "raw":
+            value = str(self.doc.view[self.offset:self.end], "utf-8", "ignore")
+        else:
+            raise KeyError(key)
+        self[key] = value
+        return value
+
+class MappedX12:
+    def __init__(self, path: Path, mmap_min_bytes: int = MMAP_MIN_BYTES):
+        self.path: Optional[Path] = Path(path)
+        self._fh: Optional[BinaryIO] = open(self.path, "rb")
+        self.size = os.fstat(self._fh.fileno()).st_size
+        self.buf: Any
+        if self.size >= max(1, mmap_min_bytes):
+            self.buf = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.buf = self._fh.read()
+        self.view = memoryview(self.buf)
+        self._detect_delimiters()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MappedX12":
+        # same reader over an in-memory interchange (e.g. an archive member)
+        doc = cls.__new__(cls)
+        doc.path = None
+        doc._fh = None
+        doc.buf = bytes(data)
+        doc.view = memoryview(doc.buf)
+        doc.size = len(doc.buf)
+        doc._detect_delimiters()
+        return doc
+
+    def _detect_delimiters(self) -> None:
+        delims = isa_delimiters(self.buf[:256].decode("latin-1"))
+        if delims:
+            self.seg_term, self.elem_sep, self.comp_sep = (d.encode("latin-1") for d in delims)
+        else:
+            head = self.buf[:256].lstrip()
+            self.elem_sep = head[3:4] if head[:3] == b"ISA" and len(head) > 3 else b"*"
+            self.seg_term = b"~" if self.buf.find(b"~") != -1 else b"\n"
+            self.comp_sep = COMPOSITE_SEPARATOR.encode("ascii")
+
+    def _segment(self, start: int, end: int) -> Optional[MappedSegment]:
+        # buf[start:end] with surrounding whitespace dropped; None when blank
+        buf = self.buf
+        cut = buf.find(self.elem_sep, start, end)
+        tag, lead = _tag(buf[start:cut] if cut != -1 else buf[start:end])
+        if not tag:
+            return None
+        while buf[end - 1] in _WS:
+            end -= 1
+        seg = MappedSegment(tag=tag)
+        seg.doc = self
+        seg.offset = start + lead
+        seg.end = end
+        return seg
+
+    def iter_segments(self, tags: Optional[Iterable[str]] = None) -> Iterator[MappedSegment]:
+        # find() on the map itself: segments are located without copying
+        # any of the file
+        if tags is not None:
+            yield from self._iter_projected(tags)
+            return
+        buf, size, term, sep = self.buf, self.size, self.seg_term, self.elem_sep
+        find, tags_get = buf.find, _TAG_CACHE.get
+        if term == b"\n" and find(term) == -1:
+            # old Mac line endings (CR only); a CR before LF is trimmed below
+            term = b"\r"
+        pos = 0
+        while pos < size:
+            end = find(term, pos)
+            if end == -1:
+                end = size
+            nxt = end + 1
+            # _segment(pos, end), inlined for speed
+            cut = find(sep, pos, end)
+            tag_b = buf[pos:cut] if cut != -1 else buf[pos:end]
+            tag, lead = tags_get(tag_b) or _tag(tag_b)
+            if tag:
+                while buf[end - 1] in _WS:
+                    end -= 1
+                seg = MappedSegment(tag=tag)
+                seg.doc = self
+                seg.offset = pos + lead
+                seg.end = end
+                yield seg
+            pos = nxt
+
+    def _iter_projected(self, tags: Iterable[str]) -> Iterator[MappedSegment]:
+        # regex runs over the whole map; matching segments become offsets
+        pat = projection_re(tags, self.elem_sep.decode("latin-1"), self.seg_term.decode("latin-1"), binary=True)
+        for m in pat.finditer(self.buf):
+            seg = self._segment(*m.span(1))
+            if seg is not None:
+                yield seg
+
+    def segments(self, tags: Optional[Iterable[str]] = None) -> List[MappedSegment]:
+        return list(self.iter_segments(tags))
+
+    def close(self) -> None:
+        self.view.release()
+        if isinstance(self.buf, mmap.mmap):
+            self.buf.close()
+        if self._fh is not None:
+            self._fh.close()
+
+    def __enter__(self) -> "MappedX12":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
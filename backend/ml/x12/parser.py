@@ -0,0 +1,255 @@
+import io
+import itertools
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from .delimiters import (
+    COMPOSITE_SEPARATOR,
+    DEFAULT_ELEMENT_SEPARATOR,
+    DEFAULT_SEGMENT_TERMINATOR,
+    STREAM_CHUNK_SIZE,
+    detect_terminator_and_separator,
+    isa_delimiters,
+    iter_raw_segments,
+    projection_re,
+    split_segments,
+)
+from .extract import extract_segments, extract_tx
+from .index import load_tx_index
+from .mapped import MappedX12
+from .records import Segment
+
+PathLike = Union[str, Path]
+
+# -----------------------------
+# Simple X12 parser shared by the generators and the silver converter
+# (golden dist extraction only needs a few segments per document)
+# -----------------------------
+class X12Parser:
+    def __init__(self):
+        self.segment_terminator = DEFAULT_SEGMENT_TERMINATOR
+        self.element_separator = DEFAULT_ELEMENT_SEPARATOR
+        self.component_separator = COMPOSITE_SEPARATOR
+
+    def _segment(self, raw_seg: str) -> Optional[Segment]:
+        sep = self.element_separator
+        els = raw_seg.split(sep)
+        tag = els[0].strip() if els else ""
+        if not tag:
+            return None
+        return Segment(tag, els, sep)
+
+    def _set_delimiters(self, content: str) -> Optional[str]:
+        # returns the terminator to split on, or None for split_segments' own guess
+        delims = isa_delimiters(content)
+        if delims:
+            self.segment_terminator, self.element_separator, self.component_separator = delims
+            return delims[0]
+        self.segment_terminator, self.element_separator = detect_terminator_and_separator(content)
+        self.component_separator = COMPOSITE_SEPARATOR
+        return None
+
+    def _wants(self, tags: Optional[Iterable[str]]) -> Optional[Any]:
+        # cheap pre-split test for tag projection: prefix "TAG<sep>" or the bare tag
+        if tags is None:
+            return None
+        tags = frozenset(tags)
+        prefixes = tuple(t + self.element_separator for t in tags)
+        return lambda raw_seg: raw_seg.startswith(prefixes) or raw_seg in tags
+
+    def parse_text(self, content: str, tags: Optional[Iterable[str]] = None) -> List[Dict]:
+        # tags: only materialize segments with these tags (e.g. {"ST", "BEG", "PO1"})
+        terminator = self._set_delimiters(content)
+        out: List[Dict] = []
+        if tags is not None and terminator is not None:
+            for m in projection_re(tags, self.element_separator, terminator).finditer(content):
+                seg = self._segment(m.group(1).rstrip())
+                if seg:
+                    out.append(seg)
+            return out
+        wants = self._wants(tags)
+        for raw_seg in split_segments(content, terminator):
+            if wants is not None and not wants(raw_seg):
+                continue
+            seg = self._segment(raw_seg)
+            if seg:
+                out.append(seg)
+        return out
+
+    def parse_file(self, path: PathLike, tags: Optional[Iterable[str]] = None) -> List[Dict]:
+        content = Path(path).read_text(encoding="utf-8", errors="ignore")
+        return self.parse_text(content, tags=tags)
+
+    def iter_stream(self, fh: TextIO, chunk_size: int = STREAM_CHUNK_SIZE, tags: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        # Generator version of parse_text: one segment dict at a time, so memory
+        # stays flat regardless of interchange size. The element separator is
+        # read from the ISA header at the start of the stream.
+        head = fh.read(max(chunk_size, 256))
+        delims = isa_delimiters(head)
+        if delims:
+            self.segment_terminator, self.element_separator, self.component_separator = delims
+        else:
+            content = head.lstrip()
+            self.element_separator = content[3] if content.startswith("ISA") and len(content) >= 4 else DEFAULT_ELEMENT_SEPARATOR
+            self.segment_terminator = "~" if "~" in head else "\n"
+        terminator = delims[0] if delims else None
+        wants = self._wants(tags)
+        for raw_seg in iter_raw_segments(fh, chunk_size=chunk_size, head=head, terminator=terminator):
+            if wants is not None and not wants(raw_seg):
+                continue
+            seg = self._segment(raw_seg)
+            if seg:
+                yield seg
+
+    def iter_file(self, path: PathLike, chunk_size: int = STREAM_CHUNK_SIZE, tags: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        with open(path, "r", encoding="utf-8", errors="ignore") as fh:
+            yield from self.iter_stream(fh, chunk_size=chunk_size, tags=tags)
+
+    def open_mapped(self, path: PathLike) -> MappedX12:
+        # bytes-level mode: use as a context manager and read fields from the
+        # segments before it closes (decoded values outlive the map)
+        doc = MappedX12(Path(path))
+        self.element_separator = doc.elem_sep.decode("latin-1") or DEFAULT_ELEMENT_SEPARATOR
+        self.segment_terminator = doc.seg_term.decode("latin-1")
+        self.component_separator = doc.comp_sep.decode("latin-1")
+        return doc
+
+    def read_transaction(self, path: PathLike, entry: Dict[str, Any], delimiters: Dict[str, str]) -> List[Dict]:
+        # one ST..SE slice located through the transaction index
+        with open(path, "rb") as fh:
+            fh.seek(int(entry["start"]))
+            content = fh.read(int(entry["end"]) - int(entry["start"])).decode("utf-8", errors="ignore")
+        return self.parse_slice(content, delimiters)
+
+    def parse_slice(self, content: str, delimiters: Dict[str, str]) -> List[Dict]:
+        # segments of an envelope-less fragment (e.g. one ST..SE), delimiters known up front
+        self.segment_terminator = delimiters["segment"]
+        self.element_separator = delimiters["element"]
+        self.component_separator = delimiters["component"]
+        out: List[Dict] = []
+        for raw_seg in split_segments(content, self.segment_terminator):
+            seg = self._segment(raw_seg)
+            if seg:
+                out.append(seg)
+        return out
+
+    def iter_member(
+        self,
+        archive: Union[PathLike, zipfile.ZipFile],
+        member: str,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict]:
+        # iter_stream straight off a zip member; nothing is extracted to disk
+        zf = archive if isinstance(archive, zipfile.ZipFile) else zipfile.ZipFile(archive)
+        try:
+            with zf.open(member) as raw:
+                fh = io.TextIOWrapper(raw, encoding="utf-8", errors="ignore")
+                yield from self.iter_stream(fh, chunk_size=chunk_size, tags=tags)
+        finally:
+            if zf is not archive:
+                zf.close()
+
+    def parse_member(
+        self,
+        archive: Union[PathLike, zipfile.ZipFile],
+        member: str,
+        tags: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        zf = archive if isinstance(archive, zipfile.ZipFile) else zipfile.ZipFile(archive)
+        try:
+            content = zf.read(member).decode("utf-8", errors="ignore")
+        finally:
+            if zf is not archive:
+                zf.close()
+        return self.parse_text(content, tags=tags)
+
+    def find_transaction(self, path: PathLike, tx: str, doc_number: str) -> Optional[List[Dict]]:
+        # e.g. find_transaction(p, "850", "PO-123-4") -> segments of that PO only
+        idx = load_tx_index(Path(path))
+        for entry in idx["transactions"]:
+            if entry["type"] == tx and entry["doc_number"] == doc_number:
+                return self.read_transaction(path, entry, idx["delimiters"])
+        return None
+
+    def tx_type(self, segs: Iterable[Segment]) -> Optional[str]:
+        for s in segs:
+            if s.tag == "ST" and len(s.elements) > 1:
+                return s.elements[1].strip()
+        return None
+
+    def peek_tx_type(self, segs: Iterable[Segment]) -> Tuple[Optional[str], Iterator[Segment]]:
+        # Like tx_type, but for one-shot segment streams: returns the type plus an
+        # iterator that still yields every segment (including those consumed here).
+        it = iter(segs)
+        seen: List[Segment] = []
+        for s in it:
+            seen.append(s)
+            if s.tag == "ST" and len(s.elements) > 1:
+                return s.elements[1].strip(), itertools.chain(seen, it)
+        return None, iter(seen)
+
+    # po-only generator names
+    detect_transaction_type = tx_type
+    peek_transaction_type = peek_tx_type
+
+    # single-pass {tag: handler} extraction, see x12.extract
+    def extract_850(self, segs: Iterable[Segment]) -> Optional[Dict[str, Any]]:
+        return extract_tx(segs, "850")
+
+    def extract_856(self, segs: Iterable[Segment]) -> Optional[Dict[str, Any]]:
+        return extract_tx(segs, "856")
+
+    def extract_810(self, segs: Iterable[Segment]) -> Optional[Dict[str, Any]]:
+        return extract_tx(segs, "810")
+
+    def extract(self, segs: Iterable[Segment]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        # (transaction type, extract_850/856/810 result); segs may be a one-shot stream
+        return extract_segments(segs)
+
+    def extract_po_data(self, segs: Iterable[Segment]) -> Dict[str, Any]:
+        # full 850 header + lines as strings, the shape the po-only generator samples from
+        po_data = {
+            "po_id": str(uuid.uuid4()),
+            "po_number": None,
+            "buyer_code": None,
+            "supplier_code": None,
+            "order_date": None,
+            "line_items": [],
+        }
+
+        for s in segs:
+            els = s.elements
+            if s.tag == "BEG":
+                if len(els) > 3:
+                    po_data["po_number"] = els[3].strip()
+                if len(els) > 4:
+                    po_data["order_date"] = els[4].strip()
+
+            elif s.tag == "N1":
+                if len(els) > 2:
+                    role = els[1].strip()
+                    code = els[2].strip()
+                    if role == "BY":
+                        po_data["buyer_code"] = code
+                    elif role == "SU":
+                        po_data["supplier_code"] = code
+
+            elif s.tag == "PO1":
+                line_item = {
+                    "line_number": els[1].strip() if len(els) > 1 else None,
+                    "quantity": els[2].strip() if len(els) > 2 else None,
+                    "unit_of_measure": els[3].strip() if len(els) > 3 else None,
+                    "unit_price": els[4].strip() if len(els) > 4 else None,
+                    "sku": None,
+                }
+                if len(els) > 8 and els[8].strip():
+                    line_item["sku"] = els[8].strip()
+                elif len(els) > 7 and els[7].strip():
+                    line_item["sku"] = els[7].strip()
+
+                po_data["line_items"].append(line_item)
+
+        return po_data
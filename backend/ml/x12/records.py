@@ -0,0 +1,99 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+# -----------------------------
+# Records
+# Slotted segment / line-item types. Numeric fields are parsed once at
+# extraction; dict-style reads (rec["sku"], rec.get("quantity")) still work
+# for code written against the old dict records.
+# -----------------------------
+class _Record:
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._fields else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self._fields}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _Record):
+            return type(other) is type(self) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(f'{k}={getattr(self, k)!r}' for k in self._fields)})"
+
+
+class Segment(_Record):
+    # raw is rebuilt on demand instead of being stored next to the elements
+    __slots__ = ("tag", "elements", "sep")
+    _fields = ("tag", "elements", "raw")
+
+    def __init__(self, tag: str, elements: List[str], sep: str):
+        self.tag = tag
+        self.elements = elements
+        self.sep = sep
+
+    @property
+    def raw(self) -> str:
+        return self.sep.join(self.elements)
+
+
+class POLine(_Record):
+    __slots__ = ("sku", "quantity", "unit_price")
+    _fields = __slots__
+
+    def __init__(self, sku: str, quantity: Optional[float], unit_price: Optional[float]):
+        self.sku = sku
+        self.quantity = quantity
+        self.unit_price = unit_price
+
+
+class ASNLine(_Record):
+    __slots__ = ("sku", "ship_qty", "uom")
+    _fields = __slots__
+
+    def __init__(self, sku: str, ship_qty: Optional[float], uom: Optional[str]):
+        self.sku = sku
+        self.ship_qty = ship_qty
+        self.uom = uom
+
+
+class InvoiceLine(_Record):
+    __slots__ = ("sku", "quantity", "unit_price")
+    _fields = __slots__
+
+    def __init__(self, sku: str, quantity: Optional[float], unit_price: Optional[float]):
+        self.sku = sku
+        self.quantity = quantity
+        self.unit_price = unit_price
+
+
+def safe_float(x: Any, default: Optional[float] = 0.0) -> Optional[float]:
+    # float(x), or default for None / blanks / anything that does not parse
+    try:
+        if x is None:
+            return default
+        return float(x)
+    except Exception:
+        return default
+
+def _num(els: Any, i: int) -> Optional[float]:
+    # element i as a float, None when absent / blank / not a number
+    return safe_float(els[i], None) if len(els) > i else None
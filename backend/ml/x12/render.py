@@ -0,0 +1,272 @@
+import io
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+# -----------------------------
+# Envelope / control-number helpers
+# -----------------------------
+def stable_seed_from_str(s: str) -> int:
+    b = (s or "").encode("utf-8", errors="ignore")
+    return int(zlib.crc32(b) & 0xFFFFFFFF)
+
+def ctrl9(n: int) -> str:
+    return str(int(n) % 1000000000).zfill(9)
+
+def ctrl_st(n: int) -> str:
+    return str(int(n) % 10000).zfill(4)
+
+class SequentialIds:
+    # (ISA13, GS06, ST02) allocator with no clock in it: interchange k of a
+    # run gets control number base + k, so a chunk that knows its starting k
+    # numbers the same way in any process.
+    def __init__(self, start: int = 0, base: int = 1):
+        self.next = int(base) + int(start)
+
+    @classmethod
+    def from_seed(cls, seed: int, start: int = 0) -> "SequentialIds":
+        # run-specific but reproducible base; leaves 10^8 numbers before ISA13 wraps
+        return cls(start=start, base=1 + stable_seed_from_str(f"x12-ids:{seed}") % 900000000)
+
+    def __call__(self, seed: Optional[int] = None) -> Tuple[str, str, str]:
+        n = self.next
+        self.next += 1
+        return ctrl9(n), str(n % 100000), ctrl_st(n)
+
+def yyyymmdd(dt: datetime) -> str:
+    return dt.strftime("%Y%m%d")
+
+def fmt_yyyymmdd_from_iso(iso_dt: Any) -> str:
+    # lenient: malformed dates fall back to stripping the dashes
+    try:
+        return yyyymmdd(datetime.fromisoformat(str(iso_dt)))
+    except ValueError:
+        return str(iso_dt)[:10].replace("-", "")
+
+# tx type -> (GS functional id, document-number key)
+TX_TYPES: Dict[str, Tuple[str, str]] = {
+    "850": ("PO", "po_number"),
+    "856": ("SH", "asn_number"),
+    "810": ("IN", "invoice_number"),
+}
+
+# -----------------------------
+# Document writer (minimal, valid-enough X12 for demos)
+# The envelope date/time comes from the writer's `now` and control numbers
+# from its `ids`, so the same documents always render to the same bytes.
+# ISA/GS prefixes are built once and each document is one %-template pass
+# and one write() to the buffer.
+# -----------------------------
+_ISA_TMPL = "ISA*00*          *00*          *ZZ*SENDER_ID       *ZZ*RECEIVER_ID     *{d}*{t}*U*00400*%s*0*P*:~"
+_GS_TMPL = "GS*{fid}*SENDER*RECEIVER*{d}*{t}*%s*X*004010~"
+_TRAILER = "GE*%d*%s~IEA*1*%s~"
+_PO1 = "PO1*%d*%s*%s*%s****%s~"
+_IT1 = "IT1*%d*%s*%s*%s**BP*%s~"
+_ASN_LINE = "HL*%d**I~LIN**BP*%s~SN1**%s*%s~"
+
+def _iso_ymd(value: Any) -> str:
+    # fmt_yyyymmdd_from_iso without the datetime round trip for YYYY-MM-DD[...]
+    s = value if isinstance(value, str) else str(value)
+    if len(s) >= 10 and s[4] == "-" and s[7] == "-" and s[:4].isdigit() and s[5:7].isdigit() and s[8:10].isdigit():
+        return s[:4] + s[5:7] + s[8:10]
+    return fmt_yyyymmdd_from_iso(value)
+
+def _charge_values(freight: Any, discount: Any, tax: Any, parts: List[str], with_tax: bool = True) -> None:
+    if freight is not None:
+        parts.append("SAC*C*FREIGHT***%.2f~" % float(freight))
+    if discount is not None and float(discount) > 0:
+        parts.append("SAC*A*DISCOUNT***%.2f~" % float(discount))
+    if with_tax and tax is not None and float(tax) > 0:
+        parts.append("SAC*C*TAX***%.2f~" % float(tax))
+
+def _charge_parts(doc: Dict[str, Any], parts: List[str], with_tax: bool = True) -> None:
+    _charge_values(doc.get("freight_amount"), doc.get("discount_amount"), doc.get("tax_amount"), parts, with_tax)
+
+
+class X12Writer:
+    # Writes documents into `out` (a shared io.StringIO unless given a file).
+    # Every interchange from one writer carries `now` as its ISA/GS date and time;
+    # ids allocates (ISA13, GS06, ST02) and defaults to SequentialIds().
+    def __init__(
+        self,
+        out: Optional[TextIO] = None,
+        *,
+        now: datetime,
+        default_terms: Optional[str] = "NET30",
+        with_tax: bool = True,
+        ids: Optional[Callable[..., Tuple[str, str, str]]] = None,
+    ):
+        self.out = out if out is not None else io.StringIO()
+        self.ids = ids or SequentialIds()
+        self.time_hhmm = now.strftime("%H%M")
+        self._isa = _ISA_TMPL.format(d=now.strftime("%y%m%d"), t=self.time_hhmm)
+        self._gs = {
+            fid: _GS_TMPL.format(fid=fid, d=now.strftime("%Y%m%d"), t=self.time_hhmm)
+            for fid, _ in TX_TYPES.values()
+        }
+        self.default_terms = default_terms
+        self.with_tax = with_tax
+        self._sets = {"850": self._set_850, "856": self._set_856, "810": self._set_810}
+
+    def _set_850(self, po: Dict[str, Any], st_ctrl: str, parts: List[str]) -> None:
+        items = po.get("line_items", [])
+        parts.append(f"ST*850*{st_ctrl}~BEG*00*SA*{po['po_number']}*{_iso_ymd(po.get('order_date', ''))}~"
+                     f"N1*BY*{po['buyer_code']}~N1*SU*{po['supplier_code']}~")
+        n_segs = 4
+        terms = po.get("payment_terms", self.default_terms)
+        if terms:
+            parts.append("ITD*01******%s~" % terms)
+            n_segs += 1
+        n1 = len(parts)
+        _charge_parts(po, parts, self.with_tax)
+        n_segs += len(parts) - n1
+        parts.extend([_PO1 % (i, li["quantity"], li["unit_of_measure"], li["unit_price"], li["sku"]) for i, li in enumerate(items, 1)])
+        n_segs += len(items) + 2
+        parts.append("CTT*%d~SE*%d*%s~" % (len(items), n_segs, st_ctrl))
+
+    def _set_856(self, asn: Dict[str, Any], st_ctrl: str, parts: List[str]) -> None:
+        items = asn["line_items"]
+        ship_date = _iso_ymd(asn["ship_date"])
+        parts.append(f"ST*856*{st_ctrl}~BSN*00*{asn['asn_number']}*{ship_date}*{self.time_hhmm}~"
+                     f"DTM*011*{ship_date}~TD5*****{asn.get('carrier_code', 'UPS')}~")
+        parts.extend([_ASN_LINE % (i, li["sku"], li["ship_qty"], li.get("unit_of_measure", "EA")) for i, li in enumerate(items, 1)])
+        parts.append("CTT*%d~SE*%d*%s~" % (len(items), 3 * len(items) + 6, st_ctrl))
+
+    def _set_810(self, inv: Dict[str, Any], st_ctrl: str, parts: List[str]) -> None:
+        items = inv["line_items"]
+        parts.append(f"ST*810*{st_ctrl}~BIG*{_iso_ymd(inv['invoice_date'])}*{inv['invoice_number']}~"
+                     f"N1*BY*{inv['buyer_code']}~N1*SU*{inv['supplier_code']}~")
+        n1 = len(parts)
+        _charge_parts(inv, parts)
+        n_segs = 4 + (len(parts) - n1) + len(items) + 2
+        parts.extend([_IT1 % (i, li["quantity"], li["unit_of_measure"], li["unit_price"], li["sku"]) for i, li in enumerate(items, 1)])
+        total = float(inv.get("total_amount") or 0.0)
+        parts.append("TDS*%d~SE*%d*%s~" % (int(round(total * 100)), n_segs, st_ctrl))
+
+    def write(self, tx_type: str, doc: Dict[str, Any]) -> None:
+        # one document in its own interchange
+        fid, key = TX_TYPES[tx_type]
+        isa_ctrl, gs_ctrl, st_ctrl = self.ids(seed=stable_seed_from_str(str(doc.get(key) or "")))
+        parts = [self._isa % isa_ctrl, self._gs[fid] % gs_ctrl]
+        self._sets[tx_type](doc, st_ctrl, parts)
+        parts.append(_TRAILER % (1, gs_ctrl, isa_ctrl))
+        self.out.write("".join(parts))
+
+    def render(self, tx_type: str, doc: Dict[str, Any]) -> str:
+        # write() into a scratch buffer, for callers that need one string per document
+        out, self.out = self.out, io.StringIO()
+        try:
+            self.write(tx_type, doc)
+            return self.out.getvalue()
+        finally:
+            self.out = out
+
+    def write_interchange(self, tx_type: str, docs: Sequence[Dict[str, Any]]) -> int:
+        # One ISA/GS around len(docs) ST..SE sets of the same type.
+        # ST02 counts up from 0001 inside the group; returns the sets written.
+        if not docs:
+            return 0
+        fid, key = TX_TYPES[tx_type]
+        isa_ctrl, gs_ctrl, _ = self.ids(seed=stable_seed_from_str(str(docs[0][key])))
+        build = self._sets[tx_type]
+        write = self.out.write
+        write(self._isa % isa_ctrl + self._gs[fid] % gs_ctrl)
+        for i, doc in enumerate(docs, 1):
+            parts: List[str] = []
+            build(doc, str(i).zfill(4), parts)
+            write("".join(parts))
+        write(_TRAILER % (len(docs), gs_ctrl, isa_ctrl))
+        return len(docs)
+
+    # Struct-of-arrays input: `cols` maps the document's header keys to
+    # sequences with one value per row, `lines` maps line-item keys to flat
+    # sequences, and row k owns lines offsets[k]:offsets[k + 1]. Output is the
+    # same bytes write() / write_interchange() give for the equivalent dicts.
+    def _bodies(
+        self,
+        tx_type: str,
+        cols: Dict[str, Sequence[Any]],
+        lines: Dict[str, Sequence[Any]],
+        offsets: Sequence[int],
+        st_ctrls: Sequence[str],
+    ) -> List[str]:
+        out: List[str] = []
+        sku, uom = lines["sku"], lines["unit_of_measure"]
+        if tx_type == "850":
+            qty, price = lines["quantity"], lines["unit_price"]
+            terms = cols.get("payment_terms") or [self.default_terms] * len(st_ctrls)
+            for k, st in enumerate(st_ctrls):
+                lo, hi = offsets[k], offsets[k + 1]
+                parts = [f"ST*850*{st}~BEG*00*SA*{cols['po_number'][k]}*{_iso_ymd(cols['order_date'][k])}~"
+                         f"N1*BY*{cols['buyer_code'][k]}~N1*SU*{cols['supplier_code'][k]}~"]
+                if terms[k]:
+                    parts.append("ITD*01******%s~" % terms[k])
+                _charge_values(cols["freight_amount"][k], cols["discount_amount"][k], cols["tax_amount"][k], parts, self.with_tax)
+                n_segs = 3 + len(parts) + (hi - lo) + 2
+                parts.extend([_PO1 % (j - lo + 1, qty[j], uom[j], price[j], sku[j]) for j in range(lo, hi)])
+                parts.append("CTT*%d~SE*%d*%s~" % (hi - lo, n_segs, st))
+                out.append("".join(parts))
+        elif tx_type == "856":
+            qty = lines["ship_qty"]
+            for k, st in enumerate(st_ctrls):
+                lo, hi = offsets[k], offsets[k + 1]
+                ship_date = _iso_ymd(cols["ship_date"][k])
+                parts = [f"ST*856*{st}~BSN*00*{cols['asn_number'][k]}*{ship_date}*{self.time_hhmm}~"
+                         f"DTM*011*{ship_date}~TD5*****{cols['carrier_code'][k]}~"]
+                parts.extend([_ASN_LINE % (j - lo + 1, sku[j], qty[j], uom[j]) for j in range(lo, hi)])
+                parts.append("CTT*%d~SE*%d*%s~" % (hi - lo, 3 * (hi - lo) + 6, st))
+                out.append("".join(parts))
+        else:
+            qty, price = lines["quantity"], lines["unit_price"]
+            for k, st in enumerate(st_ctrls):
+                lo, hi = offsets[k], offsets[k + 1]
+                parts = [f"ST*810*{st}~BIG*{_iso_ymd(cols['invoice_date'][k])}*{cols['invoice_number'][k]}~"
+                         f"N1*BY*{cols['buyer_code'][k]}~N1*SU*{cols['supplier_code'][k]}~"]
+                _charge_values(cols["freight_amount"][k], cols["discount_amount"][k], cols["tax_amount"][k], parts)
+                n_segs = 3 + len(parts) + (hi - lo) + 2
+                parts.extend([_IT1 % (j - lo + 1, qty[j], uom[j], price[j], sku[j]) for j in range(lo, hi)])
+                parts.append("TDS*%d~SE*%d*%s~" % (int(round(float(cols["total_amount"][k] or 0.0) * 100)), n_segs, st))
+                out.append("".join(parts))
+        return out
+
+    def render_columns(
+        self, tx_type: str, cols: Dict[str, Sequence[Any]], lines: Dict[str, Sequence[Any]], offsets: Sequence[int]
+    ) -> List[str]:
+        # one single-document interchange per row, like render() per dict
+        fid, key = TX_TYPES[tx_type]
+        ids = [self.ids(seed=stable_seed_from_str(str(doc_number or ""))) for doc_number in cols[key]]
+        bodies = self._bodies(tx_type, cols, lines, offsets, [st for _, _, st in ids])
+        isa, gs = self._isa, self._gs[fid]
+        return [
+            isa % isa_ctrl + gs % gs_ctrl + body + _TRAILER % (1, gs_ctrl, isa_ctrl)
+            for (isa_ctrl, gs_ctrl, _), body in zip(ids, bodies)
+        ]
+
+    def write_interchange_columns(
+        self, tx_type: str, cols: Dict[str, Sequence[Any]], lines: Dict[str, Sequence[Any]], offsets: Sequence[int]
+    ) -> int:
+        # every row in one interchange, like write_interchange() over the dicts
+        n = len(offsets) - 1
+        if n <= 0:
+            return 0
+        fid, key = TX_TYPES[tx_type]
+        isa_ctrl, gs_ctrl, _ = self.ids(seed=stable_seed_from_str(str(cols[key][0])))
+        bodies = self._bodies(tx_type, cols, lines, offsets, [str(i).zfill(4) for i in range(1, n + 1)])
+        self.out.write(self._isa % isa_ctrl + self._gs[fid] % gs_ctrl + "".join(bodies) + _TRAILER % (n, gs_ctrl, isa_ctrl))
+        return n
+
+    def getvalue(self) -> str:
+        return self.out.getvalue()
+
+
+def write_interchange(fh: TextIO, tx_type: str, docs: Sequence[Dict[str, Any]], now: datetime) -> int:
+    return X12Writer(fh, now=now).write_interchange(tx_type, docs)
+
+def render_850(po: Dict[str, Any], now: datetime, default_terms: Optional[str] = "NET30", with_tax: bool = True) -> str:
+    return X12Writer(now=now, default_terms=default_terms, with_tax=with_tax).render("850", po)
+
+def render_856(asn: Dict[str, Any], now: datetime) -> str:
+    return X12Writer(now=now).render("856", asn)
+
+def render_810(inv: Dict[str, Any], now: datetime) -> str:
+    return X12Writer(now=now).render("810", inv)
@@ -0,0 +1,68 @@
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Sequence, Union
+
+# -----------------------------
+# Golden-corpus statistics
+# Mergeable accumulators plus the batched scan both generators run over
+# their golden samples. Batches have a fixed size and results come back in
+# batch order, so merging them gives the same numbers for any worker count.
+# -----------------------------
+GOLDEN_SCAN_BATCH = 64
+GOLDEN_SKIP_SUFFIXES = (".pdf", ".png", ".jpg", ".jpeg")
+
+class RunningStat:
+    # Welford online mean / variance; merge() is Chan et al.'s pairwise update,
+    # so per-shard accumulators combine without keeping the samples around
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self, n: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    def merge(self, other: "RunningStat") -> "RunningStat":
+        if not other.n:
+            return self
+        if not self.n:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+            return self
+        n = self.n + other.n
+        d = other.mean - self.mean
+        self.mean += d * other.n / n
+        self.m2 += other.m2 + d * d * self.n * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def std(self) -> float:
+        # population std, same as np.std
+        return math.sqrt(self.m2 / self.n) if self.n else 0.0
+
+def golden_scan_paths(files: Iterable[Union[str, Path]]) -> List[str]:
+    # X12 candidates among the golden files (scanned PDFs / images skipped)
+    return [str(f) for f in files if Path(f).suffix.lower() not in GOLDEN_SKIP_SUFFIXES]
+
+def scan_batches(
+    fn: Callable[..., Any],
+    paths: Sequence[str],
+    workers: int = 1,
+    args: Sequence[Any] = (),
+    batch: int = GOLDEN_SCAN_BATCH,
+) -> List[Any]:
+    # fn(batch_paths, *args) per fixed-size batch, in batch order; with
+    # workers > 1 the batches go to a process pool, so fn must be picklable
+    batches = [list(paths[i:i + batch]) for i in range(0, len(paths), batch)]
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            # map() keeps batch order, so the merge order matches the serial path
+            return list(ex.map(fn, batches, *(itertools.repeat(a) for a in args)))
+    return [fn(b, *args) for b in batches]